@@ -0,0 +1,89 @@
+"""Benchmark ``Git.changes_since_release`` against a large synthetic repository.
+
+The repository is generated with ``git fast-import`` (one small file change
+per commit, Conventional Commit subjects and occasional bodies), then the
+streaming log parser is timed and its peak Python heap usage reported.
+
+Typical usage example:
+
+    python benchmarks/bench_git_log.py --commits 300000
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from changelogbump.Git import Git
+
+TYPES = ("feat", "fix", "perf", "refactor", "docs", "chore", "revert", "test")
+
+
+def build_repo(repo: Path, commits: int) -> None:
+    """Create ``repo`` with ``commits`` commits and a ``v0.0.0`` tag on the first."""
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+    proc = subprocess.Popen(
+        ["git", "fast-import", "--quiet"], cwd=repo, stdin=subprocess.PIPE
+    )
+    assert proc.stdin is not None
+    write = proc.stdin.write
+    for i in range(1, commits + 1):
+        kind = TYPES[i % len(TYPES)]
+        message = f"{kind}(mod{i % 97}): change number {i}\n"
+        if i % 10 == 0:
+            message += "\nA longer body explaining the change.\nSecond line.\n"
+        data = f"{i}\n".encode()
+        msg = message.encode()
+        write(b"commit refs/heads/main\n")
+        write(b"mark :%d\n" % i)
+        write(b"committer Bench <bench@example.com> %d +0000\n" % (1_600_000_000 + i))
+        write(b"data %d\n%s\n" % (len(msg), msg))
+        if i > 1:
+            write(b"from :%d\n" % (i - 1))
+        write(b"M 644 inline counter.txt\ndata %d\n%s\n" % (len(data), data))
+        if i == 1:
+            write(b"reset refs/tags/v0.0.0\nfrom :1\n\n")
+    proc.stdin.close()
+    if proc.wait():
+        raise SystemExit("git fast-import failed")
+    subprocess.run(["git", "checkout", "-q", "main"], cwd=repo, check=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commits", type=int, default=200_000)
+    parser.add_argument(
+        "--repo", type=Path, help="Reuse (or create) the repository at this path."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = args.repo or Path(tmp) / "repo"
+        if not (repo / ".git").exists():
+            started = time.perf_counter()
+            build_repo(repo, args.commits)
+            print(
+                f"built {args.commits} commits in {time.perf_counter() - started:.1f}s"
+            )
+
+        started = time.perf_counter()
+        tag, sections, part = Git.changes_since_release(repo)
+        elapsed = time.perf_counter() - started
+
+        # Measured on a second run: tracing allocations skews the timing
+        tracemalloc.start()
+        Git.changes_since_release(repo)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        entries = sum(len(v) for v in sections.values())
+        print(f"since {tag}: {entries} entries, inferred {part}")
+        print(f"parsed in {elapsed:.2f}s, peak Python heap {peak / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Synthetic inputs for the benchmark suite.
+
+Every generator writes or yields deterministic data, so results from two runs
+are comparable.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Iterator
+from datetime import date, timedelta
+from pathlib import Path
+
+HEADER = (
+    Path(__file__).parent.parent / "src/changelogbump/static/header_1.1.0.txt"
+).read_text()
+
+
+def changelog(path: Path, releases: int, target_bytes: int) -> Path:
+    """Write a Keep a Changelog file with ``releases`` sections of roughly ``target_bytes``.
+
+    Sections are written newest first, as ``changelogbump add`` produces them,
+    and padded with entries until the file reaches the requested size.
+    """
+    per_release = max(target_bytes // max(releases, 1), 64)
+    start = date(2000, 1, 1)
+    with path.open("w") as fh:
+        fh.write(HEADER.replace("## [Unreleased]", "") + "\n")
+        for i in range(releases, 0, -1):
+            v = (i // 10_000, (i // 100) % 100, i % 100)
+            day = start + timedelta(days=i % 9000)
+            section = f"## [{v[0]}.{v[1]}.{v[2]}] - {day.isoformat()}\n\n### Added\n\n"
+            n = 0
+            while len(section) < per_release:
+                section += f"- Entry {n} describing change number {i}\n"
+                n += 1
+            fh.write(section + "\n\n")
+        fh.write("## [Unreleased]")
+    return path
+
+
+def pyproject(path: Path, tool_tables: int) -> Path:
+    """Write a pyproject.toml with ``tool_tables`` large ``[tool.*]`` tables after [project]."""
+    with path.open("w") as fh:
+        fh.write('[project]\nname = "bench"\nversion = "1.2.3"  # bumped\n')
+        fh.write('dependencies = [\n  "click (>=8.2.1,<9.0.0)",\n]\n\n')
+        for t in range(tool_tables):
+            fh.write(f"# Settings for tool {t}\n[tool.bench{t}]\n")
+            for k in range(50):
+                fh.write(f'option_{k} = "value {k}"\n')
+            fh.write(f'nested = {{ a = 1, b = [1, 2, 3], c = "x{t}" }}\n\n')
+    return path
+
+
+def version_strings(
+    count: int, seed: int = 1234, prerelease: bool = False
+) -> Iterator[str]:
+    """Yield ``count`` random ``major.minor.patch`` strings.
+
+    With ``prerelease``, every other string carries pre-release identifiers
+    and build metadata, e.g. ``1.2.3-rc.4+build.56``.
+    """
+    rng = random.Random(seed)
+    tags = ("alpha", "beta", "rc")
+    for i in range(count):
+        text = f"{rng.randrange(50)}.{rng.randrange(100)}.{rng.randrange(1000)}"
+        if prerelease and i % 2:
+            text += (
+                f"-{rng.choice(tags)}.{rng.randrange(10)}+build.{rng.randrange(100)}"
+            )
+        yield text
@@ -0,0 +1,281 @@
+"""Benchmark suite for the changelog, pyproject and version hot paths.
+
+Each case builds its synthetic input once, then reports the best wall time
+of several repeats. Cases that finish in well under a millisecond are called
+several times per repeat (see ``LOOPS``) so that every reported time is long
+enough to compare. Results are written as JSON and, when a baseline is
+given, compared against it: any case slower than the baseline by more than
+the threshold fails the run. A fixed calibration workload is timed with each
+run and the baseline is scaled by the ratio, so a baseline recorded on one
+machine stays usable on another or under a different load.
+
+Typical usage example:
+
+    python benchmarks/run.py --output bench.json
+    python benchmarks/run.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run.py --baseline benchmarks/baseline.json --threshold 0.25
+    make bench   # compares against the committed benchmarks/baseline.json
+    python benchmarks/run.py --scale full   # up to 500 MB / 100k releases
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from functools import partial
+from itertools import pairwise
+from operator import attrgetter
+from pathlib import Path
+
+import generators
+
+from changelogbump.Changelog import Changelog
+from changelogbump.PyProject import PyProject
+from changelogbump.Version import Version, _parse
+from changelogbump.VersionIndex import VersionIndex
+
+SECTIONS = {"added": ["Benchmark entry"], "changed": [], "removed": []}
+
+# (label, size in bytes, releases) per scale
+CHANGELOGS = {
+    "small": [
+        ("1KB", 1_000, 10),
+        ("1MB", 1_000_000, 1_000),
+        ("20MB", 20_000_000, 10_000),
+    ],
+    "full": [
+        ("1KB", 1_000, 10),
+        ("1MB", 1_000_000, 1_000),
+        ("50MB", 50_000_000, 10_000),
+        ("500MB", 500_000_000, 100_000),
+    ],
+}
+PYPROJECTS = {
+    "small": [("small", 0), ("huge", 2_000)],
+    "full": [("small", 0), ("huge", 20_000)],
+}
+VERSION_COUNTS = {"small": 200_000, "full": 2_000_000}
+# Calls per timed sample, so each case runs for roughly 10 ms; others make one
+LOOPS = {
+    "changelog.update[1KB]": 20,
+    "changelog.show[1KB]": 200,
+    "changelog.update[1MB]": 5,
+    "changelog.show[1MB]": 10,
+    "pyproject.update[small]": 200,
+    "pyproject.current_version.cold[small]": 1000,
+    "pyproject.current_version.warm[small]": 5,
+    "pyproject.update[huge]": 200,
+    "pyproject.current_version.cold[huge]": 1000,
+    "pyproject.current_version.warm[huge]": 5,
+}
+
+
+def best_of(
+    repeat: int,
+    fn: Callable[[], object],
+    setup: Callable[[], object] = lambda: None,
+    loops: int = 1,
+) -> float:
+    """Return the fastest of ``repeat`` samples of ``loops`` timed calls of ``fn``.
+
+    ``setup`` runs untimed before every call.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        elapsed = 0.0
+        for _ in range(loops):
+            setup()
+            started = time.perf_counter()
+            fn()
+            elapsed += time.perf_counter() - started
+        best = min(best, elapsed)
+    return best
+
+
+def run_suite(scale: str, repeat: int, workdir: Path) -> dict[str, float]:
+    """Run every case and return {case name: seconds per sample}."""
+    results: dict[str, float] = {}
+
+    def case(
+        name: str, fn: Callable[[], object], setup: Callable[[], object] = lambda: None
+    ) -> None:
+        results[name] = best_of(repeat, fn, setup, LOOPS.get(name, 1))
+
+    for label, size, releases in CHANGELOGS[scale]:
+        path = generators.changelog(workdir / f"CHANGELOG-{label}.md", releases, size)
+        changelog = Changelog.at(path)
+        original = path.read_bytes()
+        # Restore the file before each update so repeated calls time the same input
+        case(
+            f"changelog.update[{label}]",
+            partial(changelog.update, "99.0.0", "Bench", SECTIONS),
+            partial(path.write_bytes, original),
+        )
+        case(f"changelog.show[{label}]", partial(changelog.section, "0.0.1"))
+        path.unlink()
+
+    for label, tables in PYPROJECTS[scale]:
+        path = generators.pyproject(workdir / f"pyproject-{label}.toml", tables)
+        pyproject = PyProject.at(path)
+        # The file was just written; let the cache trust it immediately
+        pyproject.racy_window_ns = -1
+        case(f"pyproject.update[{label}]", partial(pyproject.update, "1.2.4"))
+        case(
+            f"pyproject.current_version.cold[{label}]",
+            lambda pyproject=pyproject: pyproject().current_version,
+            PyProject._cache.clear,
+        )
+        case(
+            f"pyproject.current_version.warm[{label}]",
+            lambda pyproject=pyproject: [
+                pyproject().current_version for _ in range(1000)
+            ],
+        )
+
+    strings = list(generators.version_strings(VERSION_COUNTS[scale]))
+    case(
+        "version.from_string",
+        lambda: [Version.from_string(s) for s in strings],
+        _parse.cache_clear,
+    )
+    # Release histories repeat the same few thousand versions many times over
+    repeated = strings[:10_000] * (len(strings) // 10_000)
+    case(
+        "version.from_string.cached", lambda: [Version.from_string(s) for s in repeated]
+    )
+    versions = [Version.from_string(s) for s in strings]
+    case(
+        "version.is_greater_than",
+        lambda: [a.is_greater_than(b) for a, b in pairwise(versions)],
+    )
+    case(
+        "version.sort",
+        lambda: sorted(versions, key=lambda v: (v.major, v.minor, v.patch)),
+    )
+    case("version.sort_key", lambda: sorted(versions, key=attrgetter("sort_key")))
+    case("version_index.from_strings", lambda: VersionIndex.from_strings(strings))
+    index = VersionIndex.from_strings(strings)
+    bounds = versions[:10_000]
+    case("version_index.latest", lambda: [index.latest(v) for v in bounds])
+    prereleases = list(
+        generators.version_strings(VERSION_COUNTS[scale], prerelease=True)
+    )
+    case(
+        "version.from_string.prerelease",
+        lambda: [Version.from_string(s) for s in prereleases],
+        _parse.cache_clear,
+    )
+    return results
+
+
+def calibrate(repeat: int) -> float:
+    """Time a fixed pure-Python workload, to compare machines and load levels."""
+
+    def work() -> int:
+        total = 0
+        for i in range(2_000_000):
+            total += i % 7
+        return total
+
+    return best_of(repeat, work)
+
+
+def regressions(
+    results: dict[str, float],
+    baseline: dict[str, float],
+    threshold: float,
+    speed: float = 1.0,
+    floor: float = 0.0,
+) -> list[str]:
+    """Describe every case slower than its baseline by more than ``threshold``.
+
+    Baseline times are multiplied by ``speed``, the ratio of this run's
+    calibration time to the baseline's, and cases whose baseline is below
+    ``floor`` seconds are skipped as too short to time reliably.
+    """
+    found = []
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is None or base < floor:
+            continue
+        base *= speed
+        if seconds > base * (1 + threshold):
+            found.append(
+                f"{name}: {seconds:.4f}s vs baseline {base:.4f}s (+{seconds / base - 1:.0%})"
+            )
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(CHANGELOGS), default="small")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Write results JSON here.")
+    parser.add_argument(
+        "--baseline", type=Path, help="Compare against this results JSON."
+    )
+    parser.add_argument(
+        "--save-baseline", type=Path, help="Write results as a new baseline."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown, e.g. 0.25 for 25%%.",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.005,
+        help="Skip cases whose baseline is shorter than this many seconds.",
+    )
+    parser.add_argument("--workdir", type=Path, help="Directory for generated inputs.")
+    args = parser.parse_args()
+
+    # Calibrate on both sides of the suite so one noisy moment does not skew it
+    calibration = calibrate(args.repeat)
+    with tempfile.TemporaryDirectory(dir=args.workdir) as tmp:
+        results = run_suite(args.scale, args.repeat, Path(tmp))
+    calibration = min(calibration, calibrate(args.repeat))
+
+    report = {
+        "python": sys.version.split()[0],
+        "machine": platform.machine(),
+        "scale": args.scale,
+        "calibration": calibration,
+        "results": results,
+    }
+    width = max(map(len, results))
+    for name, seconds in results.items():
+        loops = LOOPS.get(name, 1)
+        print(f"{name:<{width}}  {seconds * 1000:10.3f} ms  ({loops} call(s))")
+    for target in (args.output, args.save_baseline):
+        if target:
+            target.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("scale") != args.scale:
+            print(
+                f"baseline scale {baseline.get('scale')!r} != {args.scale!r}",
+                file=sys.stderr,
+            )
+            return 2
+        # Scale the baseline to this machine; older baselines lack calibration
+        speed = calibration / baseline.get("calibration", calibration)
+        slow = regressions(
+            results, baseline["results"], args.threshold, speed, args.min_time
+        )
+        for line in slow:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if slow else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""Merges the changelogs of many packages into one, ordered by release date.
+
+This module provides the Aggregate class. Each package's changelog is read
+as a lazy stream of ``## [version] - date`` sections, newest first, and the
+streams are combined with a heap-based k-way merge that writes straight to
+the output file, so memory grows with the number of packages rather than the
+size of their changelogs. A small state file in the ``.changelogbump/``
+directory beside the output remembers what each package contributed, so a refresh after a few packages were bumped
+only reads those packages.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import os
+import shutil
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from operator import attrgetter
+from pathlib import Path
+
+from changelogbump.Archive import Archive
+from changelogbump.AtomicFile import AtomicFile
+from changelogbump.ChangelogIndex import ChangelogIndex
+from changelogbump.Profiler import Profiler
+from changelogbump.Transaction import Transaction
+
+
+@dataclass
+class Section:
+    """One release section of a package's changelog.
+
+    Attributes:
+        package (str): Name the section is prefixed with.
+        version (str): The bracketed heading text.
+        date (str): The release date, or "" if the heading has none.
+        heading (bytes): The heading line as written in the package changelog.
+        body (bytes): Everything after the heading, up to the next heading.
+    """
+
+    package: str
+    version: str
+    date: str
+    heading: bytes
+    body: bytes
+
+    @property
+    def digest(self) -> str:
+        """Return a hash of the section as written in the package changelog."""
+        return hashlib.sha1(self.heading + self.body).hexdigest()
+
+    def render(self) -> bytes:
+        """Return the section with its heading prefixed by the package name."""
+        heading = f"## [{self.package} {self.version}]"
+        if self.date:
+            heading += f" - {self.date}"
+        return heading.encode() + b"\n" + self.body.rstrip(b"\n") + b"\n\n"
+
+
+class Aggregate:
+    """Root changelog interleaving the releases of many packages by date.
+
+    Releases dated the same day keep the order in which packages are given.
+    Undated releases sort last. A changelog whose releases are not dated
+    newest first is sorted before merging.
+
+    Attributes:
+        output (Path): The aggregate changelog to write.
+        packages (dict[str, Path]): Changelog of each package, by name.
+    """
+
+    title: bytes = b"# Changelog\n\n"
+
+    def __init__(self, output: Path, packages: dict[str, Path]):
+        self.output = Path(output)
+        self.packages = {name: Path(path) for name, path in packages.items()}
+
+    @property
+    def state_path(self) -> Path:
+        """Return the file recording what each package contributed."""
+        state = self.output.absolute().parent / Transaction.state_dir_name
+        return state / f"{self.output.name}.agg.json"
+
+    @staticmethod
+    def sections(package: str, changelog: Path) -> Iterator[Section]:
+        """Yield the released sections of a changelog, newest first.
+
+        Archived shards are read after the changelog. The file is reopened
+        for each section, so that merging thousands of changelogs does not
+        hold thousands of file descriptors.
+
+        Args:
+            package (str): Name to attach to each section.
+            changelog (Path): The package changelog.
+
+        Yields:
+            Section: Each section except ``Unreleased``.
+        """
+        for path in Archive.files(changelog):
+            position = 0
+            while True:
+                heading = None
+                body = []
+                with path.open("rb") as fh:
+                    fh.seek(position)
+                    while True:
+                        position = fh.tell()
+                        line = fh.readline()
+                        if not line:
+                            break
+                        if line.startswith(b"## ["):
+                            if heading is not None:
+                                break
+                            heading = line
+                        elif heading is not None:
+                            body.append(line)
+                if heading is None:
+                    break
+                match = ChangelogIndex.heading_re.match(heading)
+                if match is None or match.group(1).lower() == b"unreleased":
+                    continue
+                day = match.group(2).decode() if match.group(2) else ""
+                yield Section(
+                    package, match.group(1).decode(), day, heading, b"".join(body)
+                )
+
+    @staticmethod
+    def in_date_order(changelog: Path) -> bool:
+        """Return whether a changelog's releases are dated newest first.
+
+        The merge streams each changelog and relies on this order, which the
+        validator only warns about (CB004). Dates come from the cached index
+        when it is current; otherwise the headings are scanned without saving
+        an index into the package.
+        """
+        previous = None
+        for path in Archive.files(changelog):
+            index = ChangelogIndex.read(path) or ChangelogIndex.build(path)
+            for release in index.releases:
+                if release.version.lower() == "unreleased":
+                    continue
+                date = release.date or ""
+                if previous is not None and date > previous:
+                    return False
+                previous = date
+        return True
+
+    @staticmethod
+    def stamp(changelog: Path) -> list[list[int]]:
+        """Return the size and mtime of a changelog and each of its shards."""
+        return [
+            [st.st_size, st.st_mtime_ns]
+            for st in map(os.stat, Archive.files(changelog))
+        ]
+
+    def read_state(self) -> dict | None:
+        """Return the state of the last refresh, or None if it cannot be trusted."""
+        try:
+            state = json.loads(self.state_path.read_bytes())
+            st = os.stat(self.output)
+        except (OSError, ValueError):
+            return None
+        if state.get("output") != [st.st_size, st.st_mtime_ns]:
+            return None  # the output was edited by hand
+        return state
+
+    def refresh(self, full: bool = False) -> tuple[str, int]:
+        """Bring the output up to date with the package changelogs.
+
+        When packages were only bumped since the last refresh, their new
+        sections are merged and written in front of the existing output and
+        the unchanged packages are not read at all. Anything else (edited or
+        removed releases, packages added or removed, or new releases dated
+        before the newest one already in the output) triggers a full merge.
+
+        Args:
+            full (bool, optional): Always merge every changelog again.
+
+        Returns:
+            tuple[str, int]: "full", "incremental" or "unchanged", and the
+            number of sections written.
+        """
+        state = None if full else self.read_state()
+        if state is not None and state["inputs"].keys() == self.packages.keys():
+            changed = {
+                name: path
+                for name, path in self.packages.items()
+                if state["inputs"][name]["stamp"] != self.stamp(path)
+            }
+            if not changed:
+                return "unchanged", 0
+            with Profiler.span("aggregate.incremental"):
+                count = self._prepend(state, changed)
+            if count is not None:
+                return "incremental", count
+        with Profiler.span("aggregate.merge"):
+            return "full", self._merge()
+
+    def _merge(self) -> int:
+        records = {name: {"top": None, "digest": ""} for name in self.packages}
+
+        def tracked(name: str, path: Path) -> Iterator[Section]:
+            record = records[name]
+            for section in self.sections(name, path):
+                record["top"] = record["top"] or section.digest
+                record["digest"] = self.chain(record["digest"], [section])
+                yield section
+
+        streams = []
+        for name, path in self.packages.items():
+            stream = tracked(name, path)
+            if not self.in_date_order(path):
+                # Only out-of-order changelogs are held in memory to be sorted
+                stream = iter(sorted(stream, key=attrgetter("date"), reverse=True))
+            streams.append(stream)
+        count = 0
+        newest = ""
+        with AtomicFile(self.output) as out:
+            out.write(self.title)
+            for section in heapq.merge(*streams, key=attrgetter("date"), reverse=True):
+                if not count:
+                    newest = section.date
+                out.write(section.render())
+                count += 1
+        self._save_state(newest, records)
+        return count
+
+    def _prepend(self, state: dict, changed: dict[str, Path]) -> int | None:
+        """Write only the sections added to ``changed``; None if that is not enough."""
+        new: list[list[Section]] = []
+        records = dict(state["inputs"])
+        for name, path in changed.items():
+            old = state["inputs"][name]
+            added: list[Section] = []
+            digest = tail = ""
+            found = old["top"] is None
+            for section in self.sections(name, path):
+                if not found and section.digest == old["top"]:
+                    found = True
+                digest = self.chain(digest, [section])
+                if found:
+                    tail = self.chain(tail, [section])
+                else:
+                    added.append(section)
+            if not found or tail != old["digest"]:
+                return None
+            if any(section.date < state["newest"] for section in added):
+                return None
+            top = added[0].digest if added else old["top"]
+            records[name] = {"top": top, "digest": digest}
+            added.sort(key=attrgetter("date"), reverse=True)
+            new.append(added)
+
+        merged = list(heapq.merge(*new, key=attrgetter("date"), reverse=True))
+        with self.output.open("rb") as src, AtomicFile(self.output) as out:
+            out.write(self.title)
+            for section in merged:
+                out.write(section.render())
+            src.seek(len(self.title))
+            shutil.copyfileobj(src, out)
+        self._save_state(merged[0].date if merged else state["newest"], records)
+        return len(merged)
+
+    @staticmethod
+    def chain(digest: str, sections: Iterable[Section]) -> str:
+        """Extend a hash of a package's sections, in file order.
+
+        Each step hashes the previous value with the next section's digest,
+        so releases that were reordered, not only edited, no longer match.
+        """
+        for section in sections:
+            digest = hashlib.sha1((digest + section.digest).encode()).hexdigest()
+        return digest
+
+    def _save_state(self, newest: str, records: dict[str, dict]) -> None:
+        st = os.stat(self.output)
+        state = {
+            "output": [st.st_size, st.st_mtime_ns],
+            "newest": newest,
+            "inputs": {
+                name: {**records[name], "stamp": self.stamp(path)}
+                for name, path in self.packages.items()
+            },
+        }
+        Transaction.state_dir(self.output.absolute().parent)
+        with AtomicFile(self.state_path) as fh:
+            fh.write(json.dumps(state).encode())
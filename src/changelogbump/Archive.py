@@ -0,0 +1,239 @@
+"""Moves old releases out of the changelog into per-major shard files.
+
+This module provides the Archive class. Archiving cuts the oldest releases
+out of CHANGELOG.md and prepends them to ``changelog/<major>.x.md`` beside it,
+recording each shard in ``changelog/manifest.json``. Bumps then rewrite only
+the small head file, while ``show``, ``check`` and ``query`` follow the
+manifest to see the whole history.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import shutil
+from dataclasses import replace
+from datetime import date, timedelta
+from pathlib import Path
+
+from changelogbump.AtomicFile import AtomicFile
+from changelogbump.ChangelogIndex import ChangelogIndex, Release
+from changelogbump.Version import Version
+
+
+class Archive:
+    """Shards of a changelog's older releases, one file per major version."""
+
+    dir_name: str = "changelog"
+    manifest_name: str = "manifest.json"
+    # Link reference definitions, as in a "[1.0.0]: https://..." footer
+    link_ref_re = re.compile(rb"^\[[^\]]+\]:\s*\S")
+
+    @classmethod
+    def directory(cls, changelog: Path) -> Path:
+        """Return the directory holding the shards of ``changelog``."""
+        return Path(changelog).with_name(cls.dir_name)
+
+    @classmethod
+    def manifest(cls, changelog: Path) -> list[dict]:
+        """Return the manifest entries, newest major first, or [] if unarchived.
+
+        Each entry holds the shard ``file`` name, its ``major`` version, the
+        ``newest`` and ``oldest`` release it holds, and its ``releases`` count.
+        """
+        try:
+            data = json.loads(
+                (cls.directory(changelog) / cls.manifest_name).read_bytes()
+            )
+        except FileNotFoundError:
+            return []
+        return data["shards"]
+
+    @classmethod
+    def files(cls, changelog: Path) -> list[Path]:
+        """Return the changelog followed by its shards, newest to oldest."""
+        directory = cls.directory(changelog)
+        return [Path(changelog)] + [
+            directory / s["file"] for s in cls.manifest(changelog)
+        ]
+
+    @classmethod
+    def find(cls, changelog: Path, version: str) -> Release | None:
+        """Look up an archived release through the manifest.
+
+        Returns:
+            Release | None: The section, with ``path`` set to its shard, or
+            None if no shard holds ``version``.
+        """
+        try:
+            major = Version.from_string(version).major
+        except ValueError:
+            return None
+        for shard in cls.manifest(changelog):
+            if shard["major"] == major:
+                path = cls.directory(changelog) / shard["file"]
+                release = ChangelogIndex.load(path).find(version)
+                if release is not None:
+                    release.path = path
+                return release
+        return None
+
+    @staticmethod
+    def cutoff(
+        releases: list[tuple[Release, Version]],
+        keep: int | None = None,
+        days: int | None = None,
+        below_major: int | None = None,
+    ) -> int:
+        """Return the position of the newest release to archive.
+
+        ``releases`` are in file order, newest first. The cutoff is the first
+        release that is beyond ``keep`` releases, dated more than ``days``
+        days ago, or below major version ``below_major``; it and every older
+        release are archived.
+        """
+        limit = date.today() - timedelta(days=days) if days is not None else None
+        for i, (release, version) in enumerate(releases):
+            if keep is not None and i >= keep:
+                return i
+            if below_major is not None and version.major < below_major:
+                return i
+            if limit is not None and release.date:
+                try:
+                    if date.fromisoformat(release.date) < limit:
+                        return i
+                except ValueError:
+                    pass
+        return len(releases)
+
+    @classmethod
+    def archive(
+        cls,
+        changelog: Path,
+        keep: int | None = None,
+        days: int | None = None,
+        below_major: int | None = None,
+    ) -> dict[str, int]:
+        """Move releases past the cutoff into their major version's shard.
+
+        The project lock is taken before the changelog is indexed, so the
+        offsets it is cut at cannot be shifted by a concurrent bump. Shards
+        are written first, reading sections straight from the original file,
+        then the manifest, then the trimmed head; all inside one Transaction,
+        so an interrupted archive is rolled back.
+
+        Args:
+            changelog (Path): The head changelog.
+            keep (int | None, optional): Releases to keep in the head.
+            days (int | None, optional): Archive releases older than this.
+            below_major (int | None, optional): Archive majors below this.
+
+        Returns:
+            dict[str, int]: Number of releases moved, by shard file name.
+        """
+        from changelogbump.Transaction import FileLock, Transaction
+
+        changelog = Path(changelog)
+        root = changelog.absolute().parent
+        with FileLock(Transaction.lock_path(root)):
+            Transaction.recover(root)
+            return cls._archive(changelog, keep, days, below_major)
+
+    @classmethod
+    def _archive(
+        cls,
+        changelog: Path,
+        keep: int | None,
+        days: int | None,
+        below_major: int | None,
+    ) -> dict[str, int]:
+        from changelogbump.Changelog import Changelog
+        from changelogbump.Transaction import Transaction
+
+        index = ChangelogIndex.load(changelog)
+        versioned = []
+        for release in index.releases:
+            if release.offset + release.length == index.stamp["size"]:
+                release = cls._without_footer(changelog, release)
+            try:
+                versioned.append((release, Version.from_string(release.version)))
+            except ValueError:
+                continue  # "Unreleased" and anything else not a version stays
+        moving = versioned[cls.cutoff(versioned, keep, days, below_major) :]
+        if not moving:
+            return {}
+
+        groups: dict[int, list[tuple[Release, Version]]] = {}
+        for release, version in moving:
+            groups.setdefault(version.major, []).append((release, version))
+        directory = cls.directory(changelog)
+        directory.mkdir(exist_ok=True)
+        manifest_path = directory / cls.manifest_name
+        shards = {s["major"]: s for s in cls.manifest(changelog)}
+        shard_paths = [directory / f"{major}.x.md" for major in groups]
+
+        with (
+            Transaction(
+                changelog.absolute().parent,
+                replaced=[changelog, manifest_path, *shard_paths],
+                lock=False,
+            ),
+            changelog.open("rb") as src,
+        ):
+            for (major, group), shard_path in zip(groups.items(), shard_paths):
+                cls._prepend(shard_path, major, src, [r for r, _ in group])
+                entry = shards.get(major)
+                shards[major] = {
+                    "file": shard_path.name,
+                    "major": major,
+                    "newest": group[0][1].current,
+                    "oldest": entry["oldest"] if entry else group[-1][1].current,
+                    "releases": len(group) + (entry["releases"] if entry else 0),
+                }
+            with AtomicFile(manifest_path) as fh:
+                manifest = [shards[m] for m in sorted(shards, reverse=True)]
+                fh.write(json.dumps({"shards": manifest}, indent=2).encode() + b"\n")
+
+            with AtomicFile(changelog) as dst:
+                position = 0
+                for release, _ in sorted(moving, key=lambda m: m[0].offset):
+                    src.seek(position)
+                    Changelog._copy_bytes(src, dst, release.offset - position)
+                    position = release.offset + release.length
+                src.seek(position)
+                shutil.copyfileobj(src, dst, Changelog.chunk_size)
+        return {
+            path.name: len(group) for path, group in zip(shard_paths, groups.values())
+        }
+
+    @classmethod
+    def _without_footer(cls, changelog: Path, release: Release) -> Release:
+        """Return the last section of a changelog, ending before its link footer.
+
+        Link reference definitions after the last release serve the whole
+        file, so they stay in the head when that release is archived.
+        """
+        position = release.offset
+        with changelog.open("rb") as fh:
+            fh.seek(position)
+            for line in fh:
+                if position > release.offset and cls.link_ref_re.match(line):
+                    return replace(release, length=position - release.offset)
+                position += len(line)
+        return release
+
+    @classmethod
+    def _prepend(cls, shard: Path, major: int, src, releases: list[Release]) -> None:
+        from changelogbump.Changelog import Changelog
+
+        title = f"# Changelog archive: {major}.x\n\n".encode()
+        with AtomicFile(shard) as dst:
+            dst.write(title)
+            for release in releases:
+                src.seek(release.offset)
+                section = src.read(release.length)
+                dst.write(section.rstrip(b"\n") + b"\n\n")
+            if shard.exists():
+                with shard.open("rb") as old:
+                    old.seek(len(title))
+                    shutil.copyfileobj(old, dst, Changelog.chunk_size)
@@ -0,0 +1,78 @@
+"""Provides crash-safe replacement of files on disk.
+
+This module provides the AtomicFile context manager, which writes to a
+temporary file beside the target and renames it into place only once the new
+content has been fully written and flushed, and the fsync_dir helper that
+makes such a rename durable.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import BinaryIO
+
+
+def fsync_dir(path: Path | str) -> None:
+    """Flush a directory's entries to disk so a completed rename survives a crash.
+
+    A no-op on platforms that cannot open directories, such as Windows.
+    """
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class AtomicFile:
+    """Context manager yielding a binary handle whose content replaces a file.
+
+    The temporary file lives in the target's directory so the final
+    ``os.replace`` never crosses a filesystem boundary. If the block raises,
+    the temporary file is removed and the target is left untouched.
+
+    Attributes:
+        path (Path): The file that will be replaced on a successful exit.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._fh: BinaryIO | None = None
+        self._tmp_name: str | None = None
+
+    def __enter__(self) -> BinaryIO:
+        self._tmp_name = str(
+            self.path.parent / f".{self.path.name}.{uuid.uuid4().hex}.tmp"
+        )
+        # Created like open() would create it: 0o666 less the process umask
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+        fd = os.open(self._tmp_name, flags, 0o666)
+        self._fh = os.fdopen(fd, "wb")
+        return self._fh
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        assert self._fh is not None and self._tmp_name is not None
+        try:
+            if exc_type is None:
+                self._fh.flush()
+                os.fsync(self._fh.fileno())
+            self._fh.close()
+            if exc_type is not None:
+                os.unlink(self._tmp_name)
+                return
+            if self.path.exists():
+                shutil.copymode(self.path, self._tmp_name)
+            os.replace(self._tmp_name, self.path)
+            fsync_dir(self.path.parent)
+        except BaseException:
+            if os.path.exists(self._tmp_name):
+                os.unlink(self._tmp_name)
+            raise
+        finally:
+            self._fh = None
+            self._tmp_name = None
@@ -4,16 +4,47 @@ This module provides the Changelog class for user input prompts and version
 entries in the project's CHANGELOG.md file.
 """
 
+from __future__ import annotations
+
+import io
+import itertools
+from collections.abc import Iterable
 from datetime import date
 from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
 
 import click
 
+from changelogbump.Profiler import Profiler
+
+if TYPE_CHECKING:
+    from changelogbump.ChangelogIndex import Release
+
+# Modules needed only for reading or rewriting the file are imported inside
+# the methods that use them, keeping `changelogbump init` cheap to start.
+
 
 class Changelog:
     """Manages updates to the project's CHANGELOG.md file."""
 
     path: Path = Path("CHANGELOG.md")
+    heading_prefix: bytes = b"## ["
+    chunk_size: int = 1024 * 1024
+    section_names: tuple[str, ...] = ("added", "changed", "removed")
+    # First line of an Unreleased body generated from pending notes
+    unreleased_marker: str = "<!-- Pending notes; record with 'changelogbump note'. -->"
+
+    @classmethod
+    def at(cls, path: Path | str) -> type[Changelog]:
+        """Return a variant of this class bound to a different changelog path.
+
+        Args:
+            path (Path | str): Location of the changelog to operate on.
+
+        Returns:
+            type[Changelog]: A subclass whose ``path`` is set to ``path``.
+        """
+        return type(cls.__name__, (cls,), {"path": Path(path)})
 
     @staticmethod
     def generate_sections() -> dict[str, list[str]]:
@@ -38,36 +69,317 @@ class Changelog:
         return result
 
     @classmethod
-    def update(cls, new_version: str, summary_text: str | None = None):
+    def read_sections(cls, lines: Iterable[str]) -> dict[str, list[str]]:
+        """Collect changelog entries from structured text in a single pass.
+
+        Each line is read once and may be any of:
+
+        - a JSON object, either ``{"section": "added", "entry": "..."}`` or a
+          mapping of section names to lists of entries;
+        - a section header, ``### Added`` or ``Added:``;
+        - an entry under the current header, ``- text`` or ``* text``;
+        - blank, which is ignored.
+
+        Args:
+            lines (Iterable[str]): The input, e.g. an open file or sys.stdin.
+
+        Returns:
+            dict[str, list[str]]: Entries keyed by section, in input order.
+
+        Raises:
+            ValueError: On malformed JSON, an unknown section, or an entry
+                appearing before any section header. The message names the
+                offending line number.
+        """
+        import json
+
+        result: dict[str, list[str]] = {key: [] for key in cls.section_names}
+        current: str | None = None
+
+        def add(lineno: int, section: object, entry: object) -> None:
+            key = str(section).strip().lower()
+            if key not in result:
+                raise ValueError(f"line {lineno}: unknown section {section!r}")
+            if not isinstance(entry, str) or not entry.strip():
+                raise ValueError(f"line {lineno}: entries must be non-empty strings")
+            result[key].append(entry.strip())
+
+        for lineno, raw in enumerate(lines, 1):
+            line = raw.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                try:
+                    obj = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(
+                        f"line {lineno}: invalid JSON: {exc.msg}"
+                    ) from None
+                if "section" in obj:
+                    add(lineno, obj["section"], obj.get("entry"))
+                    continue
+                for section, entries in obj.items():
+                    if not isinstance(entries, list):
+                        entries = [entries]
+                    for entry in entries:
+                        add(lineno, section, entry)
+            elif line[:2] in ("- ", "* "):
+                # Checked before headers, so an entry may end with a colon
+                if current is None:
+                    raise ValueError(f"line {lineno}: entry before any section header")
+                add(lineno, current, line[2:])
+            elif line.startswith("### ") or line.endswith(":"):
+                current = line.removeprefix("### ").removesuffix(":").strip().lower()
+                if current not in result:
+                    raise ValueError(f"line {lineno}: unknown section {current!r}")
+            else:
+                raise ValueError(f"line {lineno}: unrecognized line {line!r}")
+        return result
+
+    @classmethod
+    def update(
+        cls,
+        new_version: str,
+        summary_text: str | None = None,
+        sections: dict[str, list[str]] | None = None,
+    ):
         """Append a new version section to the project's changelog.
 
         Args:
             new_version (str): The new version string to include in the changelog.
             summary_text (str | None, optional): A summary or heading to place
                 under the version entry. Defaults to None.
+            sections (dict[str, list[str]] | None, optional): Entries keyed by
+                section name. Defaults to None, which prompts for them.
         """
-        content = cls.path.read_text()
+        with Profiler.span("changelog.update"):
+            if sections is None:
+                with Profiler.span("changelog.prompt"):
+                    sections = cls.generate_sections()
+            cls._write_section(new_version, summary_text, sections)
+
+    @staticmethod
+    def render_sections(sections: dict[str, list[str]]) -> str:
+        """Render entries as ``### Section`` blocks, skipping empty sections."""
+        text = ""
+        for key, value in sections.items():
+            if len(value) > 0:
+                text += f"### {key.title()}\n\n"
+                ents = [f"- {ent}" for ent in value]
+                text += "\n".join(ents) + "\n\n"
+        return text
+
+    @classmethod
+    def _write_section(
+        cls, new_version: str, summary_text: str | None, sections: dict[str, list[str]]
+    ) -> None:
         today = date.today().strftime("%Y-%m-%d")
 
         # Prepare a new version section
         new_entry = f"## [{new_version}] - {today}\n\n"
         if summary_text:
             new_entry += f"{summary_text}\n\n"
-        for key, value in cls.generate_sections().items():
-            if len(value) > 0:
-                new_entry += f"### {key.title()}\n\n"
-                ents = [f"- {ent}" for ent in value]
-                new_entry += "\n".join(ents) + "\n\n"
+        new_entry += cls.render_sections(sections)
+
+        from changelogbump.ChangelogIndex import ChangelogIndex
+
+        # Keep an existing sidecar index current without rescanning the file
+        index = ChangelogIndex.read(cls.path)
+        offset = cls.insert(new_entry)
+        if index is not None:
+            index.record_insert(offset)
+            index.save()
+
+    @classmethod
+    def insert(cls, new_entry: str) -> int:
+        """Stream the changelog into a new file with ``new_entry`` spliced in.
+
+        Only the lines before the first version heading are scanned; the
+        remainder of the file is copied in fixed-size chunks, so memory use
+        does not depend on the size of the changelog. The rewritten file is
+        moved into place atomically.
 
-        lines = content.splitlines()
-        # Insert the new version section before the first existing version heading
-        for i, line in enumerate(lines):
-            if line.startswith("## ["):
-                lines.insert(i, new_entry)
+        Args:
+            new_entry (str): Rendered version section, placed before the first
+                existing version heading other than ``## [Unreleased]``, which
+                stays on top, or appended if there is none.
+
+        Returns:
+            int: Byte offset at which the entry was written.
+        """
+        from changelogbump.AtomicFile import AtomicFile
+
+        with (
+            Profiler.span("changelog.insert") as span,
+            cls.path.open("rb") as src,
+            AtomicFile(cls.path) as dst,
+        ):
+            offset = cls._splice(src, dst, new_entry)
+            span.bytes_read, span.bytes_written = src.tell(), dst.tell()
+        return offset
+
+    @classmethod
+    def _splice(cls, src: BinaryIO, dst: BinaryIO, new_entry: str) -> int:
+        import shutil
+
+        offset = 0
+        last = b""
+        unreleased = False
+        for line in iter(src.readline, b""):
+            if line.startswith(cls.heading_prefix):
+                name = line[len(cls.heading_prefix) :].lower()
+                if not unreleased and name.startswith(b"unreleased]"):
+                    # Unreleased stays on top; the release goes below its body
+                    unreleased = True
+                else:
+                    dst.write(new_entry.encode() + b"\n" + line)
+                    shutil.copyfileobj(src, dst, cls.chunk_size)
+                    return offset
+            dst.write(line)
+            offset += len(line)
+            last = line
+        # If no later heading is found, append to the end after a blank line
+        if last and not last.endswith(b"\n"):
+            dst.write(b"\n")
+            offset += 1
+        if unreleased and last.strip():
+            dst.write(b"\n")
+            offset += 1
+        dst.write(new_entry.encode())
+        return offset
+
+    @classmethod
+    def releases(cls, spec: str) -> list[Release]:
+        """Locate the sections selected by a version or an inclusive range.
+
+        Releases moved out by ``archive`` are found through its manifest; a
+        range only opens the shards whose majors it can reach.
+
+        Args:
+            spec (str): A single version ("1.4.2") or a range ("1.2.0..1.5.0").
+                Either end of a range may be omitted to leave it open.
+
+        Returns:
+            list[Release]: Matching sections in file order, the changelog's
+            first and then each shard's, newest major first.
+        """
+        from changelogbump.Archive import Archive
+        from changelogbump.ChangelogIndex import ChangelogIndex
+        from changelogbump.Version import Version
+
+        index = ChangelogIndex.load(cls.path)
+        if ".." not in spec:
+            release = index.find(spec) or Archive.find(cls.path, spec)
+            return [release] if release else []
+
+        lo_str, hi_str = spec.split("..", 1)
+        lo = Version.from_string(lo_str) if lo_str else None
+        hi = Version.from_string(hi_str) if hi_str else None
+        indexes = [index]
+        for shard in Archive.manifest(cls.path):
+            if (lo is None or lo.major <= shard["major"]) and (
+                hi is None or shard["major"] <= hi.major
+            ):
+                path = Archive.directory(cls.path) / shard["file"]
+                indexes.append(ChangelogIndex.load(path))
+        selected = []
+        for shard_index in indexes:
+            for release in shard_index.releases:
+                try:
+                    version = Version.from_string(release.version)
+                except ValueError:
+                    continue
+                if (lo is None or lo <= version) and (hi is None or version <= hi):
+                    if shard_index is not index:
+                        release.path = shard_index.path
+                    selected.append(release)
+        return selected
+
+    @classmethod
+    def stream(cls, releases: list[Release], out: BinaryIO) -> None:
+        """Copy the bytes of the given sections to a binary stream.
+
+        Each section is read by seeking to its indexed offset, so the cost
+        depends only on the size of the sections being copied.
+
+        Args:
+            releases (list[Release]): Sections as returned by releases().
+            out (BinaryIO): Destination stream.
+        """
+        for path, group in itertools.groupby(releases, lambda r: r.path or cls.path):
+            with path.open("rb") as fh:
+                for release in group:
+                    fh.seek(release.offset)
+                    cls._copy_bytes(fh, out, release.length)
+
+    @classmethod
+    def _copy_bytes(cls, src: BinaryIO, dst: BinaryIO, length: int) -> None:
+        remaining = length
+        while remaining:
+            chunk = src.read(min(remaining, cls.chunk_size))
+            if not chunk:
                 break
-        else:
-            # If no headings are found, just append to the end
-            lines.append(new_entry)
+            dst.write(chunk)
+            remaining -= len(chunk)
+
+    @classmethod
+    def render_unreleased(cls, sections: dict[str, list[str]]) -> bool:
+        """Replace the body of the ``## [Unreleased]`` section with pending entries.
+
+        The rendered body starts with ``unreleased_marker`` so it can be told
+        apart from hand-written text. Passing no entries clears a previously
+        rendered body and leaves any other body alone.
+
+        Args:
+            sections (dict[str, list[str]]): Entries keyed by section name.
+
+        Returns:
+            bool: True if the changelog was rewritten.
 
-        updated_content = "\n".join(lines)
-        cls.path.write_text(updated_content)
+        Raises:
+            KeyError: If the changelog has no Unreleased section.
+        """
+        import shutil
+
+        from changelogbump.AtomicFile import AtomicFile
+        from changelogbump.ChangelogIndex import ChangelogIndex
+
+        release = ChangelogIndex.load(cls.path).find("Unreleased")
+        if release is None:
+            raise KeyError(f"No '## [Unreleased]' section in {cls.path}")
+        body = cls.render_sections(sections)
+        with (
+            Profiler.span("changelog.render_unreleased") as span,
+            cls.path.open("rb") as src,
+        ):
+            src.seek(release.offset)
+            heading = src.readline()
+            current = src.read(release.length - len(heading))
+            if not body and cls.unreleased_marker.encode() not in current:
+                return False
+            with AtomicFile(cls.path) as dst:
+                src.seek(0)
+                cls._copy_bytes(src, dst, release.offset)
+                dst.write(heading.rstrip(b"\n") + b"\n")
+                if body:
+                    dst.write(f"\n{cls.unreleased_marker}\n\n{body}".encode())
+                src.seek(release.offset + release.length)
+                if not body and src.peek(1):
+                    dst.write(b"\n")  # keep a blank line before the next release
+                shutil.copyfileobj(src, dst, cls.chunk_size)
+                span.bytes_read, span.bytes_written = src.tell(), dst.tell()
+        return True
+
+    @classmethod
+    def section(cls, spec: str) -> str:
+        """Return the text of one version's section, or of a range of sections.
+
+        Args:
+            spec (str): A version or range, as accepted by releases().
+
+        Returns:
+            str: The selected sections, or an empty string if none match.
+        """
+        buffer = io.BytesIO()
+        cls.stream(cls.releases(spec), buffer)
+        return buffer.getvalue().decode()
@@ -0,0 +1,184 @@
+"""Maintains a persistent byte-offset index of changelog version headings.
+
+This module provides the ChangelogIndex class, which records where each
+``## [x.y.z] - date`` section starts and how long it is, and stores that map
+in a sidecar file under the project's ``.changelogbump/`` state directory so
+later lookups can seek straight to a release instead of rescanning the whole
+file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from changelogbump.AtomicFile import AtomicFile
+
+
+@dataclass
+class Release:
+    """Location of one version section within a changelog.
+
+    Attributes:
+        version (str): The bracketed heading text, e.g. "1.4.2" or "Unreleased".
+        date (str | None): The date following the heading, if any.
+        offset (int): Byte offset of the heading line.
+        length (int): Byte length of the section, up to the next heading or EOF.
+        path (Path | None): The file holding the section when it is not the
+            changelog itself, e.g. an archive shard. Not stored in the sidecar.
+    """
+
+    version: str
+    date: str | None
+    offset: int
+    length: int
+    path: Path | None = None
+
+
+class ChangelogIndex:
+    """Sidecar index mapping changelog version headings to byte offsets.
+
+    The sidecar is keyed on the changelog's size, mtime and a hash of its
+    first ``head_size`` bytes; any mismatch causes a rebuild on load.
+    """
+
+    heading_re = re.compile(rb"^## \[([^\]]+)\](?:\s+-\s+(\S+))?")
+    head_size: int = 4096
+
+    def __init__(self, path: Path, releases: list[Release], stamp: dict):
+        self.path = path
+        self.releases = releases
+        self.stamp = stamp
+        self._by_version = {r.version: r for r in releases}
+
+    @staticmethod
+    def sidecar(path: Path) -> Path:
+        """Return the sidecar index location for a changelog path.
+
+        The sidecar lives in the state directory beside the changelog, which
+        ignores itself, so indexing never adds untracked files to a project.
+        """
+        from changelogbump.Transaction import Transaction
+
+        return path.parent / Transaction.state_dir_name / f"{path.name}.idx"
+
+    @classmethod
+    def stamp_of(cls, path: Path) -> dict:
+        """Return the size, mtime and head hash identifying a file's content."""
+        st = os.stat(path)
+        with path.open("rb") as fh:
+            head = hashlib.sha1(fh.read(cls.head_size)).hexdigest()
+        return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "head": head}
+
+    @classmethod
+    def build(cls, path: Path) -> ChangelogIndex:
+        """Scan a changelog once, line by line, and index its version headings.
+
+        Args:
+            path (Path): The changelog to scan.
+
+        Returns:
+            ChangelogIndex: A freshly built (unsaved) index.
+        """
+        stamp = cls.stamp_of(path)
+        releases: list[Release] = []
+        offset = 0
+        with path.open("rb") as fh:
+            for line in fh:
+                match = cls.heading_re.match(line)
+                if match:
+                    if releases:
+                        releases[-1].length = offset - releases[-1].offset
+                    date = match.group(2).decode() if match.group(2) else None
+                    releases.append(Release(match.group(1).decode(), date, offset, 0))
+                offset += len(line)
+        if releases:
+            releases[-1].length = offset - releases[-1].offset
+        return cls(path, releases, stamp)
+
+    @classmethod
+    def read(cls, path: Path) -> ChangelogIndex | None:
+        """Load the sidecar index for ``path`` if it is still current.
+
+        Returns:
+            ChangelogIndex | None: The stored index, or None if it is missing,
+            unreadable or no longer matches the changelog.
+        """
+        try:
+            data = json.loads(cls.sidecar(path).read_bytes())
+            if data["stamp"] != cls.stamp_of(path):
+                return None
+            releases = [Release(*r) for r in data["releases"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return cls(path, releases, data["stamp"])
+
+    @classmethod
+    def load(cls, path: Path) -> ChangelogIndex:
+        """Return the current index for ``path``, rebuilding the sidecar if stale."""
+        index = cls.read(path)
+        if index is None:
+            index = cls.build(path)
+            index.save()
+        return index
+
+    def save(self) -> None:
+        """Write the index to its sidecar file."""
+        from changelogbump.Transaction import Transaction
+
+        Transaction.state_dir(self.path.parent)
+        data = {
+            "stamp": self.stamp,
+            "releases": [
+                [r.version, r.date, r.offset, r.length] for r in self.releases
+            ],
+        }
+        with AtomicFile(self.sidecar(self.path)) as fh:
+            fh.write(json.dumps(data, separators=(",", ":")).encode())
+
+    def find(self, version: str) -> Release | None:
+        """Return the section for ``version``, or None if it has no heading."""
+        return self._by_version.get(version)
+
+    def latest(self) -> Release | None:
+        """Return the first released (non-"Unreleased") section in the file."""
+        for release in self.releases:
+            if release.version.lower() != "unreleased":
+                return release
+        return None
+
+    def record_insert(self, offset: int) -> None:
+        """Update the index in place after a section was inserted at ``offset``.
+
+        Every section at or after ``offset`` is shifted by the number of bytes
+        added, the new section is indexed from its heading, and the stamp is
+        refreshed, all without rescanning the changelog.
+
+        Args:
+            offset (int): Byte offset where the new section was written.
+        """
+        stamp = self.stamp_of(self.path)
+        delta = stamp["size"] - self.stamp["size"]
+        position = len(self.releases)
+        for i, release in enumerate(self.releases):
+            if release.offset >= offset:
+                release.offset += delta
+                position = min(position, i)
+        length = delta if position < len(self.releases) else stamp["size"] - offset
+        if position:
+            # The section above now ends where the new one starts
+            previous = self.releases[position - 1]
+            previous.length = offset - previous.offset
+        with self.path.open("rb") as fh:
+            fh.seek(offset)
+            match = self.heading_re.match(fh.readline())
+        if match:
+            date = match.group(2).decode() if match.group(2) else None
+            release = Release(match.group(1).decode(), date, offset, length)
+            self.releases.insert(position, release)
+            self._by_version[release.version] = release
+        self.stamp = stamp
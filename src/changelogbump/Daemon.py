@@ -0,0 +1,223 @@
+"""Keeps a project's version and changelog state warm behind a Unix socket.
+
+This module provides the Service class, which answers version, show and bump
+requests for one project and caches what it read until a stat of the
+underlying files shows they changed, and the Daemon class, which serves a
+Service on the project's socket for ``changelogbump serve``. The matching
+client lives in ``changelogbump.client``.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import ClassVar, Self
+
+from changelogbump import client
+
+log = logging.getLogger(__name__)
+
+
+class DaemonError(Exception):
+    """Raised when a daemon cannot be started."""
+
+
+class Service:
+    """Request handler for one project, with results cached by file stamp.
+
+    A cached result is reused while the size, mtime and inode of every file
+    it was computed from are unchanged, which costs one ``stat`` per file.
+    The stamp is taken before the files are read, so a change that races
+    with a read is picked up by the next request rather than hidden. The
+    daemon serves each connection on its own thread, so the cache is only
+    touched under a lock; results are computed outside it.
+
+    Attributes:
+        root (Path): The project directory.
+    """
+
+    max_cached: int = 256
+
+    def __init__(self, root: Path | str):
+        from changelogbump.Changelog import Changelog
+        from changelogbump.PyProject import PyProject
+
+        self.root = Path(root)
+        self.changelog = Changelog.at(self.root / Changelog.path.name)
+        self.pyproject = PyProject.at(self.root / PyProject.path.name)
+        self._cache: dict[tuple, tuple[tuple, object]] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, message: dict) -> dict:
+        """Run one request.
+
+        Args:
+            message (dict): ``{"op": ..., **params}``.
+
+        Returns:
+            dict: ``{"result": ...}``, or ``{"error": "Type: message"}``.
+        """
+        params = dict(message)
+        handler = self.ops.get(params.pop("op", None))
+        if handler is None:
+            return {"error": f"ValueError: unknown operation {message.get('op')!r}"}
+        try:
+            return {"result": handler(self, **params)}
+        except (OSError, ValueError, LookupError, TypeError) as exc:
+            return {"error": f"{type(exc).__name__}: {exc}"}
+        except Exception as exc:
+            # Still an answer for the client, but not one the daemon expected
+            log.exception("%s request failed", message.get("op"))
+            return {"error": f"{type(exc).__name__}: {exc}"}
+
+    def version(self) -> str:
+        """Return the version in pyproject.toml (PyProject caches it by stat)."""
+        return self.pyproject().current_version
+
+    def show(self, spec: str) -> str:
+        """Return the changelog sections for a version or range, as ``show`` prints them.
+
+        Raises:
+            LookupError: If no section matches.
+        """
+        from changelogbump.Archive import Archive
+
+        def render() -> str:
+            releases = self.changelog.releases(spec)
+            if not releases:
+                raise LookupError(f"No changelog section found for {spec}.")
+            out = io.BytesIO()
+            self.changelog.stream(releases, out)
+            return out.getvalue().decode()
+
+        # Shards only change together with the archive manifest
+        manifest = Archive.directory(self.changelog.path) / Archive.manifest_name
+        return self._cached(("show", spec), [self.changelog.path, manifest], render)
+
+    def bump(
+        self,
+        part: str = "patch",
+        summary: str | None = None,
+        sections: dict[str, list[str]] | None = None,
+    ) -> dict[str, str]:
+        """Bump the project through the same queue as ``add``."""
+        from changelogbump import api
+
+        result = api.bump(self.root, part, summary, sections)
+        return {"old": result.old_version, "new": result.new_version}
+
+    ops: ClassVar[dict[str, Callable]] = {
+        "version": version,
+        "show": show,
+        "bump": bump,
+    }
+
+    @staticmethod
+    def _stamp(paths: list[Path]) -> tuple:
+        stamp = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_size, st.st_mtime_ns, st.st_ino))
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _cached(self, key: tuple, paths: list[Path], compute: Callable):
+        stamp = self._stamp(paths)
+        with self._lock:
+            hit = self._cache.get(key)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+        value = compute()
+        with self._lock:
+            if key not in self._cache and len(self._cache) >= self.max_cached:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = (stamp, value)
+        return value
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                response = {"error": "ValueError: malformed request"}
+            else:
+                response = self.server.service.handle(message)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class Daemon:
+    """Serves a project's Service on its Unix socket, one thread per connection.
+
+    Use as a context manager: entering binds the socket (replacing one left by
+    a daemon that died) and exiting removes it. The socket is made readable
+    and writable by its owner only before it starts listening, since any
+    client that can connect can bump the project.
+
+    Attributes:
+        root (Path): The project directory.
+        path (Path): The socket, inside the project's state directory.
+    """
+
+    def __init__(self, root: Path | str):
+        self.root = Path(root)
+        self.path = client.socket_path(self.root)
+        self.service = Service(self.root)
+        self._server: socketserver.ThreadingUnixStreamServer | None = None
+
+    def __enter__(self) -> Self:
+        from changelogbump.Transaction import Transaction
+
+        if not hasattr(socket, "AF_UNIX"):
+            raise DaemonError("Unix sockets are not available on this platform")
+        Transaction.state_dir(self.root)
+        if self.path.exists():
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.connect(str(self.path))
+            except ConnectionRefusedError:
+                self.path.unlink()
+            else:
+                raise DaemonError(f"a daemon is already listening on {self.path}")
+        server = socketserver.ThreadingUnixStreamServer(
+            str(self.path), _Handler, bind_and_activate=False
+        )
+        try:
+            server.server_bind()
+            os.chmod(self.path, 0o600)
+            server.server_activate()
+        except BaseException:
+            server.server_close()
+            self.path.unlink(missing_ok=True)
+            raise
+        server.daemon_threads = True
+        server.service = self.service
+        self._server = server
+        return self
+
+    def __exit__(self, *exc) -> None:
+        assert self._server is not None
+        self._server.server_close()
+        self._server = None
+        self.path.unlink(missing_ok=True)
+
+    def serve_forever(self) -> None:
+        """Answer requests until shutdown() is called from another thread."""
+        assert self._server is not None
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serve_forever()."""
+        assert self._server is not None
+        self._server.shutdown()
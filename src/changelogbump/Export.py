@@ -0,0 +1,177 @@
+"""Exports a changelog as JSON or HTML, reusing what earlier exports rendered.
+
+This module provides the Export class. The changelog, including archived
+shards, is read as a stream of release sections and each one is parsed into
+a record holding its version, date, summary and ``### Section`` entries. The
+rendered form of every section is cached under ``.changelogbump/export``,
+keyed by a hash of the section's text, so exporting again after a bump only
+parses and renders the new section; the rest is copied from the cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import html
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+from changelogbump.Aggregate import Aggregate, Section
+from changelogbump.AtomicFile import AtomicFile
+from changelogbump.Profiler import Profiler
+from changelogbump.Transaction import FileLock, Transaction
+
+
+class Export:
+    """Structured export of one changelog with a content-addressed render cache.
+
+    Attributes:
+        changelog (Path): The changelog to export.
+        fmt (str): "json" or "html".
+    """
+
+    formats = ("json", "html")
+    # Bump when rendering changes, so stale cached renderings are not reused
+    cache_version: int = 1
+    html_head: bytes = (
+        b'<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8">'
+        b"<title>Changelog</title></head>\n<body>\n<h1>Changelog</h1>\n"
+    )
+
+    def __init__(self, changelog: Path, fmt: str = "json"):
+        if fmt not in self.formats:
+            raise ValueError(f"format must be one of {list(self.formats)}, got {fmt!r}")
+        self.changelog = Path(changelog)
+        self.fmt = fmt
+
+    @property
+    def cache_dir(self) -> Path:
+        """Return the directory holding rendered sections."""
+        return Transaction.state_dir(self.changelog.absolute().parent) / "export"
+
+    @staticmethod
+    def parse(section: Section) -> dict:
+        """Parse a release section into a record.
+
+        Lines before the first ``###`` heading form the summary; ``- `` lines
+        are entries of the current section, and indented lines continue the
+        entry above them.
+
+        Returns:
+            dict: ``version``, ``date`` (or None), ``summary`` (or None) and
+            ``sections`` mapping lower-cased section names to their entries.
+        """
+        summary: list[str] = []
+        sections: dict[str, list[str]] = {}
+        entries: list[str] | None = None
+        for line in section.body.decode("utf-8", "replace").splitlines():
+            stripped = line.strip()
+            if line.startswith("### "):
+                entries = sections.setdefault(line[4:].strip().lower(), [])
+            elif entries is None:
+                if stripped:
+                    summary.append(stripped)
+            elif line.startswith("- "):
+                entries.append(line[2:].strip())
+            elif stripped and entries and line[:1].isspace():
+                entries[-1] += " " + stripped
+        return {
+            "version": section.version,
+            "date": section.date or None,
+            "summary": " ".join(summary) or None,
+            "sections": sections,
+        }
+
+    def records(self) -> Iterator[dict]:
+        """Yield a record for each release, newest first, archived ones last."""
+        for section in Aggregate.sections("", self.changelog):
+            yield self.parse(section)
+
+    def render(self, record: dict) -> bytes:
+        """Render one record in this export's format."""
+        if self.fmt == "json":
+            return json.dumps(record).encode()
+        version = html.escape(record["version"])
+        out = [f'<section id="v{version}">\n<h2>{version}']
+        if record["date"]:
+            date = html.escape(record["date"])
+            out.append(f' <time datetime="{date}">{date}</time>')
+        out.append("</h2>\n")
+        if record["summary"]:
+            out.append(f"<p>{html.escape(record['summary'])}</p>\n")
+        for name, entries in record["sections"].items():
+            if entries:
+                out.append(f"<h3>{html.escape(name.title())}</h3>\n<ul>\n")
+                out.extend(f"<li>{html.escape(e)}</li>\n" for e in entries)
+                out.append("</ul>\n")
+        out.append("</section>\n")
+        return "".join(out).encode()
+
+    def write(self, out: BinaryIO) -> tuple[int, int]:
+        """Write the export to a binary stream.
+
+        Sections whose text was rendered by an earlier export are copied from
+        the cache; the others are parsed, rendered and added to it. Cached
+        renderings no longer used by the changelog are dropped once they
+        outnumber the live ones.
+
+        Args:
+            out (BinaryIO): Destination stream.
+
+        Returns:
+            tuple[int, int]: Number of releases written, and how many of
+            them had to be rendered.
+        """
+        directory = self.cache_dir
+        directory.mkdir(exist_ok=True)
+        data_path = directory / f"{self.fmt}-{self.cache_version}.cache"
+        index_path = data_path.with_suffix(".idx")
+        with FileLock(directory / "lock"), Profiler.span("export.write") as profile:
+            try:
+                index = (
+                    json.loads(index_path.read_bytes()) if data_path.exists() else {}
+                )
+            except (FileNotFoundError, ValueError):
+                index = {}
+            if not index:
+                data_path.unlink(missing_ok=True)
+            used: dict[str, list[int]] = {}
+            count = rendered = 0
+            out.write(b"[" if self.fmt == "json" else self.html_head)
+            with data_path.open("a+b") as cache:
+                for section in Aggregate.sections("", self.changelog):
+                    digest = hashlib.sha1(section.heading + section.body).hexdigest()
+                    span = index.get(digest)
+                    if span is not None:
+                        cache.seek(span[0])
+                        fragment = cache.read(span[1])
+                    else:
+                        fragment = self.render(self.parse(section))
+                        cache.seek(0, 2)
+                        span = [cache.tell(), len(fragment)]
+                        cache.write(fragment)
+                        rendered += 1
+                    used[digest] = span
+                    if self.fmt == "json":
+                        out.write(b",\n" if count else b"\n")
+                    out.write(fragment)
+                    profile.bytes_written += len(fragment)
+                    count += 1
+            out.write(b"\n]\n" if self.fmt == "json" else b"</body>\n</html>\n")
+            if len(index) + rendered > 2 * len(used):
+                used = self._compact(data_path, used)
+            if rendered or len(used) != len(index):
+                with AtomicFile(index_path) as fh:
+                    fh.write(json.dumps(used, separators=(",", ":")).encode())
+        return count, rendered
+
+    @staticmethod
+    def _compact(data_path: Path, used: dict[str, list[int]]) -> dict[str, list[int]]:
+        compacted = {}
+        with data_path.open("rb") as src, AtomicFile(data_path) as dst:
+            for digest, (offset, length) in used.items():
+                src.seek(offset)
+                compacted[digest] = [dst.tell(), length]
+                dst.write(src.read(length))
+        return compacted
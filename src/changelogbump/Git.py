@@ -0,0 +1,306 @@
+"""Reads release history and commit messages from git.
+
+This module provides the Git class, which finds the last release tag and
+turns Conventional Commit messages since that tag into changelog sections,
+streaming ``git log`` output so memory stays bounded on very long histories,
+and lists every version tag with one ``git for-each-ref`` call whose result
+is cached in the git directory until the refs change.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import ClassVar
+
+from changelogbump.AtomicFile import AtomicFile
+
+
+class Git:
+    """Thin wrapper around the git command line."""
+
+    conventional_re = re.compile(
+        r"^(?P<type>[A-Za-z]+)(?:\((?P<scope>[^)]*)\))?(?P<bang>!)?:\s+(?P<desc>.+)$"
+    )
+    breaking_re = re.compile(r"^BREAKING[ -]CHANGE:")
+    type_sections: ClassVar[dict[str, str]] = {
+        "feat": "added",
+        "fix": "changed",
+        "perf": "changed",
+        "refactor": "changed",
+        "revert": "removed",
+        "remove": "removed",
+    }
+    # Marks the start of each commit in the streamed log; an ASCII control
+    # character that does not occur in ordinary commit messages.
+    record_separator = "\x1e"
+    tag_cache_name = "changelogbump-tags.json"
+    # Refs changed this recently are not cached, as a same-second update to a
+    # directory could otherwise leave its mtime unchanged.
+    racy_window_ns: int = 2_000_000_000
+
+    @staticmethod
+    def run(*args: str, cwd: Path | str = ".") -> str:
+        """Run a git command and return its stripped stdout.
+
+        Raises:
+            subprocess.CalledProcessError: If git exits non-zero.
+        """
+        return subprocess.run(
+            ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+        ).stdout.strip()
+
+    @classmethod
+    def last_release_tag(cls, cwd: Path | str = ".") -> str | None:
+        """Return the nearest ``1.2.3`` or ``v1.2.3`` tag reachable from HEAD.
+
+        Returns:
+            str | None: The tag name, or None if no version tag exists.
+        """
+        try:
+            return cls.run(
+                "describe",
+                "--tags",
+                "--abbrev=0",
+                "--match=[0-9]*.[0-9]*.[0-9]*",
+                "--match=v[0-9]*.[0-9]*.[0-9]*",
+                "HEAD",
+                cwd=cwd,
+            )
+        except subprocess.CalledProcessError:
+            return None
+
+    @classmethod
+    def git_dir(cls, cwd: Path | str = ".") -> Path:
+        """Return the repository's common git directory (shared by worktrees).
+
+        Raises:
+            subprocess.CalledProcessError: If ``cwd`` is not in a repository.
+        """
+        for directory in (Path(cwd).absolute(), *Path(cwd).absolute().parents):
+            candidate = directory / ".git"
+            if candidate.is_dir():
+                return candidate
+            if candidate.exists():
+                break  # a worktree or submodule; let git resolve it
+        return Path(cwd) / cls.run("rev-parse", "--git-common-dir", cwd=cwd)
+
+    @staticmethod
+    def refs_stamp(git_dir: Path) -> list:
+        """Return what changes whenever a tag is created, moved or deleted.
+
+        That is the size and mtime of ``packed-refs`` and the mtime of every
+        directory below ``refs/tags``.
+        """
+        stamp: list = []
+        try:
+            st = os.stat(git_dir / "packed-refs")
+            stamp.append([st.st_size, st.st_mtime_ns])
+        except FileNotFoundError:
+            stamp.append(None)
+        for dirpath, _, _ in os.walk(git_dir / "refs" / "tags"):
+            stamp.append(
+                [os.path.relpath(dirpath, git_dir), os.stat(dirpath).st_mtime_ns]
+            )
+        return stamp
+
+    @classmethod
+    def version_tags(cls, cwd: Path | str = ".") -> dict[str, str]:
+        """Return every tag naming a semantic version, keyed by that version.
+
+        Tags are read with a single ``git for-each-ref`` and parsed through
+        Version; ``v1.2.3`` and ``1.2.3`` both name 1.2.3, and other tags are
+        ignored. The result is cached in the git directory and reused while
+        ``refs_stamp`` is unchanged.
+
+        Returns:
+            dict[str, str]: Tag name by version string.
+
+        Raises:
+            subprocess.CalledProcessError: If ``cwd`` is not in a repository.
+        """
+        from changelogbump.Version import Version
+
+        git_dir = cls.git_dir(cwd)
+        cache = git_dir / cls.tag_cache_name
+        stamp = cls.refs_stamp(git_dir)
+        try:
+            data = json.loads(cache.read_bytes())
+            if data["stamp"] == stamp:
+                return data["tags"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        output = cls.run(
+            "for-each-ref", "--format=%(refname:strip=2)", "refs/tags", cwd=cwd
+        )
+        tags: dict[str, str] = {}
+        for name in output.splitlines():
+            try:
+                version = Version.from_string(name[1:] if name[:1] == "v" else name)
+            except ValueError:
+                continue
+            tags.setdefault(version.current, name)
+        newest = max((entry[-1] for entry in stamp if entry), default=0)
+        if time.time_ns() - newest > cls.racy_window_ns:
+            with AtomicFile(cache) as fh:
+                fh.write(json.dumps({"stamp": stamp, "tags": tags}).encode())
+        return tags
+
+    @classmethod
+    def changed_paths(cls, base: str, cwd: Path | str = ".") -> list[tuple[str, str]]:
+        """List files changed between ``base`` and HEAD in one ``git diff``.
+
+        Returns:
+            list[tuple[str, str]]: Status letter ("A", "M", "D", "T") and path
+            relative to the top of the repository, for each changed file.
+        """
+        fields = cls.run(
+            "diff", "--name-status", "--no-renames", "-z", base, "HEAD", cwd=cwd
+        )
+        parts = fields.strip("\0").split("\0") if fields else []
+        return [(parts[i][:1], parts[i + 1]) for i in range(0, len(parts) - 1, 2)]
+
+    @classmethod
+    def tree_blobs(
+        cls, paths: list[str], cwd: Path | str = "."
+    ) -> Iterator[tuple[str, str]]:
+        """Yield (path, blob id) of every file under ``paths`` at HEAD, in one call.
+
+        Paths are relative to the top of the repository; an empty string
+        stands for the whole tree.
+        """
+        top = cls.run("rev-parse", "--show-toplevel", cwd=cwd)
+        output = cls.run(
+            "ls-tree",
+            "-r",
+            "-z",
+            "--full-tree",
+            "HEAD",
+            "--",
+            *(p or "." for p in paths),
+            cwd=top,
+        )
+        for entry in output.split("\0"):
+            if entry:
+                meta, path = entry.split("\t", 1)
+                yield path, meta.rsplit(" ", 1)[1]
+
+    @classmethod
+    def iter_commits(
+        cls, rev_range: str = "HEAD", cwd: Path | str = ".", paths: tuple[str, ...] = ()
+    ) -> Iterator[tuple[str, str]]:
+        """Stream (subject, body) pairs from ``git log`` one commit at a time.
+
+        Output is consumed line by line as git produces it; only the commit
+        currently being read is held in memory.
+
+        Args:
+            rev_range (str, optional): Revision range to log. Defaults to "HEAD".
+            cwd (Path | str, optional): Repository directory. Defaults to ".".
+            paths (tuple[str, ...], optional): Restrict to commits touching
+                these paths. Defaults to the whole tree.
+
+        Yields:
+            tuple[str, str]: Commit subject and body.
+        """
+        args = [
+            "git",
+            # Messages that declare another encoding are re-encoded by git
+            "-c",
+            "i18n.logOutputEncoding=UTF-8",
+            "log",
+            f"--format={cls.record_separator}%s%n%b",
+            rev_range,
+        ]
+        if paths:
+            args += ["--", *paths]
+        # Bytes that are still not UTF-8 are replaced rather than aborting the log
+        with subprocess.Popen(
+            args,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1 << 16,
+        ) as proc:
+            assert proc.stdout is not None
+            subject: str | None = None
+            body: list[str] = []
+            for line in proc.stdout:
+                if line.startswith(cls.record_separator):
+                    if subject is not None:
+                        yield subject, "".join(body)
+                    subject, body = line[1:].rstrip("\n"), []
+                else:
+                    body.append(line)
+            if subject is not None:
+                yield subject, "".join(body)
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, args)
+
+    @classmethod
+    def conventional_changes(
+        cls, commits: Iterator[tuple[str, str]]
+    ) -> tuple[dict[str, list[str]], str]:
+        """Sort Conventional Commit messages into changelog sections.
+
+        Commits whose type has no changelog section (docs, chore, ci, ...)
+        and non-conventional messages are skipped.
+
+        Args:
+            commits (Iterator[tuple[str, str]]): (subject, body) pairs.
+
+        Returns:
+            tuple[dict[str, list[str]], str]: Entries by section, and the bump
+            part implied by the commits: "major" for breaking changes, "minor"
+            when anything was added, otherwise "patch".
+        """
+        sections: dict[str, list[str]] = {"added": [], "changed": [], "removed": []}
+        part = "patch"
+        for subject, body in commits:
+            match = cls.conventional_re.match(subject)
+            if not match:
+                continue
+            breaking = bool(match["bang"]) or any(
+                cls.breaking_re.match(line) for line in body.splitlines()
+            )
+            section = cls.type_sections.get(match["type"].lower())
+            if section is not None:
+                desc = match["desc"].strip()
+                sections[section].append(
+                    f"{match['scope']}: {desc}" if match["scope"] else desc
+                )
+            if breaking:
+                part = "major"
+            elif section == "added" and part == "patch":
+                part = "minor"
+        return sections, part
+
+    @classmethod
+    def changes_since_release(
+        cls, cwd: Path | str = "."
+    ) -> tuple[str | None, dict[str, list[str]], str]:
+        """Collect changelog entries from commits since the last release tag.
+
+        Only commits touching ``cwd`` are considered, so this works for a
+        single package inside a larger repository.
+
+        Returns:
+            tuple[str | None, dict[str, list[str]], str]: The tag used as the
+            starting point (None if the whole history was read), the entries
+            by section, and the inferred bump part.
+        """
+        tag = cls.last_release_tag(cwd)
+        rev_range = f"{tag}..HEAD" if tag else "HEAD"
+        # A pathspec makes git diff every commit; skip it at the top level
+        paths = (".",) if cls.run("rev-parse", "--show-prefix", cwd=cwd) else ()
+        sections, part = cls.conventional_changes(
+            cls.iter_commits(rev_range, cwd, paths)
+        )
+        return tag, sections, part
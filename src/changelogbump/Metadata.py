@@ -1,14 +1,174 @@
+"""Looks up the latest published changelogbump version.
+
+This module provides the _PyPiMetadata class, which queries one or more
+package indexes concurrently with a strict timeout, takes the first valid
+answer, and keeps a small on-disk cache revalidated with ETag/If-None-Match.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
 import json
-from urllib.request import urlopen
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from changelogbump.AtomicFile import AtomicFile
+from changelogbump.Profiler import Profiler
 
 
 class _PyPiMetadata:
     url = "https://pypi.org/pypi/changelogbump/json"
+    # Seconds to wait for any single index before giving up on it
+    timeout: float = 3.0
+    # Seconds a cached answer is trusted before it is revalidated
+    ttl: float = 3600.0
+
+    @classmethod
+    def urls(cls) -> list[str]:
+        """Return the index URLs to query, in order of preference.
+
+        ``CHANGELOGBUMP_INDEX_URLS`` may hold a comma-separated list of JSON
+        API URLs, e.g. a private mirror followed by PyPI.
+        """
+        configured = os.environ.get("CHANGELOGBUMP_INDEX_URLS", "")
+        return [u.strip() for u in configured.split(",") if u.strip()] or [cls.url]
+
+    @staticmethod
+    def cache_dir() -> Path:
+        """Return the directory holding cached index responses."""
+        if "CHANGELOGBUMP_CACHE_DIR" in os.environ:
+            return Path(os.environ["CHANGELOGBUMP_CACHE_DIR"])
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        return Path(base) / "changelogbump"
+
+    @classmethod
+    def _cache_file(cls, url: str) -> Path:
+        return cls.cache_dir() / f"index-{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+    @classmethod
+    def fetch(cls, url: str) -> dict:
+        """Return the cached or freshly fetched metadata for one index.
+
+        A cache entry younger than ``ttl`` is returned without any request.
+        An older one is revalidated with If-None-Match, so an unchanged
+        document costs a 304 with no body. If revalidation fails, the older
+        entry is returned and the next call tries again. Only
+        ``info.version`` is kept from a full response.
+
+        Args:
+            url (str): JSON API URL of the package.
+
+        Returns:
+            dict: ``{"info": {"version": ...}}``.
+
+        Raises:
+            OSError: If the index cannot be reached within ``timeout`` and
+                nothing is cached.
+            ValueError: If the response is not valid package metadata and
+                nothing is cached.
+        """
+        with Profiler.span("metadata.fetch") as span:
+            cache_file = cls._cache_file(url)
+            cached, size = cls._read_cache(url)
+            span.bytes_read += size
+            if cached and time.time() - cached["fetched"] < cls.ttl:
+                return {"info": {"version": cached["version"]}}
+
+            request = Request(url, headers={"Accept": "application/json"})
+            if cached and cached.get("etag"):
+                request.add_header("If-None-Match", cached["etag"])
+            try:
+                with urlopen(request, timeout=cls.timeout) as response:
+                    body = response.read()
+                    span.bytes_read += len(body)
+                    version = json.loads(body)["info"]["version"]
+                    etag = response.headers.get("ETag")
+            except HTTPError as exc:
+                if exc.code != 304 or not cached:
+                    return cls._stale(cached, exc)
+                version, etag = cached["version"], cached.get("etag")
+            except (OSError, ValueError) as exc:
+                return cls._stale(cached, exc)
+            except (KeyError, TypeError) as exc:
+                error = ValueError(f"Unexpected metadata from {url}")
+                error.__cause__ = exc
+                return cls._stale(cached, error)
+
+            record = {"version": version, "etag": etag, "fetched": time.time()}
+            encoded = json.dumps(record).encode()
+            # An unwritable cache only costs the next call a request
+            with contextlib.suppress(OSError):
+                cls.cache_dir().mkdir(parents=True, exist_ok=True)
+                with AtomicFile(cache_file) as fh:
+                    fh.write(encoded)
+                span.bytes_written = len(encoded)
+            return {"info": {"version": version}}
+
+    @classmethod
+    def _read_cache(cls, url: str) -> tuple[dict | None, int]:
+        """Return the cache entry for ``url`` and its size in bytes.
+
+        The entry is None if it is missing or malformed, the same as a miss.
+        """
+        try:
+            raw = cls._cache_file(url).read_bytes()
+        except OSError:
+            return None, 0
+        try:
+            cached = json.loads(raw)
+            cached["fetched"] = float(cached["fetched"])
+            cached["version"] = str(cached["version"])
+        except (ValueError, KeyError, TypeError):
+            return None, len(raw)
+        return cached, len(raw)
+
+    @staticmethod
+    def _stale(cached: dict | None, error: BaseException) -> dict:
+        """Return a cached answer that could not be revalidated, or raise ``error``."""
+        if cached is None:
+            raise error
+        return {"info": {"version": cached["version"]}}
+
+    @classmethod
+    async def _first_answer(cls, urls: list[str]) -> dict:
+        loop = asyncio.get_running_loop()
+        # Own executor so a hung index is not waited on once another answered
+        executor = ThreadPoolExecutor(max_workers=len(urls))
+        pending = {loop.run_in_executor(executor, cls.fetch, u) for u in urls}
+        try:
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=cls.timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            # Indexes still hanging count as failed revalidations, as in fetch()
+            for url in urls:
+                cached, _ = cls._read_cache(url)
+                if cached:
+                    return {"info": {"version": cached["version"]}}
+            raise error or TimeoutError(f"No index answered within {cls.timeout}s")
+        finally:
+            for task in pending:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
 
     @classmethod
     def get(cls) -> dict:
-        with urlopen(cls.url) as response:
-            return json.loads(response.read().decode())
+        """Query every configured index at once and return the first valid answer."""
+        with Profiler.span("metadata.get"):
+            return asyncio.run(cls._first_answer(cls.urls()))
 
     @classmethod
     def version(cls) -> str:
@@ -0,0 +1,297 @@
+"""Discovers packages in a monorepo and bumps them in one process.
+
+This module provides the Monorepo class, which finds every directory holding
+both a pyproject.toml and a CHANGELOG.md (by walking the tree or reading a
+manifest), works out which of them changed since a release from a single
+``git diff``, and applies the same version bump to each on a thread pool.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+from changelogbump import api
+from changelogbump.api import BumpResult
+from changelogbump.Changelog import Changelog
+from changelogbump.PyProject import PyProject
+
+
+class BatchError(Exception):
+    """Raised when a package fails during a batch bump.
+
+    Attributes:
+        root (Path): The package that failed.
+        completed (list[BumpResult]): Packages bumped before the batch stopped.
+    """
+
+    def __init__(self, root: Path, error: BaseException, completed: list[BumpResult]):
+        super().__init__(f"{root}: {error}")
+        self.root = root
+        self.completed = completed
+
+
+@dataclass
+class PackageChange:
+    """A package with changes since the last release.
+
+    Attributes:
+        root (Path): The package directory.
+        part (str): Bump part inferred from the kind of changes.
+        digest (str): Hash of the package's files at HEAD, release files excluded.
+    """
+
+    root: Path
+    part: str
+    digest: str
+
+
+class Monorepo:
+    """Finds and bumps many pyproject.toml/CHANGELOG.md pairs at once."""
+
+    skip_dirs: frozenset[str] = frozenset(
+        {".git", ".hg", ".venv", "venv", "node_modules", "__pycache__", ".tox", ".nox"}
+    )
+    # Files a bump itself writes; changing them alone does not need a release
+    release_files: frozenset[str] = frozenset(
+        {"CHANGELOG.md", "pyproject.toml", ".unreleased.jsonl", "changelog"}
+    )
+    # Changes below these directories only ever call for a patch release
+    patch_dirs: frozenset[str] = frozenset({"tests", "test", "docs", "doc"})
+    parts: tuple[str, ...] = ("patch", "minor", "major")
+    released_name: str = "released.json"
+
+    @classmethod
+    def discover(cls, root: Path) -> list[Path]:
+        """Walk ``root`` for directories containing both managed files.
+
+        Args:
+            root (Path): Directory to search recursively.
+
+        Returns:
+            list[Path]: Package directories, sorted.
+        """
+        found = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in cls.skip_dirs]
+            if PyProject.path.name in filenames and Changelog.path.name in filenames:
+                found.append(Path(dirpath))
+        return sorted(found)
+
+    @staticmethod
+    def read_manifest(manifest: Path) -> list[Path]:
+        """Read package directories, one per line, from a manifest file.
+
+        Blank lines and lines starting with ``#`` are ignored. Relative paths
+        are resolved against the manifest's directory.
+
+        Args:
+            manifest (Path): The manifest file.
+
+        Returns:
+            list[Path]: Package directories in manifest order.
+        """
+        packages = []
+        with manifest.open() as fh:
+            for line in fh:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    packages.append(manifest.parent / line)
+        return packages
+
+    @staticmethod
+    def bump_all(
+        packages: list[Path],
+        part: str,
+        summary: str | None,
+        sections: dict[str, list[str]],
+        jobs: int | None = None,
+    ) -> Iterator[BumpResult]:
+        """Bump every package on a thread pool, stopping at the first failure.
+
+        Results are yielded as packages finish. When one fails, packages not
+        yet started are cancelled, those already running are allowed to
+        finish (and are yielded), and then a BatchError is raised.
+
+        Args:
+            packages (list[Path]): Package directories to bump.
+            part (str): One of "major", "minor" or "patch".
+            summary (str | None): Summary placed under each version heading.
+            sections (dict[str, list[str]]): Changelog entries by section.
+            jobs (int | None, optional): Worker threads. Defaults to the
+                executor's default.
+
+        Yields:
+            BumpResult: The outcome for each successfully bumped package.
+
+        Raises:
+            BatchError: If any package fails.
+        """
+        completed: list[BumpResult] = []
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            pending = {
+                pool.submit(api.bump, root, part, summary, sections): root
+                for root in packages
+            }
+            for future in as_completed(pending):
+                root = pending.pop(future)
+                error = future.exception()
+                if error is not None:
+                    # Let running bumps finish so no package is left half-written
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    for other in pending:
+                        if not other.cancelled() and other.exception() is None:
+                            completed.append(other.result())
+                            yield completed[-1]
+                    raise BatchError(root, error, completed)
+                completed.append(future.result())
+                yield completed[-1]
+
+    @classmethod
+    def infer_part(
+        cls, changes: list[tuple[str, str]], deletions: str = "minor"
+    ) -> str:
+        """Infer a bump part from (status, path within the package) pairs.
+
+        Adding a file is "minor", deleting one is ``deletions``, and anything
+        else is "patch"; files under ``patch_dirs`` only count as "patch".
+        """
+        part = "patch"
+        for status, path in changes:
+            if path.split("/", 1)[0] in cls.patch_dirs:
+                continue
+            if status == "D":
+                found = deletions
+            elif status == "A":
+                found = "minor"
+            else:
+                continue
+            part = max(part, found, key=cls.parts.index)
+        return part
+
+    @classmethod
+    def deletion_part(cls, package: Path) -> str:
+        """Return the part a deleted file calls for in ``package``.
+
+        A deletion is "minor" unless the package's pyproject.toml opts into
+        treating it as breaking with ``deletions = "major"`` under
+        ``[tool.changelogbump]``.
+
+        Raises:
+            ValueError: If the setting is not a bump part.
+        """
+        config = PyProject.at(Path(package) / "pyproject.toml").tool_config()
+        part = config.get("deletions", "minor")
+        if part not in cls.parts:
+            raise ValueError(
+                f"{package}: [tool.changelogbump] deletions must be one of "
+                f"{', '.join(reversed(cls.parts))}, not {part!r}"
+            )
+        return part
+
+    @classmethod
+    def changed_packages(
+        cls, packages: list[Path], base: str, root: Path | str = "."
+    ) -> list[PackageChange]:
+        """Select the packages whose files changed since ``base``.
+
+        One ``git diff`` between ``base`` and HEAD is mapped onto the packages
+        (a file belongs to the deepest package containing it), ignoring the
+        files a bump writes. The files of each package that changed are then
+        hashed from a single ``git ls-tree``; a package whose hash matches the
+        one recorded by remember_released() was already bumped for these
+        changes and is skipped.
+
+        Args:
+            packages (list[Path]): Package directories.
+            base (str): Release tag or commit to compare against.
+            root (Path | str, optional): Directory whose ``.changelogbump``
+                holds the hashes of released packages.
+
+        Returns:
+            list[PackageChange]: Packages needing a release, in input order.
+
+        Raises:
+            subprocess.CalledProcessError: If git fails, e.g. ``base`` is unknown.
+            ValueError: If a package's ``deletions`` setting is invalid.
+        """
+        from changelogbump.Git import Git
+
+        top = Path(Git.run("rev-parse", "--show-toplevel", cwd=root)).resolve()
+        names = {cls._tree_path(p, top): p for p in packages}
+
+        def owner(path: str) -> tuple[str, str] | None:
+            parts = path.split("/")
+            for depth in range(len(parts) - 1, -1, -1):
+                name = "/".join(parts[:depth])
+                if name in names:
+                    return name, "/".join(parts[depth:])
+            return None
+
+        touched: dict[str, list[tuple[str, str]]] = {}
+        for status, path in Git.changed_paths(base, top):
+            found = owner(path)
+            if found and found[1].split("/", 1)[0] not in cls.release_files:
+                touched.setdefault(found[0], []).append((status, found[1]))
+        if not touched:
+            return []
+
+        hashes = {name: hashlib.sha1() for name in touched}
+        for path, blob in sorted(Git.tree_blobs(list(touched), top)):
+            found = owner(path)
+            if (
+                found
+                and found[0] in hashes
+                and found[1].split("/", 1)[0] not in cls.release_files
+            ):
+                hashes[found[0]].update(f"{found[1]}\0{blob}\n".encode())
+
+        released = cls._released(root)
+        changes = []
+        for name, package in names.items():
+            if name in touched:
+                digest = hashes[name].hexdigest()
+                if released.get(name) != digest:
+                    part = cls.infer_part(touched[name], cls.deletion_part(package))
+                    changes.append(PackageChange(package, part, digest))
+        return changes
+
+    @staticmethod
+    def _tree_path(path: Path, top: Path) -> str:
+        name = Path(os.path.relpath(Path(path).resolve(), top)).as_posix()
+        return "" if name == "." else name
+
+    @classmethod
+    def _released(cls, root: Path | str) -> dict[str, str]:
+        from changelogbump.Transaction import Transaction
+
+        try:
+            path = Transaction.state_dir(Path(root)) / cls.released_name
+            return json.loads(path.read_bytes())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @classmethod
+    def remember_released(
+        cls, changes: list[PackageChange], root: Path | str = "."
+    ) -> None:
+        """Record the hashes of packages just bumped, so unchanged ones are skipped later."""
+        from changelogbump.AtomicFile import AtomicFile
+        from changelogbump.Git import Git
+        from changelogbump.Transaction import FileLock, Transaction
+
+        if not changes:
+            return
+        top = Path(Git.run("rev-parse", "--show-toplevel", cwd=root)).resolve()
+        state = Transaction.state_dir(Path(root))
+        with FileLock(state / "released.lock"):
+            released = cls._released(root)
+            for change in changes:
+                released[cls._tree_path(change.root, top)] = change.digest
+            with AtomicFile(state / cls.released_name) as fh:
+                fh.write(json.dumps(released, indent=0, sort_keys=True).encode())
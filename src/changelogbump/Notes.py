@@ -0,0 +1,81 @@
+"""Records changelog entries for the next release as they are merged.
+
+This module provides the Notes class, an append-only journal of pending
+entries kept beside the changelog as JSON lines. Recording an entry appends
+one line, however long the changelog is; the next bump reads the journal once
+and writes every pending entry into the new version section.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from changelogbump.Changelog import Changelog
+from changelogbump.Transaction import FileLock, Transaction
+
+
+class Notes:
+    """Append-only journal of entries waiting for the next release.
+
+    Each line is ``{"section": "added", "entry": "..."}``, the same JSON form
+    ``add --entries`` accepts. Appends take the project lock, so an entry is
+    never lost to a bump that is consuming the journal at the same time.
+    """
+
+    file_name: str = ".unreleased.jsonl"
+
+    @classmethod
+    def path_for(cls, changelog: Path) -> Path:
+        """Return the journal kept beside ``changelog``."""
+        return Path(changelog).with_name(cls.file_name)
+
+    @classmethod
+    def append(cls, changelog: Path, section: str, entries: list[str]) -> None:
+        """Append entries for one section to the journal.
+
+        Args:
+            changelog (Path): The changelog the entries are meant for.
+            section (str): One of Changelog.section_names.
+            entries (list[str]): Entry texts.
+
+        Raises:
+            ValueError: If the section is unknown or an entry is empty.
+        """
+        if section not in Changelog.section_names:
+            raise ValueError(f"unknown section {section!r}")
+        if not all(e.strip() for e in entries):
+            raise ValueError("entries must be non-empty strings")
+        data = "".join(
+            json.dumps({"section": section, "entry": e.strip()}) + "\n" for e in entries
+        ).encode()
+        path = cls.path_for(changelog)
+        with FileLock(Transaction.lock_path(path.absolute().parent)):
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+            try:
+                os.write(fd, data)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    @classmethod
+    def pending(cls, changelog: Path) -> bool:
+        """Return whether any entry is waiting, without reading the journal."""
+        try:
+            return os.stat(cls.path_for(changelog)).st_size > 0
+        except FileNotFoundError:
+            return False
+
+    @classmethod
+    def read(cls, changelog: Path) -> dict[str, list[str]]:
+        """Return the pending entries keyed by section, in the order recorded.
+
+        Raises:
+            ValueError: If the journal holds a malformed line.
+        """
+        try:
+            with cls.path_for(changelog).open() as fh:
+                return Changelog.read_sections(fh)
+        except FileNotFoundError:
+            return {key: [] for key in Changelog.section_names}
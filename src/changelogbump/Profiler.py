@@ -0,0 +1,213 @@
+"""Records timed spans for the phases of a changelogbump run.
+
+This module provides the Profiler class. When enabled (``--profile`` or the
+``CHANGELOGBUMP_PROFILE`` environment variable), code wrapped in
+``Profiler.span(name)`` records its wall time, the bytes it read and wrote,
+and its peak traced memory, and the spans are emitted as JSON lines or a
+table when the command finishes. When disabled, a span is a shared no-op.
+
+tracemalloc keeps a single process-wide peak, so the peak of a span that
+overlapped a span on another thread (a batch bump, or concurrent index
+queries) cannot be told apart and is reported as unknown.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import ClassVar, TextIO
+
+
+class Span:
+    """One timed phase.
+
+    Attributes:
+        name (str): Phase name, e.g. "changelog.update".
+        depth (int): Nesting level within the thread that recorded it.
+        seconds (float): Wall time spent in the phase.
+        bytes_read (int): Bytes read from disk or network, as reported by the phase.
+        bytes_written (int): Bytes written, as reported by the phase.
+        peak_memory (int | None): Peak traced allocation above the level at
+            entry, in bytes; None if a span on another thread overlapped it.
+    """
+
+    __slots__ = (
+        "_mem_peak",
+        "_mem_start",
+        "_shared",
+        "_started",
+        "_thread",
+        "bytes_read",
+        "bytes_written",
+        "depth",
+        "name",
+        "peak_memory",
+        "seconds",
+    )
+
+    def __init__(self, name: str, depth: int = 0):
+        self.name = name
+        self.depth = depth
+        self.seconds = 0.0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.peak_memory: int | None = 0
+        self._thread = threading.get_ident()
+        self._shared = False
+
+    def as_dict(self) -> dict:
+        return {
+            "span": self.name,
+            "depth": self.depth,
+            "seconds": round(self.seconds, 6),
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "peak_memory": self.peak_memory,
+        }
+
+
+class _NullSpan:
+    """Stand-in used while profiling is off; accepts and discards updates."""
+
+    def __enter__(self) -> Span:
+        return Span("")
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+class _ActiveSpan:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> Span:
+        import tracemalloc
+
+        stack = Profiler._stack()
+        span = Span(self.name, len(stack))
+        with Profiler._lock:
+            for other in Profiler._open:
+                if other._thread != span._thread:
+                    other._shared = span._shared = True
+            Profiler._open.append(span)
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1]._mem_peak = max(stack[-1]._mem_peak, peak)
+        tracemalloc.reset_peak()
+        span._mem_start = span._mem_peak = current
+        stack.append(span)
+        span._started = time.perf_counter()
+        return span
+
+    def __exit__(self, *exc) -> None:
+        import tracemalloc
+
+        span = Profiler._stack().pop()
+        span.seconds = time.perf_counter() - span._started
+        _, peak = tracemalloc.get_traced_memory()
+        span._mem_peak = max(span._mem_peak, peak)
+        stack = Profiler._stack()
+        if stack:
+            stack[-1]._mem_peak = max(stack[-1]._mem_peak, span._mem_peak)
+        tracemalloc.reset_peak()
+        with Profiler._lock:
+            Profiler._open.remove(span)
+            # Another thread's resets may have hidden part of this span's peak
+            if span._shared:
+                span.peak_memory = None
+            else:
+                span.peak_memory = span._mem_peak - span._mem_start
+            Profiler.spans.append(span)
+
+
+class Profiler:
+    """Process-wide collector of timed spans."""
+
+    enabled: bool = False
+    spans: ClassVar[list[Span]] = []
+    _open: ClassVar[list[Span]] = []
+    _local = threading.local()
+    _lock = threading.Lock()
+    _null = _NullSpan()
+
+    @classmethod
+    def _stack(cls) -> list[Span]:
+        if not hasattr(cls._local, "stack"):
+            cls._local.stack = []
+        return cls._local.stack
+
+    @classmethod
+    def start(cls) -> None:
+        """Begin recording spans and tracing allocations."""
+        import tracemalloc
+
+        cls.enabled = True
+        cls.spans = []
+        cls._open = []
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @classmethod
+    def stop(cls) -> None:
+        """Stop recording; collected spans are kept until the next start()."""
+        import tracemalloc
+
+        cls.enabled = False
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @classmethod
+    def span(cls, name: str) -> _ActiveSpan | _NullSpan:
+        """Return a context manager timing the enclosed block as ``name``.
+
+        Args:
+            name (str): Phase name to record.
+
+        Returns:
+            _ActiveSpan | _NullSpan: A context manager yielding the Span, whose
+            ``bytes_read``/``bytes_written`` the block may increment.
+        """
+        if not cls.enabled:
+            return cls._null
+        return _ActiveSpan(name)
+
+    @staticmethod
+    def env_format() -> str | None:
+        """Return the format requested by ``CHANGELOGBUMP_PROFILE``, if any."""
+        value = os.environ.get("CHANGELOGBUMP_PROFILE", "").strip().lower()
+        if value in ("", "0", "false", "off"):
+            return None
+        return "table" if value in ("1", "true", "on") else value
+
+    @classmethod
+    def report(cls, out: TextIO, fmt: str = "table") -> None:
+        """Write collected spans, in completion order, as JSON lines or a table.
+
+        A peak that is unknown because spans overlapped across threads is
+        written as null, or as "-" in the table.
+
+        Args:
+            out (TextIO): Destination stream.
+            fmt (str, optional): "json" or "table". Defaults to "table".
+        """
+        if fmt == "json":
+            import json
+
+            out.writelines(json.dumps(span.as_dict()) + "\n" for span in cls.spans)
+            return
+
+        rows = sorted(cls.spans, key=lambda s: s._started)
+        width = max([len(s.name) + 2 * s.depth for s in rows] + [4])
+        out.write(
+            f"{'span':<{width}}  {'ms':>10}  {'read KiB':>10}  "
+            f"{'written KiB':>11}  {'peak KiB':>10}\n"
+        )
+        for s in rows:
+            label = "  " * s.depth + s.name
+            peak = "-" if s.peak_memory is None else f"{s.peak_memory / 1024:.1f}"
+            out.write(
+                f"{label:<{width}}  {s.seconds * 1000:10.3f}  "
+                f"{s.bytes_read / 1024:10.1f}  {s.bytes_written / 1024:11.1f}  "
+                f"{peak:>10}\n"
+            )
@@ -4,9 +4,85 @@ This module provides the PyProject class for retrieving and updating the
 current version in pyproject.toml.
 """
 
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import time
+import tomllib
 from pathlib import Path
+from typing import ClassVar
+
+from changelogbump.AtomicFile import AtomicFile
+from changelogbump.Profiler import Profiler
+
+_HEADER = re.compile(rb"^\s*\[\[?([^\[\]]+)\]\]?\s*(?:#.*)?$")
+_PROJECT_VERSION = re.compile(
+    rb"^\s*(?:version|\"version\"|'version')\s*=\s*(?:\"([^\"\\\r\n]*)\"|'([^'\r\n]*)')"
+)
+_DOTTED_VERSION = re.compile(
+    rb"^\s*project\s*\.\s*version\s*=\s*(?:\"([^\"\\\r\n]*)\"|'([^'\r\n]*)')"
+)
+_STRING = re.compile(rb"\"(?:\\.|[^\"\\])*\"|'[^']*'")
+
+
+def _nesting_delta(line: bytes) -> int:
+    code = _STRING.sub(b"", line).split(b"#", 1)[0]
+    return code.count(b"[") + code.count(b"{") - code.count(b"]") - code.count(b"}")
+
+
+def _version_span(data: bytes) -> tuple[int, int] | None:
+    """Locate the byte span of the ``[project].version`` string value.
+
+    This is a line scanner rather than a TOML parser: it tracks table headers,
+    multi-line strings and bracket nesting just well enough to find a plain
+    ``version = "..."`` key in the project table without parsing the rest of
+    the document.
+
+    Args:
+        data (bytes): Raw pyproject.toml content.
 
-import toml
+    Returns:
+        tuple[int, int] | None: Start and end offsets of the version text
+        (excluding quotes), or None if no such key could be located.
+    """
+    table = b""
+    multiline: bytes | None = None
+    depth = 0
+    offset = 0
+    size = len(data)
+    while offset < size:
+        # Walk lines lazily: the version is usually near the top of the file
+        start = offset
+        newline = data.find(b"\n", start)
+        offset = size if newline < 0 else newline + 1
+        line = data[start:offset]
+        if multiline is not None:
+            if line.count(multiline) % 2:
+                multiline = None
+            continue
+        if depth == 0:
+            header = _HEADER.match(line)
+            if header:
+                table = re.sub(rb"[\s\"']", b"", header.group(1))
+                continue
+            if not table:
+                match = _DOTTED_VERSION.match(line)
+            elif table == b"project":
+                match = _PROJECT_VERSION.match(line)
+            else:
+                match = None
+            if match:
+                group = 1 if match.group(1) is not None else 2
+                return start + match.start(group), start + match.end(group)
+        for delim in (b'"""', b"'''"):
+            if line.count(delim) % 2:
+                multiline = delim
+                line = line.split(delim, 1)[0]
+                break
+        depth = max(depth + _nesting_delta(line), 0)
+    return None
 
 
 class PyProject:
@@ -14,27 +90,139 @@ class PyProject:
 
     path: Path = Path("pyproject.toml")
 
+    # Versions already read, keyed on path and validated by (inode, size, mtime)
+    _cache: ClassVar[dict[str, tuple[tuple[int, int, int], str]]] = {}
+    # Files modified this recently are not cached: a same-size rewrite within
+    # the filesystem's timestamp granularity would otherwise go unnoticed.
+    racy_window_ns: int = 2_000_000_000
+    head_size: int = 64 * 1024
+
+    @classmethod
+    def at(cls, path: Path | str) -> type[PyProject]:
+        """Return a variant of this class bound to a different pyproject path.
+
+        Args:
+            path (Path | str): Location of the pyproject.toml to operate on.
+
+        Returns:
+            type[PyProject]: A subclass whose ``path`` is set to ``path``.
+        """
+        return type(cls.__name__, (cls,), {"path": Path(path)})
+
     @property
     def current_version(self) -> str:
         """Retrieve the current version from pyproject.toml.
 
+        Repeated reads of an unchanged file are answered from an in-process
+        cache after a single stat call. On a miss the version is pulled out
+        by a line scanner, falling back to a full tomllib parse only when the
+        scanner cannot locate it.
+
         Returns:
             str: The version string as specified in pyproject.toml.
         """
-        if not self.path.exists():
-            raise FileNotFoundError(f"Missing file: {self.path}")
-        content = toml.load(self.path)
-        return content["project"]["version"]
+        key = os.fspath(self.path)
+        try:
+            st = os.stat(key)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Missing file: {self.path}") from None
+        stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        data, span = self._read_span()
+        if span is not None:
+            version = data[span[0] : span[1]].decode()
+        else:
+            version = tomllib.loads(self.path.read_text())["project"]["version"]
+        if time.time_ns() - st.st_mtime_ns > self.racy_window_ns:
+            self._cache[key] = (stamp, version)
+        return version
+
+    @classmethod
+    def tool_config(cls) -> dict:
+        """Return the ``[tool.changelogbump]`` table, or {} if there is none.
+
+        The file is only parsed as TOML when it mentions the table.
+        """
+        data = cls.path.read_bytes()
+        if b"changelogbump" not in data:
+            return {}
+        return tomllib.loads(data.decode()).get("tool", {}).get("changelogbump", {})
+
+    @classmethod
+    def _read_span(cls) -> tuple[bytes, tuple[int, int] | None]:
+        """Read as little of the file as needed to locate the version span.
+
+        The first ``head_size`` bytes are scanned first; the rest of the file
+        is read only if the version is not found there.
+
+        Returns:
+            tuple[bytes, tuple[int, int] | None]: The bytes read (possibly only
+            the head of the file) and the span found within them, if any.
+        """
+        with cls.path.open("rb") as fh:
+            data = fh.read(cls.head_size)
+            span = _version_span(data)
+            # The line holding the match must be complete to trust it
+            if span is not None and data.find(b"\n", span[1]) >= 0:
+                return data, span
+            rest = fh.read()
+        if not rest:
+            return data, span
+        data += rest
+        return data, _version_span(data)
+
+    @classmethod
+    def _remember(cls, new_version: str) -> None:
+        key = os.fspath(cls.path)
+        st = os.stat(key)
+        cls._cache[key] = ((st.st_ino, st.st_size, st.st_mtime_ns), new_version)
 
     @classmethod
     def update(cls, new_version: str):
         """Set the new version in pyproject.toml.
 
+        Only the bytes of the existing version string are replaced; comments,
+        key order and formatting elsewhere in the file are left untouched.
+        When the new version has the same length as the old one the file is
+        patched in place, otherwise it is rewritten through an atomic temp file.
+
         Args:
             new_version (str): Updated sem-ver string to dump into pyproject.toml.
+
+        Raises:
+            KeyError: If pyproject.toml has no [project].version.
+            ValueError: If the version is declared in a form that cannot be
+                rewritten in place, such as an inline table.
         """
-        p = str(cls.path)
-        data = toml.load(p)
-        data["project"]["version"] = new_version
-        with cls.path.open("w") as fh:
-            toml.dump(data, fh)  # type: ignore
+        with Profiler.span("pyproject.update") as profile:
+            data, span = cls._read_span()
+            profile.bytes_read = len(data)
+            if span is None:
+                project = tomllib.loads(cls.path.read_text()).get("project", {})
+                if "version" not in project:
+                    raise KeyError(f"No [project].version in {cls.path}")
+                raise ValueError(f"Cannot rewrite [project].version in {cls.path}")
+
+            start, end = span
+            encoded = new_version.encode()
+            if len(encoded) == end - start:
+                fd = os.open(cls.path, os.O_WRONLY)
+                try:
+                    profile.bytes_written = os.pwrite(fd, encoded, start)
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            else:
+                with cls.path.open("rb") as src, AtomicFile(cls.path) as fh:
+                    fh.write(data[:start])
+                    fh.write(encoded)
+                    fh.write(data[end:])
+                    # Copy whatever lies beyond the part already read
+                    src.seek(len(data))
+                    shutil.copyfileobj(src, fh)
+                    profile.bytes_read = src.tell()
+                    profile.bytes_written = fh.tell()
+            cls._remember(new_version)
@@ -0,0 +1,86 @@
+"""Compares the versions recorded in pyproject.toml, the changelog and git tags.
+
+This module provides the Drift class, which collects the latest version each
+source claims and the releases one source has and another lacks, for
+``changelogbump reconcile`` and ``add --base-from-tags``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from changelogbump.Version import Version
+
+
+@dataclass
+class Drift:
+    """Where pyproject.toml, the changelog and the tags disagree.
+
+    Attributes:
+        pyproject (str | None): Version in pyproject.toml.
+        changelog (str | None): Highest released version in the changelog.
+        tag (str | None): Highest version tag.
+        tag_name (str | None): Name of that tag, e.g. "v1.2.3".
+        untagged (list[str]): Changelog releases without a tag, newest first.
+        undocumented (list[str]): Version tags without a changelog section,
+            newest first.
+    """
+
+    pyproject: str | None
+    changelog: str | None
+    tag: str | None
+    tag_name: str | None = None
+    untagged: list[str] = field(default_factory=list)
+    undocumented: list[str] = field(default_factory=list)
+
+    @property
+    def in_sync(self) -> bool:
+        """Return whether all three sources agree on the latest version."""
+        return self.pyproject == self.changelog == self.tag
+
+    @classmethod
+    def measure(cls, changelog, pyproject, cwd: Path | str = ".") -> Drift:
+        """Read all three sources and compare them.
+
+        Args:
+            changelog (type[Changelog]): Changelog class bound to the project.
+            pyproject (type[PyProject]): PyProject class bound to the project.
+            cwd (Path | str, optional): Directory inside the git repository.
+
+        Raises:
+            subprocess.CalledProcessError: If ``cwd`` is not in a repository.
+        """
+        from changelogbump.Archive import Archive
+        from changelogbump.ChangelogIndex import ChangelogIndex
+        from changelogbump.Git import Git
+
+        tags = Git.version_tags(cwd)
+        released: set[str] = set()
+        if changelog.path.exists():
+            for path in Archive.files(changelog.path):
+                released.update(r.version for r in ChangelogIndex.load(path).releases)
+        documented = {}
+        for text in released:
+            try:
+                documented[text] = Version.from_string(text)
+            except ValueError:
+                continue  # "Unreleased"
+
+        def newest_first(versions: list[str]) -> list[str]:
+            return sorted(versions, key=Version.from_string, reverse=True)
+
+        try:
+            current = pyproject().current_version
+        except (FileNotFoundError, KeyError):
+            current = None
+        latest_tag = max(tags, key=Version.from_string, default=None)
+        latest_release = max(documented.values(), default=None)
+        return cls(
+            current,
+            latest_release.current if latest_release else None,
+            latest_tag,
+            tags.get(latest_tag) if latest_tag else None,
+            newest_first([v for v in documented if v not in tags]),
+            newest_first([v for v in tags if v not in documented]),
+        )
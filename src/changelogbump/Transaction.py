@@ -0,0 +1,413 @@
+"""Serializes and journals the rewrite of a project's changelog and pyproject.toml.
+
+This module provides the Transaction context manager, which holds an exclusive
+lock on a project while its files are rewritten and keeps a rollback journal,
+so that a crash or error leaves either every file updated or none of them, and
+the BumpQueue class, which queues concurrent bump requests against the same
+project and applies everything waiting in a single write.
+
+All state lives in a ``.changelogbump`` directory in the project root, which
+ignores itself in git.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import shutil
+import time
+import uuid
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Self
+
+from changelogbump.AtomicFile import AtomicFile, fsync_dir
+from changelogbump.Profiler import Profiler
+from changelogbump.Version import Version
+
+if TYPE_CHECKING:
+    from changelogbump.Changelog import Changelog
+    from changelogbump.PyProject import PyProject
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+
+class TransactionError(Exception):
+    """Raised when a queued bump failed in the process that applied it."""
+
+
+class FileLock:
+    """Exclusive advisory lock on a file, held for the duration of a with-block.
+
+    Locks are taken on separate open file descriptions, so they exclude other
+    threads of the same process as well as other processes.
+
+    Attributes:
+        path (Path): The lock file, created if missing.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fh: BinaryIO | None = None
+
+    def __enter__(self) -> Self:
+        self._fh = self.path.open("a+b")
+        try:
+            with Profiler.span("lock.wait"):
+                if fcntl is not None:
+                    fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX)
+                else:
+                    self._fh.seek(0)
+                    while True:
+                        try:
+                            msvcrt.locking(self._fh.fileno(), msvcrt.LK_LOCK, 1)
+                            break
+                        except OSError:
+                            # LK_LOCK gives up after about ten seconds; keep waiting
+                            continue
+        except BaseException:
+            self._fh.close()
+            raise
+        return self
+
+    def __exit__(self, *exc) -> None:
+        assert self._fh is not None
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+            else:
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._fh.close()
+            self._fh = None
+
+
+class Transaction:
+    """Lock a project and journal its files so a set of rewrites is all-or-nothing.
+
+    On entry the project lock is taken, any journal left by a crashed
+    transaction is rolled back, and a backup of every file is recorded in a
+    new journal before the block runs. On a clean exit the journal is
+    discarded; if the block raises, every file is restored.
+
+    Files listed in ``replaced`` must only ever be rewritten by renaming a new
+    file over them (as AtomicFile does), so their backup is a hard link to the
+    original inode and costs nothing however large the file is. Files in
+    ``patched`` may be modified in place and are copied.
+
+    Pass ``lock=False`` when the caller already holds the project lock.
+
+    Attributes:
+        root (Path): The project directory holding the lock and journal.
+        replaced (list[Path]): Files rewritten only through atomic renames.
+        patched (list[Path]): Files that may be modified in place.
+    """
+
+    state_dir_name = ".changelogbump"
+
+    def __init__(
+        self,
+        root: Path | str,
+        replaced: Iterable[Path] = (),
+        patched: Iterable[Path] = (),
+        lock: bool = True,
+    ):
+        self.root = Path(root)
+        self.replaced = [Path(p) for p in replaced]
+        self.patched = [Path(p) for p in patched]
+        self._lock = FileLock(self.lock_path(self.root)) if lock else None
+
+    @classmethod
+    def state_dir(cls, root: Path) -> Path:
+        """Return the project's state directory, creating it if needed."""
+        state = Path(root) / cls.state_dir_name
+        if not state.is_dir():
+            state.mkdir(exist_ok=True)
+            (state / ".gitignore").write_text("*\n")
+        return state
+
+    @classmethod
+    def lock_path(cls, root: Path) -> Path:
+        """Return the file locked while the project is being modified."""
+        return cls.state_dir(root) / "lock"
+
+    @classmethod
+    def journal_path(cls, root: Path) -> Path:
+        """Return the rollback journal of the project."""
+        return cls.state_dir(root) / "journal"
+
+    @staticmethod
+    def backup_path(path: Path) -> Path:
+        """Return where the journal keeps the original content of ``path``."""
+        return path.with_name(f".{path.name}.txn")
+
+    @classmethod
+    def recover(cls, root: Path) -> bool:
+        """Roll back a transaction left unfinished by a crash.
+
+        Must be called with the project lock held.
+
+        Returns:
+            bool: True if a journal was found and rolled back.
+        """
+        journal = cls.journal_path(root)
+        try:
+            entries = json.loads(journal.read_bytes())["files"]
+        except FileNotFoundError:
+            return False
+        cls._restore(entries)
+        journal.unlink()
+        fsync_dir(journal.parent)
+        return True
+
+    @staticmethod
+    def _restore(entries: list[list[str | None]]) -> None:
+        for target, backup in entries:
+            if backup is None:
+                Path(target).unlink(missing_ok=True)
+            elif os.path.exists(backup):
+                os.replace(backup, target)
+                # Renaming a hard link onto its own inode leaves both names
+                Path(backup).unlink(missing_ok=True)
+            fsync_dir(Path(target).parent)
+
+    def __enter__(self) -> Self:
+        if self._lock is not None:
+            self._lock.__enter__()
+        try:
+            self.recover(self.root)
+            self._entries = [self._backup(p, link=True) for p in self.replaced]
+            self._entries += [self._backup(p, link=False) for p in self.patched]
+            with AtomicFile(self.journal_path(self.root)) as fh:
+                fh.write(json.dumps({"files": self._entries}).encode())
+        except BaseException:
+            if self._lock is not None:
+                self._lock.__exit__(None, None, None)
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            journal = self.journal_path(self.root)
+            if exc_type is not None:
+                self._restore(self._entries)
+                journal.unlink()
+                return
+            # Removing the journal is the commit point
+            journal.unlink()
+            fsync_dir(journal.parent)
+            for _, backup in self._entries:
+                if backup is not None:
+                    Path(backup).unlink(missing_ok=True)
+        finally:
+            if self._lock is not None:
+                self._lock.__exit__(None, None, None)
+
+    def _backup(self, path: Path, link: bool) -> list[str | None]:
+        path = path.absolute()
+        if not path.exists():
+            return [str(path), None]
+        backup = self.backup_path(path)
+        backup.unlink(missing_ok=True)
+        if link:
+            try:
+                os.link(path, backup)
+                return [str(path), str(backup)]
+            except OSError:
+                pass  # e.g. a filesystem without hard links; fall back to a copy
+        shutil.copy2(path, backup)
+        with backup.open("rb+") as fh:
+            os.fsync(fh.fileno())
+        return [str(path), str(backup)]
+
+
+class BumpQueue:
+    """Queue of bump requests against one project, applied in batches.
+
+    Each request is written to the project's queue directory, with the ID of
+    the process that made it, before waiting for the lock; a waiter that is
+    interrupted withdraws its request, and requests from processes that no
+    longer exist are discarded unapplied. Whoever holds the lock applies every
+    request waiting at that moment as one bump: the most significant part
+    requested wins (from the highest base version requested, if any, but
+    never below pyproject.toml's version), the changelog entries are merged
+    into a single section and the summaries are joined, and one transaction
+    writes both files, along with any version sources configured in
+    ``[tool.changelogbump]``. Entries recorded with Notes are consumed by the
+    same transaction. The other requesters then find their result waiting
+    instead of racing to write again.
+
+    Attributes:
+        root (Path): The project directory.
+        changelog (type[Changelog]): Changelog class bound to the project's file.
+        pyproject (type[PyProject]): PyProject class bound to the project's file.
+    """
+
+    parts = ("major", "minor", "patch")
+
+    def __init__(
+        self, root: Path | str, changelog: type[Changelog], pyproject: type[PyProject]
+    ):
+        self.root = Path(root)
+        self.changelog = changelog
+        self.pyproject = pyproject
+
+    def submit(
+        self,
+        part: str,
+        summary: str | None = None,
+        sections: dict[str, list[str]] | None = None,
+        base: str | None = None,
+    ) -> tuple[str, str]:
+        """Queue a bump and wait until it has been written, possibly with others.
+
+        Args:
+            part (str): One of "major", "minor" or "patch".
+            summary (str | None, optional): Summary for the version heading.
+            sections (dict[str, list[str]] | None, optional): Changelog entries
+                by section. Defaults to no entries.
+            base (str | None, optional): Version to bump from instead of the
+                one in pyproject.toml when it is higher, e.g. the latest git tag.
+
+        Returns:
+            tuple[str, str]: The version before and after the bump that
+            included this request.
+
+        Raises:
+            ValueError: If ``part`` is not a version part.
+            TransactionError: If another process applied this request and failed.
+        """
+        if part not in self.parts:
+            raise ValueError(f"part must be one of {list(self.parts)}, got {part!r}")
+        queue = Transaction.state_dir(self.root) / "queue"
+        queue.mkdir(exist_ok=True)
+        # Names sort in arrival order
+        ticket = f"{time.time_ns():020d}-{uuid.uuid4().hex[:12]}"
+        request = {
+            "part": part,
+            "summary": summary,
+            "sections": sections or {},
+            "base": base,
+            "pid": os.getpid(),
+        }
+        pending = queue / f"{ticket}.json"
+        done = queue / f"{ticket}.done"
+        with AtomicFile(pending) as fh:
+            fh.write(json.dumps(request).encode())
+
+        result = None
+        try:
+            with FileLock(Transaction.lock_path(self.root)):
+                if done.exists():
+                    result = json.loads(done.read_bytes())
+                else:
+                    result = self._apply_pending(queue, ticket)
+        finally:
+            # A waiter interrupted before its answer withdraws the request, so
+            # the next bump does not apply it on its behalf
+            if result is None:
+                pending.unlink(missing_ok=True)
+            done.unlink(missing_ok=True)
+        if "error" in result:
+            raise TransactionError(result["error"])
+        return result["old"], result["new"]
+
+    @staticmethod
+    def _alive(pid: int | None) -> bool:
+        """Return whether the process that queued a request may still be waiting."""
+        if pid is None or pid == os.getpid() or fcntl is None:
+            return True  # os.kill() on Windows would terminate the process
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass  # exists, owned by another user
+        return True
+
+    def _apply_pending(self, queue: Path, ticket: str) -> dict:
+        Transaction.recover(self.root)
+        pending: list[Path] = []
+        requests: list[dict] = []
+        for path in sorted(queue.glob("*.json")):
+            try:
+                request = json.loads(path.read_bytes())
+            except FileNotFoundError:
+                continue  # withdrawn by a waiter that gave up
+            if path.stem != ticket and not self._alive(request.get("pid")):
+                path.unlink(missing_ok=True)  # its requester died while waiting
+                continue
+            pending.append(path)
+            requests.append(request)
+        for path in queue.glob("*.done"):
+            with contextlib.suppress(FileNotFoundError, ValueError):
+                if not self._alive(json.loads(path.read_bytes()).get("pid")):
+                    path.unlink()
+
+        part = min((r["part"] for r in requests), key=self.parts.index)
+        summary = "; ".join(r["summary"] for r in requests if r["summary"]) or None
+
+        try:
+            from changelogbump.Notes import Notes
+            from changelogbump.VersionSources import VersionSources
+
+            # Entries noted since the last release come first
+            notes_path = Notes.path_for(self.changelog.path)
+            noted = Notes.pending(self.changelog.path)
+            sections = Notes.read(self.changelog.path) if noted else {}
+            for r in requests:
+                for name, entries in r["sections"].items():
+                    sections.setdefault(name, []).extend(entries)
+
+            current = self.pyproject().current_version
+            bases = [Version.from_string(r["base"]) for r in requests if r.get("base")]
+            # A base behind pyproject.toml would write a release below existing ones
+            old = (
+                max(*bases, Version.from_string(current)).current if bases else current
+            )
+            new = Version.from_string(old).bump(**{part: True}).current
+            # Other files holding the version must agree before anything is written
+            sources = VersionSources.from_pyproject(self.pyproject)
+            scanned = sources.verify(current) if sources else {}
+            with Transaction(
+                self.root,
+                replaced=[self.changelog.path],
+                patched=[self.pyproject.path, notes_path, *scanned],
+                lock=False,
+            ):
+                self.changelog.update(new, summary, sections)
+                self.pyproject.update(new)
+                VersionSources.update(scanned, new)
+                if noted:
+                    notes_path.unlink()
+                    with contextlib.suppress(KeyError):
+                        self.changelog.render_unreleased({})
+        except Exception as exc:
+            # Waiters get the error as their answer; the leader raises it
+            self._answer(
+                ticket, pending, requests, {"error": f"{type(exc).__name__}: {exc}"}
+            )
+            raise
+        result = {"old": old, "new": new}
+        self._answer(ticket, pending, requests, result)
+        return result
+
+    @staticmethod
+    def _answer(
+        ticket: str, pending: list[Path], requests: list[dict], result: dict
+    ) -> None:
+        """Write ``result`` for every waiting request and remove the batch's tickets."""
+        for path, request in zip(pending, requests):
+            if path.stem != ticket:
+                answer = (
+                    dict(result, pid=request["pid"]) if "pid" in request else result
+                )
+                with AtomicFile(path.with_suffix(".done")) as fh:
+                    fh.write(json.dumps(answer).encode())
+            path.unlink(missing_ok=True)
@@ -0,0 +1,245 @@
+"""Checks changelogs against the Keep a Changelog layout that ``init`` writes.
+
+This module provides the Validator class, which reads a changelog once, line
+by line, and reports problems as Diagnostic records: a header that differs
+from the ``init`` template, malformed or unordered version headings,
+duplicate versions, bad dates, unknown section names, and a latest release
+that does not match pyproject.toml. Only headings are decoded and only the
+version strings seen so far are kept, so memory does not grow with the size
+of the file, and many changelogs are checked in parallel processes.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+
+from changelogbump import header_path
+from changelogbump.Version import Version
+
+
+@dataclass
+class Diagnostic:
+    """One problem found in a changelog.
+
+    Attributes:
+        path (str): The changelog checked.
+        line (int): 1-based line number, or 0 for the file as a whole.
+        code (str): Stable identifier of the check, e.g. "CB005".
+        severity (str): "error" or "warning".
+        message (str): Human-readable description.
+    """
+
+    path: str
+    line: int
+    code: str
+    severity: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}: {self.code} {self.severity}: {self.message}"
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class Validator:
+    """Single-pass, line-streaming changelog checker.
+
+    Codes:
+        CB001: Header differs from the ``init`` template.
+        CB002: Version heading is malformed or not a semantic version.
+        CB003: Release date is missing or invalid.
+        CB004: Release is dated after a newer release (warning).
+        CB005: Versions are not in descending order.
+        CB006: Version appears more than once.
+        CB007: Unknown ``###`` section name.
+        CB008: Latest release differs from pyproject.toml's version.
+        CB009: ``## [Unreleased]`` is not the first heading, or is repeated.
+    """
+
+    heading_re = re.compile(r"## \[([^\]]+)\](?: - (\S+))?")
+    date_re = re.compile(r"\d{4}-\d{2}-\d{2}")
+    # Sections defined by Keep a Changelog 1.1.0
+    known_sections: frozenset[str] = frozenset(
+        {"added", "changed", "deprecated", "removed", "fixed", "security"}
+    )
+
+    @staticmethod
+    def header_lines() -> list[bytes]:
+        """Return the template lines every changelog must start with."""
+        lines = header_path.read_bytes().splitlines()
+        return [line for line in lines if not line.startswith(b"## [")]
+
+    @classmethod
+    def check(cls, path: Path | str) -> list[Diagnostic]:
+        """Validate one changelog in a single pass.
+
+        The pyproject.toml beside the changelog, if there is one, supplies the
+        version the latest release must match. Shards listed in the archive
+        manifest are read after the changelog, as if they followed it, so
+        ordering and duplicates are checked across the whole history.
+
+        Args:
+            path (Path | str): The changelog to check.
+
+        Returns:
+            list[Diagnostic]: Problems found, in line order.
+        """
+        from changelogbump.Archive import Archive
+
+        path = Path(path)
+        found: list[Diagnostic] = []
+        source = path
+
+        def report(line: int, code: str, message: str, severity: str = "error"):
+            found.append(Diagnostic(str(source), line, code, severity, message))
+
+        header = cls.header_lines()
+        header_ok = True
+        # version -> line of its heading; one small entry per release
+        seen: dict[str, int] = {}
+        previous: tuple[Version, date | None, int] | None = None
+        latest: tuple[Version, int, Path] | None = None
+        unreleased: int | None = None
+        headed = False
+        lineno = 0
+        for source in Archive.files(path):
+            archived = source != path
+            with source.open("rb") as fh:
+                for lineno, raw in enumerate(fh, 1):
+                    if (
+                        not archived
+                        and header_ok
+                        and lineno <= len(header)
+                        and raw.rstrip() != header[lineno - 1]
+                    ):
+                        header_ok = False
+                        report(lineno, "CB001", "header differs from the init template")
+                    if not raw.startswith(b"##"):
+                        continue
+                    text = raw.decode("utf-8", "replace").rstrip()
+                    if text.startswith("### "):
+                        name = text[4:].strip()
+                        if name.lower() not in cls.known_sections:
+                            report(lineno, "CB007", f"unknown section {name!r}")
+                        continue
+                    if not text.startswith("## "):
+                        continue
+
+                    match = cls.heading_re.fullmatch(text)
+                    if match is None:
+                        report(lineno, "CB002", f"malformed version heading {text!r}")
+                        continue
+                    name, day = match.groups()
+                    if name.lower() == "unreleased":
+                        if unreleased is not None:
+                            report(
+                                lineno,
+                                "CB009",
+                                f"Unreleased duplicates the heading on line {unreleased}",
+                            )
+                        elif headed or archived:
+                            report(
+                                lineno, "CB009", "Unreleased is not the first heading"
+                            )
+                        unreleased = unreleased or lineno
+                        headed = True
+                        continue
+                    headed = True
+                    try:
+                        version = Version.from_string(name)
+                    except ValueError:
+                        report(lineno, "CB002", f"{name!r} is not a semantic version")
+                        continue
+
+                    released = None
+                    if day is None:
+                        report(lineno, "CB003", f"{name} has no release date")
+                    elif not cls.date_re.fullmatch(day):
+                        report(lineno, "CB003", f"{name} has invalid date {day!r}")
+                    else:
+                        try:
+                            released = date.fromisoformat(day)
+                        except ValueError:
+                            report(lineno, "CB003", f"{name} has invalid date {day!r}")
+
+                    if name in seen:
+                        report(
+                            lineno,
+                            "CB006",
+                            f"{name} duplicates the heading on line {seen[name]}",
+                        )
+                    elif previous is not None and not version < previous[0]:
+                        report(
+                            lineno,
+                            "CB005",
+                            f"{name} is listed after older version {previous[0]} "
+                            f"(line {previous[2]})",
+                        )
+                    elif (
+                        previous is not None
+                        and released
+                        and previous[1]
+                        and released > previous[1]
+                    ):
+                        report(
+                            lineno,
+                            "CB004",
+                            f"{name} is dated {released} but newer {previous[0]} "
+                            f"is dated {previous[1]}",
+                            "warning",
+                        )
+                    seen.setdefault(name, lineno)
+                    previous = (version, released, lineno)
+                    if latest is None:
+                        latest = (version, lineno, source)
+
+            if not archived and header_ok and lineno < len(header):
+                report(lineno, "CB001", "header is incomplete")
+        if latest is not None:
+            current = cls._pyproject_version(path)
+            if current is not None and current != latest[0].current:
+                source = latest[2]
+                report(
+                    latest[1],
+                    "CB008",
+                    f"latest release is {latest[0]} but pyproject.toml is at {current}",
+                )
+        return found
+
+    @staticmethod
+    def _pyproject_version(changelog: Path) -> str | None:
+        from changelogbump.PyProject import PyProject
+
+        pyproject = PyProject.at(changelog.with_name(PyProject.path.name))
+        try:
+            return pyproject().current_version
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+
+    @classmethod
+    def check_all(
+        cls, paths: Iterable[Path | str], jobs: int | None = None
+    ) -> list[Diagnostic]:
+        """Validate many changelogs, in parallel processes when there are several.
+
+        Args:
+            paths (Iterable[Path | str]): Changelogs to check.
+            jobs (int | None, optional): Worker processes. Defaults to the
+                executor's default; 1 checks in this process.
+
+        Returns:
+            list[Diagnostic]: Problems from every file, grouped in input order.
+        """
+        paths = list(paths)
+        if len(paths) < 2 or jobs == 1:
+            results = map(cls.check, paths)
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(cls.check, paths, chunksize=8))
+        return [diagnostic for found in results for diagnostic in found]
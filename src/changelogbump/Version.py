@@ -1,60 +1,138 @@
 """Manages semantic versioning for the application.
 
-This module provides the Version dataclass with properties and methods that
-handle version increments according to the semantic versioning specification.
+This module provides the Version dataclass, an immutable SemVer 2.0.0 version
+with pre-release and build metadata, ordered by SemVer precedence. Each
+instance carries a precomputed sort key, so comparing and sorting large
+release histories costs a tuple comparison per pair, and parsed strings are
+memoized because the same versions are read over and over.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
 
+# https://semver.org/#is-there-a-suggested-regular-expression-regex-to-check-a-semver-string
+_SEMVER_RE = re.compile(
+    r"(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)"
+    r"(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)"
+    r"(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?"
+    r"(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?"
+)
 
-@dataclass
+
+@dataclass(frozen=True, slots=True, init=False)
 class Version:
     """Represents a semantic version number.
 
+    Instances are immutable and hashable. Equality compares every field,
+    while ordering follows SemVer precedence, which ignores build metadata.
+
     Attributes:
         major (int): The major version component.
         minor (int): The minor version component.
         patch (int): The patch version component.
+        prerelease (str): Dot-separated pre-release identifiers, e.g. "rc.1".
+        build (str): Dot-separated build metadata, e.g. "sha.5114f85".
+        sort_key (tuple): Precomputed SemVer precedence key; sorting with
+            ``key=operator.attrgetter("sort_key")`` avoids calling the
+            comparison methods for every pair.
     """
 
     major: int
     minor: int
     patch: int
+    prerelease: str = ""
+    build: str = ""
+    sort_key: tuple = field(init=False, repr=False, compare=False)
+
+    def __init__(
+        self, major: int, minor: int, patch: int, prerelease: str = "", build: str = ""
+    ) -> None:
+        # Frozen, so assign through the slot descriptors; this is several
+        # times cheaper than object.__setattr__ per field.
+        _set_major(self, major)
+        _set_minor(self, minor)
+        _set_patch(self, patch)
+        _set_prerelease(self, prerelease)
+        _set_build(self, build)
+        if prerelease:
+            # Numeric identifiers sort before alphanumeric ones, and numerically
+            ids = tuple(
+                (0, int(i), "") if i.isdigit() else (1, 0, i)
+                for i in prerelease.split(".")
+            )
+            _set_sort_key(self, (major, minor, patch, 0, ids))
+        else:
+            # A release outranks every pre-release of the same version
+            _set_sort_key(self, (major, minor, patch, 1))
 
     def __str__(self) -> str:
         return self.current
 
+    def __lt__(self, other: Version) -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.sort_key < other.sort_key
+
+    def __le__(self, other: Version) -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.sort_key <= other.sort_key
+
+    def __gt__(self, other: Version) -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.sort_key > other.sort_key
+
+    def __ge__(self, other: Version) -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.sort_key >= other.sort_key
+
     @property
     def current(self) -> str:
-        """Return the current version as a string in the format 'major.minor.patch'."""
-        return f"{self.major}.{self.minor}.{self.patch}"
+        """Return the version as a string, e.g. '1.2.3' or '1.2.3-rc.1+build.5'."""
+        text = f"{self.major}.{self.minor}.{self.patch}"
+        if self.prerelease:
+            text += f"-{self.prerelease}"
+        if self.build:
+            text += f"+{self.build}"
+        return text
 
     def bump(
         self, major: bool = False, minor: bool = False, patch: bool = False
-    ) -> None:
-        """Increment one of the semantic version parts.
+    ) -> Version:
+        """Return the next version for one of the semantic version parts.
+
+        Pre-release and build metadata are dropped. Bumping a pre-release to
+        the part it already anticipates releases it instead, so the patch
+        bump of "1.2.3-rc.1" is "1.2.3" and its minor bump is "1.3.0".
 
         Args:
             major (bool, optional): If True, increase the major version and reset the minor and patch. Defaults to False.
             minor (bool, optional): If True, increase the minor version and reset the patch. Defaults to False.
             patch (bool, optional): If True, increase the patch version. Defaults to False.
 
+        Returns:
+            Version: The bumped version.
+
         Raises:
             AttributeError: If none of major, minor, or patch is True.
         """
+        pre = bool(self.prerelease)
         if major:
-            self.major += 1
-            self.minor = 0
-            self.patch = 0
-        elif minor:
-            self.minor += 1
-            self.patch = 0
-        elif patch:
-            self.patch += 1
-        else:
-            raise AttributeError("must provide one of ['major', 'minor', 'patch']")
+            held = pre and self.minor == 0 and self.patch == 0
+            return Version(self.major if held else self.major + 1, 0, 0)
+        if minor:
+            held = pre and self.patch == 0
+            return Version(self.major, self.minor if held else self.minor + 1, 0)
+        if patch:
+            return Version(
+                self.major, self.minor, self.patch if pre else self.patch + 1
+            )
+        raise AttributeError("must provide one of ['major', 'minor', 'patch']")
 
     def is_greater_than(self, v: Version) -> bool:
         """
@@ -64,32 +142,50 @@ class Version:
             v (Version): The other version to compare.
 
         Returns:
-            bool: True if the current version is greater than the given version, otherwise False.
+            bool: True if the current version has higher precedence than the given version, otherwise False.
         """
-        if self.major < v.major:
-            return False
-        if self.major > v.major:
-            return True
-        if self.minor < v.minor:
-            return False
-        if self.minor > v.minor:
-            return True
-        if self.patch < v.minor:
-            return False
-        if self.patch > v.patch:
-            return True
-        return False
+        return self.sort_key > v.sort_key
 
     @classmethod
     def from_string(cls, version_string: str) -> Version:
         """
-        Create a Version instance from a dot-separated string.
+        Create a Version instance from a SemVer string.
+
+        Results are memoized; since instances are immutable the same object
+        may be returned for repeated strings.
 
         Args:
-            version_string (str): A string containing the version in "major.minor.patch" format.
+            version_string (str): A version such as "1.2.3", "1.2.3-rc.1" or "1.2.3+build.5".
 
         Returns:
             Version: An instance of the Version class constructed from the provided string.
+
+        Raises:
+            ValueError: If the string is not a valid semantic version.
         """
-        maj_str, min_str, pat_str = version_string.split(".")
-        return cls(int(maj_str), int(min_str), int(pat_str))
+        if cls is Version:
+            return _parse(version_string)
+        return cls(*_fields(version_string))
+
+
+(
+    _set_major,
+    _set_minor,
+    _set_patch,
+    _set_prerelease,
+    _set_build,
+    _set_sort_key,
+) = (Version.__dict__[name].__set__ for name in Version.__slots__)
+
+
+def _fields(version_string: str) -> tuple[int, int, int, str, str]:
+    match = _SEMVER_RE.fullmatch(version_string)
+    if match is None:
+        raise ValueError(f"Invalid semantic version: {version_string!r}")
+    maj, min_, pat, pre, build = match.groups()
+    return int(maj), int(min_), int(pat), pre or "", build or ""
+
+
+@lru_cache(maxsize=65536)
+def _parse(version_string: str) -> Version:
+    return Version(*_fields(version_string))
@@ -0,0 +1,178 @@
+"""Answers ordering queries over large sets of release versions.
+
+This module provides the VersionIndex class, which parses many version
+strings in one regex pass and keeps them as a sorted ``array('q')`` of packed
+``major.minor.patch`` integers, eight bytes per release, so that range,
+"latest below" and "next free" queries are binary searches rather than scans
+over Version instances.
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from changelogbump.Version import Version
+
+
+class VersionIndex:
+    """Sorted, de-duplicated set of release versions packed into 64-bit integers.
+
+    Each version is stored as ``major << 42 | minor << 21 | patch``, so integer
+    order is version order. Only final releases are indexed: pre-releases and
+    headings that are not versions (e.g. "Unreleased") are skipped, and build
+    metadata is ignored. Query bounds may be pre-releases, which order just
+    below the final release of the same number.
+    """
+
+    bits: int = 21
+    # Largest component that fits in its share of the packed key
+    limit: int = (1 << bits) - 1
+    # One release per line; components are capped at six digits (< limit)
+    release_re = re.compile(
+        r"^(0|[1-9]\d{0,5})\.(0|[1-9]\d{0,5})\.(0|[1-9]\d{0,5})(?:\+[0-9A-Za-z.-]+)?$",
+        re.MULTILINE,
+    )
+
+    def __init__(self, keys: array):
+        self.keys = keys
+
+    @classmethod
+    def pack(cls, version: Version) -> int:
+        """Return the packed integer key of a version.
+
+        Raises:
+            ValueError: If a component does not fit in ``bits`` bits.
+        """
+        if max(version.major, version.minor, version.patch) > cls.limit:
+            raise ValueError(f"Version component too large to index: {version}")
+        return (
+            (version.major << 2 * cls.bits)
+            | (version.minor << cls.bits)
+            | version.patch
+        )
+
+    @classmethod
+    def unpack(cls, key: int) -> Version:
+        """Return the Version for a packed integer key."""
+        return Version(
+            key >> 2 * cls.bits, (key >> cls.bits) & cls.limit, key & cls.limit
+        )
+
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> VersionIndex:
+        """Parse and index many version strings at once.
+
+        The strings are joined and scanned with a single multi-line regex, so
+        no Version instance is created per input.
+
+        Args:
+            strings (Iterable[str]): Version strings; invalid ones are skipped.
+
+        Returns:
+            VersionIndex: The sorted index.
+        """
+        b = cls.bits
+        packed = {
+            (int(major) << 2 * b) | (int(minor) << b) | int(patch)
+            for major, minor, patch in cls.release_re.findall("\n".join(strings))
+        }
+        return cls(array("q", sorted(packed)))
+
+    @classmethod
+    def from_changelogs(cls, paths: Iterable[Path]) -> VersionIndex:
+        """Index every version heading of one or more changelogs.
+
+        Headings are read from each changelog's sidecar index (see
+        ChangelogIndex), which is rebuilt first if stale, including the shards
+        of any archived releases.
+        """
+        from changelogbump.Archive import Archive
+        from changelogbump.ChangelogIndex import ChangelogIndex
+
+        return cls.from_strings(
+            release.version
+            for path in paths
+            for file in Archive.files(Path(path))
+            for release in ChangelogIndex.load(file).releases
+        )
+
+    @staticmethod
+    def parse_bound(text: str) -> Version:
+        """Parse a query bound, allowing a shortened form such as "2" or "2.0".
+
+        Raises:
+            ValueError: If the text is not a (possibly shortened) version.
+        """
+        parts = text.split(".")
+        if 0 < len(parts) < 3 and all(p.isdigit() for p in parts):
+            text = ".".join(parts + ["0"] * (3 - len(parts)))
+        return Version.from_string(text)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __iter__(self) -> Iterator[Version]:
+        return map(self.unpack, self.keys)
+
+    def __contains__(self, version: Version) -> bool:
+        if version.prerelease:
+            return False
+        key = self.pack(version)
+        i = bisect_left(self.keys, key)
+        return i < len(self.keys) and self.keys[i] == key
+
+    def between(
+        self, lo: Version | None = None, hi: Version | None = None
+    ) -> list[Version]:
+        """Return the releases within an inclusive range, in ascending order.
+
+        Args:
+            lo (Version | None, optional): Lower bound; None leaves it open.
+            hi (Version | None, optional): Upper bound; None leaves it open.
+
+        Returns:
+            list[Version]: The matching releases.
+        """
+        start = 0 if lo is None else bisect_left(self.keys, self.pack(lo))
+        if hi is None:
+            stop = len(self.keys)
+        elif hi.prerelease:
+            # 2.0.0-rc.1 precedes 2.0.0, so the final release is out of range
+            stop = bisect_left(self.keys, self.pack(hi))
+        else:
+            stop = bisect_right(self.keys, self.pack(hi))
+        return [self.unpack(k) for k in self.keys[start:stop]]
+
+    def latest(self, below: Version | None = None) -> Version | None:
+        """Return the highest release, or the highest one strictly below ``below``.
+
+        Returns:
+            Version | None: The release, or None if there is none.
+        """
+        i = (
+            len(self.keys)
+            if below is None
+            else bisect_left(self.keys, self.pack(below))
+        )
+        return self.unpack(self.keys[i - 1]) if i else None
+
+    def next_free(self, part: str, base: Version | None = None) -> Version:
+        """Return the first bump of ``part`` from ``base`` that is not yet released.
+
+        Args:
+            part (str): One of "major", "minor" or "patch".
+            base (Version | None, optional): Starting point. Defaults to the
+                latest release, or 0.0.0 for an empty index.
+
+        Returns:
+            Version: The next unused version.
+        """
+        candidate = base or self.latest() or Version(0, 0, 0)
+        candidate = candidate.bump(**{part: True})
+        while candidate in self:
+            candidate = candidate.bump(**{part: True})
+        return candidate
@@ -0,0 +1,291 @@
+"""Keeps the version in other files in step with pyproject.toml.
+
+This module provides the VersionSources class. Files listed under
+``version-files`` in ``[tool.changelogbump]`` are scanned in parallel, each
+read once, for the version strings their kind defines (``__version__`` in
+Python modules, ``version`` in setup.cfg, Helm charts and Dockerfile
+``ARG``/``ENV``/``LABEL`` lines, the top-level ``version`` of package.json,
+or a custom pattern). A bump checks that every occurrence agrees with
+pyproject.toml and then replaces only the bytes of each version string,
+leaving the rest of the file as it was.
+
+Typical configuration:
+
+    [tool.changelogbump]
+    version-files = [
+        "src/pkg/__init__.py",
+        "package.json",
+        {path = "chart/Chart.yaml", key = "appVersion"},
+        {path = "VERSION.txt", pattern = "^(?P<version>.+)$"},
+    ]
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar
+
+from changelogbump.AtomicFile import AtomicFile
+from changelogbump.Profiler import Profiler
+
+
+@dataclass
+class Occurrence:
+    """One version string found in a source file.
+
+    Attributes:
+        path (Path): The file.
+        line (int): 1-based line of the match.
+        start (int): Byte offset of the version text.
+        end (int): Byte offset just past the version text.
+        version (str): The version text.
+    """
+
+    path: Path
+    line: int
+    start: int
+    end: int
+    version: str
+
+
+class VersionSources:
+    """Version strings kept in files other than pyproject.toml.
+
+    Kinds are looked up in ``kinds``; add one with register(). An entry
+    without ``kind`` gets one from its file name, and ``pattern`` overrides
+    the kind's pattern. Every match of the pattern is a source, unless the
+    kind also registered a selector that rejects it.
+
+    Attributes:
+        root (Path): Directory the configured paths are relative to.
+        entries (list[tuple[Path, re.Pattern, Callable | None]]): Each file,
+            its pattern and the kind's selector, if any.
+    """
+
+    kinds: ClassVar[dict[str, str]] = {}
+    # Kind -> predicate(file content, match) keeping only the matches it accepts
+    selectors: ClassVar[dict[str, Callable[[bytes, re.Match], bool]]] = {}
+    # (suffix or file name, kind) checked in order when an entry has no kind
+    by_name: ClassVar[list[tuple[str, str]]] = []
+
+    @classmethod
+    def register(
+        cls,
+        kind: str,
+        pattern: str,
+        names: tuple[str, ...] = (),
+        select: Callable[[bytes, re.Match], bool] | None = None,
+    ) -> None:
+        """Add a kind of version source.
+
+        Args:
+            kind (str): Name used as ``kind`` in the configuration.
+            pattern (str): Regular expression with a ``version`` group. May
+                contain ``{key}``, filled from the entry's ``key``.
+            names (tuple[str, ...], optional): File names or suffixes that
+                imply this kind.
+            select (Callable[[bytes, re.Match], bool] | None, optional):
+                Called with the file content and each match of the kind's own
+                pattern; matches it returns False for are ignored.
+        """
+        cls.kinds[kind] = pattern
+        if select is not None:
+            cls.selectors[kind] = select
+        cls.by_name.extend((name, kind) for name in names)
+
+    def __init__(self, root: Path | str, config: list[str | dict]):
+        self.root = Path(root)
+        self.entries = [self._entry(item) for item in config]
+
+    @classmethod
+    def from_pyproject(cls, pyproject) -> VersionSources:
+        """Build the sources configured in a project's ``[tool.changelogbump]``.
+
+        Args:
+            pyproject (type[PyProject]): PyProject class bound to the project.
+
+        Raises:
+            ValueError: If an entry has an unknown kind or an invalid pattern.
+        """
+        config = pyproject.tool_config().get("version-files", [])
+        return cls(pyproject.path.parent, config)
+
+    def _entry(self, item: str | dict) -> tuple[Path, re.Pattern, Callable | None]:
+        if isinstance(item, str):
+            item = {"path": item}
+        path = self.root / item["path"]
+        pattern = item.get("pattern")
+        select = None
+        if pattern is None:
+            kind = item.get("kind") or next(
+                (k for name, k in self.by_name if path.name.endswith(name)), None
+            )
+            if kind not in self.kinds:
+                raise ValueError(
+                    f"{item['path']}: unknown version source kind {kind!r}"
+                )
+            key = re.escape(item.get("key", "version"))
+            pattern = self.kinds[kind].replace("{key}", key)
+            select = self.selectors.get(kind)
+        try:
+            compiled = re.compile(pattern.encode(), re.MULTILINE)
+        except re.error as exc:
+            raise ValueError(f"{item['path']}: invalid pattern: {exc}") from None
+        if "version" not in compiled.groupindex:
+            raise ValueError(f"{item['path']}: pattern has no 'version' group")
+        return path, compiled, select
+
+    def __bool__(self) -> bool:
+        return bool(self.entries)
+
+    @property
+    def paths(self) -> list[Path]:
+        """Return every configured file, once each."""
+        return list(dict.fromkeys(path for path, _, _ in self.entries))
+
+    def scan(
+        self, jobs: int | None = None
+    ) -> dict[Path, tuple[bytes, list[Occurrence]]]:
+        """Read every file once, on a thread pool, and find its version strings.
+
+        Returns:
+            dict[Path, tuple[bytes, list[Occurrence]]]: Content and matches of
+            each file, matches in file order.
+
+        Raises:
+            FileNotFoundError: If a configured file is missing.
+            ValueError: If a file has no match for its pattern.
+        """
+        patterns: dict[Path, list[tuple[re.Pattern, Callable | None]]] = {}
+        for path, pattern, select in self.entries:
+            patterns.setdefault(path, []).append((pattern, select))
+
+        def scan_one(path: Path) -> tuple[bytes, list[Occurrence]]:
+            data = path.read_bytes()
+            found = {}
+            for pattern, select in patterns[path]:
+                for match in pattern.finditer(data):
+                    if select is not None and not select(data, match):
+                        continue
+                    start, end = match.span("version")
+                    line = data.count(b"\n", 0, start) + 1
+                    found[start] = Occurrence(
+                        path, line, start, end, match.group("version").decode()
+                    )
+            if not found:
+                raise ValueError(f"No version found in {path}")
+            return data, [found[k] for k in sorted(found)]
+
+        with Profiler.span("sources.scan") as profile, ThreadPoolExecutor(jobs) as pool:
+            scanned = dict(zip(patterns, pool.map(scan_one, patterns)))
+            profile.bytes_read = sum(len(data) for data, _ in scanned.values())
+        return scanned
+
+    @staticmethod
+    def mismatches(
+        scanned: dict[Path, tuple[bytes, list[Occurrence]]], expected: str
+    ) -> list[Occurrence]:
+        """Return the occurrences that differ from ``expected``."""
+        return [
+            occurrence
+            for _, occurrences in scanned.values()
+            for occurrence in occurrences
+            if occurrence.version != expected
+        ]
+
+    def verify(self, expected: str, jobs: int | None = None) -> dict:
+        """Scan and check that every source holds ``expected``.
+
+        Returns:
+            dict: The scan, to pass on to update().
+
+        Raises:
+            ValueError: If any source differs, naming each one.
+        """
+        scanned = self.scan(jobs)
+        wrong = self.mismatches(scanned, expected)
+        if wrong:
+            found = ", ".join(f"{o.path}:{o.line} has {o.version}" for o in wrong)
+            raise ValueError(f"Version sources disagree with {expected}: {found}")
+        return scanned
+
+    @staticmethod
+    def update(
+        scanned: dict[Path, tuple[bytes, list[Occurrence]]], new_version: str
+    ) -> None:
+        """Replace the version text of every scanned occurrence.
+
+        Files are patched in place when the new version has the same length
+        as the old one, and otherwise rewritten from the scanned content
+        through an atomic temp file; either way no file is read again.
+        """
+        encoded = new_version.encode()
+        with Profiler.span("sources.update") as profile:
+            for path, (data, occurrences) in scanned.items():
+                if all(o.end - o.start == len(encoded) for o in occurrences):
+                    fd = os.open(path, os.O_WRONLY)
+                    try:
+                        for o in occurrences:
+                            profile.bytes_written += os.pwrite(fd, encoded, o.start)
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+                    continue
+                with AtomicFile(path) as fh:
+                    position = 0
+                    for o in occurrences:
+                        fh.write(data[position : o.start])
+                        fh.write(encoded)
+                        position = o.end
+                    fh.write(data[position:])
+                    profile.bytes_written += fh.tell()
+
+
+_JSON_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]]', re.DOTALL)
+
+
+def _json_top_level(data: bytes, match: re.Match) -> bool:
+    """Return whether a match starts at a key of the top-level JSON object.
+
+    Strings and brackets before the match are tokenized to find its depth,
+    so keys of nested objects and text inside string values are rejected.
+    """
+    depth = 0
+    for token in _JSON_TOKEN.finditer(data):
+        if token.start() >= match.start():
+            break
+        if token.end() > match.start():
+            return False  # the match is inside a string
+        if token.group() in (b"{", b"["):
+            depth += 1
+        elif token.group() in (b"}", b"]"):
+            depth -= 1
+    return depth == 1
+
+
+_VERSION = r"(?P<version>[0-9][^\"'\s,;#]*)"
+VersionSources.register(
+    "python",
+    rf"^__version__\s*(?::\s*str\s*)?=\s*[\"']{_VERSION}[\"']",
+    (".py",),
+)
+VersionSources.register("cfg", rf"^{{key}}\s*=\s*{_VERSION}", ("setup.cfg", ".cfg"))
+VersionSources.register(
+    "json",
+    rf"\"{{key}}\"\s*:\s*\"{_VERSION}\"",
+    (".json",),
+    _json_top_level,
+)
+VersionSources.register(
+    "yaml", rf"^{{key}}\s*:\s*[\"']?{_VERSION}", ("Chart.yaml", ".yaml", ".yml")
+)
+VersionSources.register(
+    "docker",
+    rf"^\s*(?:ARG|ENV|LABEL)\s+(?:[\w.-]+\.)?(?i:{{key}})\s*=\s*\"?{_VERSION}",
+    ("Dockerfile", ".dockerfile"),
+)
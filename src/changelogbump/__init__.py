@@ -1,8 +1,15 @@
 from pathlib import Path
 
-from changelogbump.PyProject import PyProject
-
 src: Path = Path(__file__).parent.parent
 header_path = Path(__file__).parent / "static/header_1.1.0.txt"
 
-pyproject = PyProject()
+
+def __getattr__(name: str):
+    # Built on first access so importing the package does not load tomllib
+    if name == "pyproject":
+        from changelogbump.PyProject import PyProject
+
+        global pyproject
+        pyproject = PyProject()
+        return pyproject
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
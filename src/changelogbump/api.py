@@ -0,0 +1,82 @@
+"""In-process library API for bumping a project's version.
+
+Unlike the Click commands in ``changelogbump.app``, nothing here prompts or
+styles output, so build tooling can call it directly and inspect the result.
+
+Typical usage example:
+
+    from changelogbump.api import bump
+
+    result = bump("packages/core", "minor", "New parser", {"added": ["TOML 1.1"]})
+    print(result.new_version)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from changelogbump.Changelog import Changelog
+from changelogbump.PyProject import PyProject
+from changelogbump.Transaction import BumpQueue
+
+PARTS = ("major", "minor", "patch")
+
+
+@dataclass
+class BumpResult:
+    """Outcome of bumping a single project.
+
+    Attributes:
+        root (Path): The project directory.
+        old_version (str): Version read from pyproject.toml before the bump.
+        new_version (str): Version written by the bump.
+        changelog (Path): The changelog that received the new section.
+        pyproject (Path): The pyproject.toml that received the new version.
+    """
+
+    root: Path
+    old_version: str
+    new_version: str
+    changelog: Path
+    pyproject: Path
+
+
+def bump(
+    path: Path | str = ".",
+    part: str = "patch",
+    summary: str | None = None,
+    sections: dict[str, list[str]] | None = None,
+    base: str | None = None,
+) -> BumpResult:
+    """Bump a project's version and prepend a changelog section, without prompts.
+
+    Args:
+        path (Path | str, optional): Directory holding pyproject.toml and
+            CHANGELOG.md. Defaults to the current directory.
+        part (str, optional): One of "major", "minor" or "patch". Defaults to
+            "patch".
+        summary (str | None, optional): Summary placed under the version
+            heading. Defaults to None.
+        sections (dict[str, list[str]] | None, optional): Changelog entries by
+            section name. Defaults to None, which writes no entries.
+        base (str | None, optional): Version to bump from instead of the one
+            in pyproject.toml when it is higher, such as the latest git tag.
+            Defaults to None.
+
+    Returns:
+        BumpResult: The old and new version and the files that were written.
+
+    Raises:
+        ValueError: If ``part`` is not one of major, minor or patch.
+    """
+    if part not in PARTS:
+        raise ValueError(f"part must be one of {list(PARTS)}, got {part!r}")
+    root = Path(path)
+    pyproject = PyProject.at(root / PyProject.path.name)
+    changelog = Changelog.at(root / Changelog.path.name)
+
+    old_version, new_version = BumpQueue(root, changelog, pyproject).submit(
+        part, summary, sections or {}, base
+    )
+    return BumpResult(root, old_version, new_version, changelog.path, pyproject.path)
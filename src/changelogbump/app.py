@@ -3,6 +3,16 @@ CHANGELOG initialization. The following commands are provided:
 
   - init: Initialize a fresh CHANGELOG.md file if one does not exist.
   - add: Increment the project's version and update the changelog accordingly.
+  - note: Record changelog entries for the next release as they are merged.
+  - show: Print the changelog section for one version or a range of versions.
+  - query: Find the latest, next free or in-range release versions.
+  - check: Validate changelogs and report machine-readable diagnostics.
+  - archive: Move old releases into per-major shard files.
+  - aggregate: Merge every package's changelog into one, ordered by date.
+  - serve: Answer version, show and bump requests from a warm daemon.
+  - export: Write the changelog as JSON or HTML.
+  - sync: Copy the version into every file listed under [tool.changelogbump].
+  - reconcile: Report drift between git tags, the changelog and pyproject.toml.
 
 Typical usage example:
 
@@ -10,18 +20,20 @@ Typical usage example:
 
 The CLI commands automatically handle errors and print
 concise messages via Click exceptions.
+
+Each command imports the modules it needs when it runs, so that ``--help``
+and light commands such as ``init`` do not pay for TOML parsing, git or
+network support they never use.
 """
 
 import os
+import sys
+from pathlib import Path
 
 import click
 from click import Command
 
-from changelogbump import header_path, pyproject
-from changelogbump.Changelog import Changelog
-from changelogbump.Metadata import _PyPiMetadata
-from changelogbump.PyProject import PyProject
-from changelogbump.Version import Version
+from changelogbump.Profiler import Profiler
 
 
 class OrderCommands(click.Group):
@@ -30,9 +42,41 @@ class OrderCommands(click.Group):
 
 
 @click.group(cls=OrderCommands)
-def cli() -> Command:
+@click.option(
+    "--profile",
+    type=click.Choice(["json", "table"]),
+    default=Profiler.env_format,
+    help="Print timed spans for each phase to stderr when the command ends "
+    "(default from CHANGELOGBUMP_PROFILE).",
+)
+@click.option(
+    "--profile-dump",
+    type=click.Path(dir_okay=False, path_type=Path),
+    envvar="CHANGELOGBUMP_PROFILE_DUMP",
+    help="Write cProfile statistics for the whole command to this file.",
+)
+@click.pass_context
+def cli(ctx: click.Context, profile, profile_dump) -> Command:
     """Click-based CLI for application version incrementing and CHANGELOG management."""
-    pass
+    if profile:
+        Profiler.start()
+
+        def report():
+            Profiler.stop()
+            Profiler.report(sys.stderr, profile)
+
+        ctx.call_on_close(report)
+    if profile_dump:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        def dump():
+            profiler.disable()
+            profiler.dump_stats(profile_dump)
+
+        ctx.call_on_close(dump)
 
 
 @cli.command()
@@ -40,8 +84,16 @@ def version():
     """Display the current changelogbump version"""
     import importlib.metadata
 
+    from changelogbump.Metadata import _PyPiMetadata
+    from changelogbump.Version import Version
+
     pkg_version = Version.from_string(importlib.metadata.version("changelogbump"))
-    remote_version = Version.from_string(_PyPiMetadata.version())
+    try:
+        remote_version = Version.from_string(_PyPiMetadata.version())
+    except (OSError, ValueError) as exc:
+        click.echo(click.style(f"Installed: {pkg_version}", bold=True))
+        click.echo(click.style(f"Available: unknown ({exc})", fg="yellow"))
+        return
     kwargs_a: dict = {"bold": True}
     kwargs_b: dict = {}
     if remote_version == pkg_version:
@@ -55,6 +107,9 @@ def version():
 @cli.command()
 def init():
     """Initialize a fresh CHANGELOG.md in the project root."""
+    from changelogbump import header_path
+    from changelogbump.Changelog import Changelog
+
     if os.path.isfile(Changelog.path):
         raise click.ClickException(
             click.style(f"{Changelog.path} already exists. ", fg="red")
@@ -76,25 +131,705 @@ def init():
 @click.option(
     "--summary", "-s", is_flag=False, help="Version descriptive summary header."
 )
-def add(major, minor, patch, summary):
+@click.option(
+    "--recursive",
+    "-r",
+    is_flag=True,
+    help="Bump every package below the current directory.",
+)
+@click.option(
+    "--manifest",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Bump the package directories listed in this file.",
+)
+@click.option(
+    "--jobs", "-j", type=click.IntRange(min=1), help="Parallel workers for batches."
+)
+@click.option(
+    "--entries-file",
+    "--entries",
+    "entries",
+    type=click.File("r"),
+    help="Read entries (JSON lines or '### Section' + '- item') instead of "
+    "prompting; '-' reads stdin.",
+)
+@click.option(
+    "--from-git",
+    is_flag=True,
+    help="Fill entries from Conventional Commits since the last release tag; "
+    "infers the part to bump when none is given.",
+)
+@click.option(
+    "--base-from-tags",
+    is_flag=True,
+    help="Bump from the highest version tag instead of pyproject.toml's version.",
+)
+@click.option(
+    "--changed",
+    is_flag=True,
+    help="In batch mode, bump only packages changed since --since; infers "
+    "each package's part when none is given.",
+)
+@click.option(
+    "--since",
+    metavar="REF",
+    help="Tag or commit --changed compares against. Defaults to the last release tag.",
+)
+def add(
+    major,
+    minor,
+    patch,
+    summary,
+    recursive,
+    manifest,
+    jobs,
+    entries,
+    from_git,
+    base_from_tags,
+    changed,
+    since,
+):
     """Increment version by one of the semantic parts (major|minor|patch)."""
+    with Profiler.span("add"):
+        _add(
+            major,
+            minor,
+            patch,
+            summary,
+            recursive,
+            manifest,
+            jobs,
+            entries,
+            from_git,
+            base_from_tags,
+            changed,
+            since,
+        )
+
+
+def _add(
+    major,
+    minor,
+    patch,
+    summary,
+    recursive,
+    manifest,
+    jobs,
+    entries,
+    from_git,
+    base_from_tags,
+    changed=False,
+    since=None,
+):
+    from changelogbump.Changelog import Changelog
+
     if sum([major, minor, patch]) > 1:
         raise click.ClickException(
             click.style(
                 "Only one of --major, --minor, or --patch is allowed.", fg="red"
             )
         )
-    if not any([major, minor, patch]):
+    if not any([major, minor, patch]) and not (from_git or changed):
         raise click.ClickException(
             click.style("Specify one of --major, --minor, or --patch.", fg="red")
         )
+    if from_git and (recursive or manifest):
+        raise click.ClickException(
+            click.style("--from-git cannot be combined with batch mode.", fg="red")
+        )
+    if base_from_tags and (recursive or manifest):
+        raise click.ClickException(
+            click.style(
+                "--base-from-tags cannot be combined with batch mode.", fg="red"
+            )
+        )
+    if (changed or since) and not (recursive or manifest):
+        raise click.ClickException(
+            click.style(
+                "--changed and --since need --recursive or --manifest.", fg="red"
+            )
+        )
+
+    sections = None
+    if entries is not None:
+        try:
+            with Profiler.span("entries.read"):
+                sections = Changelog.read_sections(entries)
+        except ValueError as exc:
+            raise click.ClickException(
+                click.style(f"Invalid entries in {entries.name}: {exc}", fg="red")
+            )
+
+    if from_git:
+        import subprocess
+
+        from changelogbump.Git import Git
+
+        try:
+            with Profiler.span("git.changes"):
+                tag, git_sections, part = Git.changes_since_release()
+        except (OSError, subprocess.CalledProcessError) as exc:
+            raise click.ClickException(
+                click.style(f"Could not read git history: {exc}", fg="red")
+            )
+        except ValueError as exc:
+            raise click.ClickException(click.style(str(exc), fg="red"))
+        click.echo(
+            "Reading commits since: "
+            + click.style(tag or "first commit", fg="bright_black")
+        )
+        if not any([major, minor, patch]):
+            major, minor, patch = (part == p for p in ("major", "minor", "patch"))
+        for key, value in (sections or {}).items():
+            git_sections[key].extend(value)
+        sections = git_sections
+
+    if recursive or manifest:
+        _add_batch(
+            major,
+            minor,
+            patch,
+            summary,
+            recursive,
+            manifest,
+            jobs,
+            sections,
+            changed or since is not None,
+            since,
+        )
+        return
+
+    from changelogbump import pyproject
+    from changelogbump.Notes import Notes
+    from changelogbump.PyProject import PyProject
+    from changelogbump.Transaction import BumpQueue
+    from changelogbump.Version import Version
+
+    base = None
+    if base_from_tags:
+        import subprocess
+
+        from changelogbump.Reconcile import Drift
 
-    _version = Version.from_string(pyproject.current_version)
+        try:
+            with Profiler.span("git.tags"):
+                drift = Drift.measure(Changelog, PyProject)
+        except (OSError, subprocess.CalledProcessError) as exc:
+            raise click.ClickException(
+                click.style(f"Could not read git tags: {exc}", fg="red")
+            )
+        if drift.tag is None:
+            raise click.ClickException(click.style("No version tags found.", fg="red"))
+        base = drift.tag
+        click.echo("Latest tag: " + click.style(drift.tag_name, fg="bright_black"))
+        # Never write a release below one pyproject.toml or the changelog has
+        ahead = max(
+            (v for v in (drift.pyproject, drift.changelog) if v),
+            key=Version.from_string,
+            default=base,
+        )
+        if Version.from_string(ahead) > Version.from_string(base):
+            click.echo(
+                click.style(
+                    f"Warning: {drift.tag_name} is behind {ahead}; "
+                    f"bumping from {ahead}",
+                    fg="yellow",
+                )
+            )
+            base = ahead
+        _version = Version.from_string(base)
+    else:
+        with Profiler.span("pyproject.read"):
+            _version = Version.from_string(pyproject.current_version)
     click.echo("Current version: " + click.style(_version.current, fg="bright_black"))
-    _version.bump(major, minor, patch)
+    _version = _version.bump(major, minor, patch)
     click.echo("Incrementing to: " + click.style(_version.current, fg="blue"))
-    Changelog.update(_version.current, summary)
-    PyProject.update(_version.current)
+    if sections is None and Notes.pending(Changelog.path):
+        click.echo("Including entries recorded with 'changelogbump note'")
+        sections = {}
+    if sections is None:
+        with Profiler.span("changelog.prompt"):
+            sections = Changelog.generate_sections()
+    # Prompts are answered before queueing, so the project lock is never
+    # held while waiting on the user
+    part = "major" if major else "minor" if minor else "patch"
+    queue = BumpQueue(Changelog.path.absolute().parent, Changelog, PyProject)
+    _, written = queue.submit(part, summary, sections, base)
+    if written != _version.current:
+        click.echo(
+            "Coalesced with concurrent bumps into: " + click.style(written, fg="blue")
+        )
+
+
+@cli.command()
+@click.option("--added", "-a", multiple=True, help="Entry for the Added section.")
+@click.option("--changed", "-c", multiple=True, help="Entry for the Changed section.")
+@click.option("--removed", "-r", multiple=True, help="Entry for the Removed section.")
+@click.option(
+    "--render",
+    is_flag=True,
+    help="Also rewrite the '## [Unreleased]' section to show every pending entry.",
+)
+def note(added, changed, removed, render):
+    """Record entries for the next release without touching the changelog."""
+    from changelogbump.Changelog import Changelog
+    from changelogbump.Notes import Notes
+
+    if not (added or changed or removed or render):
+        raise click.ClickException(
+            click.style(
+                "Specify at least one of --added, --changed, or --removed.", fg="red"
+            )
+        )
+    try:
+        for section, entries in zip(Changelog.section_names, (added, changed, removed)):
+            if entries:
+                Notes.append(Changelog.path, section, list(entries))
+    except ValueError as exc:
+        raise click.ClickException(click.style(f"Invalid entry: {exc}", fg="red"))
+    count = len(added) + len(changed) + len(removed)
+    if count:
+        click.echo(
+            f"Noted {count} {'entry' if count == 1 else 'entries'} for the next release"
+        )
+    if render:
+        from changelogbump.Transaction import Transaction
+
+        try:
+            # Under the project lock, so a concurrent bump is neither lost nor
+            # rendered from notes it has already consumed
+            root = Changelog.path.absolute().parent
+            with Transaction(root, replaced=[Changelog.path]):
+                Changelog.render_unreleased(Notes.read(Changelog.path))
+        except KeyError as exc:
+            raise click.ClickException(click.style(exc.args[0], fg="red"))
+        click.echo(
+            "Rendered pending entries under " + click.style("[Unreleased]", bold=True)
+        )
+
+
+def _add_batch(
+    major,
+    minor,
+    patch,
+    summary,
+    recursive,
+    manifest,
+    jobs,
+    sections,
+    changed=False,
+    since=None,
+):
+    from changelogbump.Changelog import Changelog
+    from changelogbump.Monorepo import BatchError, Monorepo, PackageChange
+
+    packages = []
+    if manifest:
+        packages.extend(Monorepo.read_manifest(manifest))
+    if recursive:
+        packages.extend(Monorepo.discover(Path.cwd()))
+    # A package listed in the manifest and also discovered is bumped once
+    packages = list(dict.fromkeys(path.resolve() for path in packages))
+    if not packages:
+        raise click.ClickException(click.style("No packages found.", fg="red"))
+
+    part = "major" if major else "minor" if minor else "patch"
+    changes = None
+    if changed:
+        import subprocess
+
+        from changelogbump.Git import Git
+
+        try:
+            with Profiler.span("git.changed"):
+                since = since or Git.last_release_tag()
+                if since is None:
+                    raise click.ClickException(
+                        click.style("No release tag found; pass --since REF.", fg="red")
+                    )
+                changes = Monorepo.changed_packages(packages, since)
+        except (OSError, subprocess.CalledProcessError) as exc:
+            raise click.ClickException(
+                click.style(f"Could not read git history: {exc}", fg="red")
+            )
+        except ValueError as exc:
+            raise click.ClickException(click.style(str(exc), fg="red"))
+        click.echo("Comparing against: " + click.style(since, fg="bright_black"))
+        if len(changes) < len(packages):
+            click.echo(f"Skipping {len(packages) - len(changes)} unchanged packages")
+        if not changes:
+            return
+        if any([major, minor, patch]):
+            changes = [PackageChange(c.root, part, c.digest) for c in changes]
+    else:
+        changes = [PackageChange(root, part, "") for root in packages]
+
+    click.echo(f"Bumping {len(changes)} packages")
+    if sections is None:
+        sections = Changelog.generate_sections()
+    # One batch per part, biggest first; same-part packages still run in parallel
+    groups: dict[str, list[PackageChange]] = {}
+    for change in changes:
+        groups.setdefault(change.part, []).append(change)
+    bumped = []
+    try:
+        for part in sorted(groups, key=("major", "minor", "patch").index):
+            by_root = {change.root: change for change in groups[part]}
+            for result in Monorepo.bump_all(
+                list(by_root), part, summary, sections, jobs
+            ):
+                bumped.append(by_root[result.root])
+                click.echo(
+                    f"{result.root}: "
+                    + click.style(result.old_version, fg="bright_black")
+                    + " -> "
+                    + click.style(result.new_version, fg="blue")
+                )
+    except BatchError as exc:
+        raise click.ClickException(
+            click.style(f"Stopped after failure in {exc}", fg="red")
+        )
+    finally:
+        if changed:
+            Monorepo.remember_released(bumped)
+
+
+@cli.command()
+@click.argument("spec")
+def show(spec):
+    """Print the changelog notes for a version or range (e.g. 1.2.0..1.5.0)."""
+    from changelogbump.Changelog import Changelog
+
+    try:
+        releases = Changelog.releases(spec)
+    except ValueError:
+        raise click.ClickException(
+            click.style(f"Invalid version or range: {spec}", fg="red")
+        )
+    if not releases:
+        raise click.ClickException(
+            click.style(f"No changelog section found for {spec}.", fg="red")
+        )
+    with click.open_file("-", "wb") as out:
+        Changelog.stream(releases, out)
+
+
+@cli.command()
+@click.option(
+    "--changelog",
+    "-f",
+    "changelogs",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Changelog to read; repeat to query several packages at once "
+    "(default: CHANGELOG.md).",
+)
+@click.option("--below", help="Latest release strictly below this version, e.g. 2.0.")
+@click.option(
+    "--next",
+    "next_part",
+    type=click.Choice(["major", "minor", "patch"]),
+    help="Next unreleased version for this part after the latest release.",
+)
+@click.option(
+    "--range", "span", help="All releases in an inclusive range, e.g. 1.2..1.5."
+)
+def query(changelogs, below, next_part, span):
+    """Answer version questions over every release heading (default: latest)."""
+    from changelogbump.Changelog import Changelog
+    from changelogbump.VersionIndex import VersionIndex
+
+    if sum(x is not None for x in (below, next_part, span)) > 1:
+        raise click.ClickException(
+            click.style("Only one of --below, --next, or --range is allowed.", fg="red")
+        )
+    index = VersionIndex.from_changelogs(changelogs or [Changelog.path])
+    try:
+        if span is not None:
+            lo, _, hi = span.partition("..")
+            lo_v = VersionIndex.parse_bound(lo) if lo else None
+            hi_v = VersionIndex.parse_bound(hi) if hi else None
+            for found in index.between(lo_v, hi_v):
+                click.echo(found.current)
+            return
+        if next_part is not None:
+            click.echo(index.next_free(next_part).current)
+            return
+        found = index.latest(VersionIndex.parse_bound(below) if below else None)
+    except ValueError as exc:
+        raise click.ClickException(click.style(str(exc), fg="red"))
+    if found is None:
+        raise click.ClickException(click.style("No matching release.", fg="red"))
+    click.echo(found.current)
+
+
+@cli.command()
+@click.argument(
+    "paths", nargs=-1, type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--recursive",
+    "-r",
+    is_flag=True,
+    help="Check the changelog of every package below the current directory.",
+)
+@click.option(
+    "--jobs", "-j", type=click.IntRange(min=1), help="Parallel worker processes."
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["text", "json"]),
+    default="text",
+    help="Print diagnostics as text or as JSON lines.",
+)
+def check(paths, recursive, jobs, fmt):
+    """Validate changelogs against the Keep a Changelog layout (default: CHANGELOG.md)."""
+    import json
+
+    from changelogbump.Changelog import Changelog
+    from changelogbump.Validator import Validator
+
+    paths = list(paths)
+    if recursive:
+        from changelogbump.Monorepo import Monorepo
+
+        paths += [root / Changelog.path.name for root in Monorepo.discover(Path.cwd())]
+    if not paths:
+        paths = [Changelog.path]
+    try:
+        diagnostics = Validator.check_all(paths, jobs)
+    except OSError as exc:
+        raise click.ClickException(click.style(str(exc), fg="red"))
+    for diagnostic in diagnostics:
+        if fmt == "json":
+            click.echo(json.dumps(diagnostic.as_dict()))
+        else:
+            color = "red" if diagnostic.severity == "error" else "yellow"
+            click.echo(click.style(str(diagnostic), fg=color))
+    if any(d.severity == "error" for d in diagnostics):
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.option(
+    "--keep", type=click.IntRange(min=0), help="Number of releases to keep in place."
+)
+@click.option(
+    "--older-than",
+    "days",
+    type=click.IntRange(min=0),
+    help="Archive releases dated more than this many days ago.",
+)
+@click.option(
+    "--below-major",
+    type=click.IntRange(min=0),
+    help="Archive releases whose major version is below this one.",
+)
+def archive(keep, days, below_major):
+    """Move old releases out of CHANGELOG.md into changelog/<major>.x.md."""
+    from changelogbump.Archive import Archive
+    from changelogbump.Changelog import Changelog
+
+    if all(x is None for x in (keep, days, below_major)):
+        raise click.ClickException(
+            click.style(
+                "One of --keep, --older-than, or --below-major is required.", fg="red"
+            )
+        )
+    try:
+        moved = Archive.archive(Changelog.path, keep, days, below_major)
+    except OSError as exc:
+        raise click.ClickException(click.style(str(exc), fg="red"))
+    if not moved:
+        click.echo("Nothing to archive.")
+    for name, count in moved.items():
+        click.echo(f"Archived {count} release(s) into {Archive.dir_name}/{name}")
+
+
+@cli.command()
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default="CHANGELOG.md",
+    show_default=True,
+    help="Aggregate changelog to write.",
+)
+@click.option(
+    "--manifest",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="File listing package directories, one per line (default: discover).",
+)
+@click.option("--full", is_flag=True, help="Merge every changelog again.")
+def aggregate(output, manifest, full):
+    """Merge every package's changelog into one, newest release first."""
+    from changelogbump.Aggregate import Aggregate
+    from changelogbump.Changelog import Changelog
+    from changelogbump.Monorepo import Monorepo
+
+    roots = (
+        Monorepo.read_manifest(manifest) if manifest else Monorepo.discover(Path.cwd())
+    )
+    packages = {}
+    for root in roots:
+        changelog = root / Changelog.path.name
+        if changelog.absolute() != output.absolute():
+            name = os.path.relpath(root, Path.cwd()).replace(os.sep, "/")
+            packages[name] = changelog
+    if not packages:
+        raise click.ClickException(click.style("No packages found.", fg="red"))
+    try:
+        mode, count = Aggregate(output, packages).refresh(full)
+    except OSError as exc:
+        raise click.ClickException(click.style(str(exc), fg="red"))
+    if mode == "unchanged":
+        click.echo(f"{output} is up to date.")
+    elif mode == "incremental":
+        click.echo(f"Added {count} new section(s) to {output}")
+    else:
+        click.echo(
+            f"Merged {count} section(s) from {len(packages)} changelogs into {output}"
+        )
+
+
+@cli.command()
+def serve():
+    """Serve version, show and bump requests on .changelogbump/serve.sock."""
+    from changelogbump.Daemon import Daemon, DaemonError
+
+    try:
+        with Daemon(Path.cwd()) as daemon:
+            click.echo(f"Listening on {daemon.path}")
+            try:
+                daemon.serve_forever()
+            except KeyboardInterrupt:
+                pass
+    except (DaemonError, OSError) as exc:
+        raise click.ClickException(click.style(str(exc), fg="red"))
+
+
+@cli.command()
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["json", "html"]),
+    default="json",
+    show_default=True,
+    help="Output format.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="File to write (default: stdout).",
+)
+def export(fmt, output):
+    """Export every release, archived ones included, as JSON or HTML."""
+    from changelogbump.AtomicFile import AtomicFile
+    from changelogbump.Changelog import Changelog
+    from changelogbump.Export import Export
+
+    exporter = Export(Changelog.path, fmt)
+    try:
+        if output is None:
+            with click.open_file("-", "wb") as out:
+                exporter.write(out)
+        else:
+            with AtomicFile(output) as out:
+                count, rendered = exporter.write(out)
+            click.echo(f"Exported {count} release(s) to {output} ({rendered} rendered)")
+    except OSError as exc:
+        raise click.ClickException(click.style(str(exc), fg="red"))
+
+
+@cli.command()
+@click.option(
+    "--check", is_flag=True, help="Only report files that differ; exit 1 if any do."
+)
+@click.option(
+    "--jobs", "-j", type=click.IntRange(min=1), help="Parallel reader threads."
+)
+def sync(check, jobs):
+    """Copy pyproject.toml's version into the configured version-files."""
+    from changelogbump.PyProject import PyProject
+    from changelogbump.Transaction import Transaction
+    from changelogbump.VersionSources import VersionSources
+
+    try:
+        sources = VersionSources.from_pyproject(PyProject)
+        if not sources:
+            click.echo("No version-files configured under [tool.changelogbump].")
+            return
+        root = PyProject.path.absolute().parent
+        # The lock keeps a concurrent bump from changing the version mid-sync
+        with Transaction(root, patched=[] if check else sources.paths):
+            version = PyProject().current_version
+            scanned = sources.scan(jobs)
+            wrong = VersionSources.mismatches(scanned, version)
+            if not check:
+                stale = {o.path for o in wrong}
+                VersionSources.update(
+                    {path: scanned[path] for path in scanned if path in stale}, version
+                )
+        for occurrence in wrong:
+            click.echo(
+                f"{occurrence.path}:{occurrence.line}: "
+                + click.style(occurrence.version, fg="red")
+                + f" != {version}"
+            )
+    except (OSError, KeyError, ValueError) as exc:
+        raise click.ClickException(click.style(str(exc), fg="red"))
+    if check and wrong:
+        raise SystemExit(1)
+    total = sum(len(occurrences) for _, occurrences in scanned.values())
+    if check:
+        click.echo(f"All {total} version string(s) match {version}")
+    else:
+        click.echo(f"Updated {len(wrong)} of {total} version string(s) to {version}")
+
+
+@cli.command()
+def reconcile():
+    """Report where git tags, the changelog and pyproject.toml disagree."""
+    import subprocess
+
+    from changelogbump.Changelog import Changelog
+    from changelogbump.PyProject import PyProject
+    from changelogbump.Reconcile import Drift
+
+    try:
+        drift = Drift.measure(Changelog, PyProject)
+    except (OSError, subprocess.CalledProcessError) as exc:
+        raise click.ClickException(
+            click.style(f"Could not read git tags: {exc}", fg="red")
+        )
+    color = "green" if drift.in_sync else "red"
+    tag = f"{drift.tag} ({drift.tag_name})" if drift.tag else None
+    for label, value in (
+        (PyProject.path.name, drift.pyproject),
+        (Changelog.path.name, drift.changelog),
+        ("git tags", tag),
+    ):
+        click.echo(f"{label + ':':<16}" + click.style(value or "none", fg=color))
+
+    def listing(versions: list[str], limit: int = 10) -> str:
+        more = len(versions) - limit
+        return ", ".join(versions[:limit]) + (f" and {more} more" if more > 0 else "")
+
+    if drift.untagged:
+        click.echo(
+            click.style(f"Untagged releases: {listing(drift.untagged)}", fg="yellow")
+        )
+    if drift.undocumented:
+        click.echo(
+            click.style(
+                f"Tags missing from the changelog: {listing(drift.undocumented)}",
+                fg="yellow",
+            )
+        )
+    if not drift.in_sync:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
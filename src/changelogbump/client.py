@@ -0,0 +1,107 @@
+"""Thin client for a ``changelogbump serve`` daemon, for editors and git hooks.
+
+Requests are sent as one JSON line over the project's Unix socket and
+answered the same way. When no daemon is listening, the request is handled
+in this process instead, so callers never need to know whether one runs.
+Only the standard library is imported until that fallback is needed, which
+keeps each call far cheaper than starting the Click CLI.
+
+Typical usage example:
+
+    changelogbump-client version
+    changelogbump-client show 1.2.0
+    changelogbump-client bump minor --summary "New parser"
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+socket_name = os.path.join(".changelogbump", "serve.sock")
+
+
+class ClientError(Exception):
+    """Raised when the daemon or the in-process fallback rejects a request."""
+
+
+def socket_path(root: Path | str) -> Path:
+    """Return the socket a daemon for the project at ``root`` listens on."""
+    return Path(root) / socket_name
+
+
+def request(root: Path | str, op: str, **params):
+    """Send one request to the project's daemon, or handle it in-process.
+
+    Args:
+        root (Path | str): The project directory.
+        op (str): "version", "show" or "bump".
+        **params: Arguments of the operation, e.g. ``spec`` for "show".
+
+    Returns:
+        The operation's result.
+
+    Raises:
+        ClientError: If the request failed.
+    """
+    message = {"op": op, **params}
+    response = None
+    if hasattr(socket, "AF_UNIX"):
+        try:
+            response = _send(socket_path(root), message)
+        except (FileNotFoundError, ConnectionRefusedError):
+            pass  # no daemon, or a socket left behind by one that died
+    if response is None:
+        from changelogbump.Daemon import Service
+
+        response = Service(root).handle(message)
+    if "error" in response:
+        raise ClientError(response["error"])
+    return response["result"]
+
+
+def _send(path: Path, message: dict) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path))
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        with sock.makefile("rb") as fh:
+            line = fh.readline()
+    if not line:
+        raise ClientError("daemon closed the connection")
+    return json.loads(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run one request from the command line and print its result."""
+    args = sys.argv[1:] if argv is None else argv
+    usage = (
+        "usage: changelogbump-client version | show SPEC | bump PART [--summary TEXT]"
+    )
+    try:
+        if args == ["version"]:
+            print(request(".", "version"))
+        elif len(args) == 2 and args[0] == "show":
+            sys.stdout.write(request(".", "show", spec=args[1]))
+        elif len(args) in (2, 4) and args[0] == "bump":
+            summary = None
+            if len(args) == 4:
+                if args[2] != "--summary":
+                    print(usage, file=sys.stderr)
+                    return 2
+                summary = args[3]
+            result = request(".", "bump", part=args[1], summary=summary)
+            print(f"{result['old']} -> {result['new']}")
+        else:
+            print(usage, file=sys.stderr)
+            return 2
+    except ClientError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
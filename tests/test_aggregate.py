@@ -0,0 +1,156 @@
+from pathlib import Path
+
+import pytest
+
+from changelogbump.Aggregate import Aggregate
+
+
+def write(path: Path, *releases: tuple[str, str]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    body = "".join(
+        f"## [{v}] - {d}\n\n- {path.parent.name} {v}\n\n" for v, d in releases
+    )
+    path.write_text("# Changelog\n\n" + body + "## [Unreleased]\n")
+    return path
+
+
+def headings(path: Path) -> list[str]:
+    return [line for line in path.read_text().splitlines() if line.startswith("## ")]
+
+
+class TestAggregate:
+    @pytest.fixture
+    def aggregate(self, tmp_path) -> Aggregate:
+        packages = {
+            "core": write(
+                tmp_path / "core" / "CHANGELOG.md",
+                ("1.1.0", "2025-08-05"),
+                ("1.0.0", "2025-08-01"),
+            ),
+            "cli": write(
+                tmp_path / "cli" / "CHANGELOG.md",
+                ("0.2.0", "2025-08-03"),
+                ("0.1.0", "2025-08-01"),
+            ),
+        }
+        return Aggregate(tmp_path / "CHANGELOG.md", packages)
+
+    def test_sections_are_lazy_and_skip_unreleased(self, aggregate):
+        """Ensure sections are yielded one at a time, newest first, without Unreleased."""
+        stream = Aggregate.sections("core", aggregate.packages["core"])
+        first = next(stream)
+        assert (first.version, first.date, first.body) == (
+            "1.1.0",
+            "2025-08-05",
+            b"\n- core 1.1.0\n\n",
+        )
+        assert [s.version for s in stream] == ["1.0.0"]
+
+    def test_merge_sorts_changelogs_out_of_date_order(self, tmp_path):
+        """Ensure a changelog whose dates are not newest first is still merged by date."""
+        packages = {
+            "a": write(
+                tmp_path / "a" / "CHANGELOG.md",
+                ("2.0.0", "2025-01-01"),
+                ("1.0.1", "2025-06-01"),
+            ),
+            "b": write(tmp_path / "b" / "CHANGELOG.md", ("1.0.0", "2025-03-01")),
+        }
+        aggregate = Aggregate(tmp_path / "CHANGELOG.md", packages)
+        assert not Aggregate.in_date_order(packages["a"])
+
+        assert aggregate.refresh() == ("full", 3)
+        assert headings(aggregate.output) == [
+            "## [a 1.0.1] - 2025-06-01",
+            "## [b 1.0.0] - 2025-03-01",
+            "## [a 2.0.0] - 2025-01-01",
+        ]
+
+    def test_full_merge_interleaves_by_date(self, aggregate):
+        """
+        Ensure releases are ordered by date, ties in package order, names
+        prefixed, and that only the output's state directory is written.
+        """
+        assert aggregate.refresh() == ("full", 4)
+
+        assert headings(aggregate.output) == [
+            "## [core 1.1.0] - 2025-08-05",
+            "## [cli 0.2.0] - 2025-08-03",
+            "## [core 1.0.0] - 2025-08-01",
+            "## [cli 0.1.0] - 2025-08-01",
+        ]
+        assert (
+            "## [cli 0.2.0] - 2025-08-03\n\n- cli 0.2.0\n\n"
+            in aggregate.output.read_text()
+        )
+        assert aggregate.state_path.parent.name == ".changelogbump"
+        assert not (aggregate.packages["core"].parent / ".changelogbump").exists()
+
+    def test_refresh_reads_only_what_changed(self, aggregate, monkeypatch):
+        """
+        Ensure an unchanged tree is left alone and a bump is prepended without
+        reading the other packages.
+        """
+        aggregate.refresh()
+        assert aggregate.refresh() == ("unchanged", 0)
+
+        write(
+            aggregate.packages["cli"],
+            ("0.3.0", "2025-08-06"),
+            ("0.2.0", "2025-08-03"),
+            ("0.1.0", "2025-08-01"),
+        )
+        read = []
+        original = Aggregate.sections
+        monkeypatch.setattr(
+            Aggregate,
+            "sections",
+            staticmethod(lambda name, path: read.append(name) or original(name, path)),
+        )
+        assert aggregate.refresh() == ("incremental", 1)
+        assert read == ["cli"]
+        assert headings(aggregate.output)[:2] == [
+            "## [cli 0.3.0] - 2025-08-06",
+            "## [core 1.1.0] - 2025-08-05",
+        ]
+        assert aggregate.refresh() == ("unchanged", 0)
+
+    def test_edits_and_out_of_order_releases_force_full_merge(self, aggregate):
+        """Ensure a change that cannot be prepended rebuilds the whole output."""
+        aggregate.refresh()
+        path = aggregate.packages["core"]
+        path.write_text(
+            path.read_text().replace("- core 1.0.0", "- core 1.0.0 (fixed)")
+        )
+        assert aggregate.refresh() == ("full", 4)
+
+        write(
+            aggregate.packages["cli"],
+            ("0.2.1", "2025-08-04"),
+            ("0.2.0", "2025-08-03"),
+            ("0.1.0", "2025-08-01"),
+        )
+        assert aggregate.refresh() == ("full", 5)
+        assert headings(aggregate.output)[1] == "## [cli 0.2.1] - 2025-08-04"
+
+        aggregate.output.write_text("edited by hand")
+        assert aggregate.refresh() == ("full", 5)
+
+    def test_reordered_releases_force_full_merge(self, aggregate):
+        """Ensure releases swapped below the newest one are not taken as unchanged."""
+        path = aggregate.packages["core"]
+        write(
+            path,
+            ("1.2.0", "2025-08-06"),
+            ("1.1.0", "2025-08-05"),
+            ("1.0.0", "2025-08-01"),
+        )
+        aggregate.refresh()
+
+        write(
+            path,
+            ("1.2.0", "2025-08-06"),
+            ("1.0.0", "2025-08-01"),
+            ("1.1.0", "2025-08-05"),
+        )
+        assert aggregate.refresh() == ("full", 5)
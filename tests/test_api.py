@@ -0,0 +1,42 @@
+import pytest
+
+from changelogbump.api import bump
+
+
+class TestApi:
+    @pytest.fixture
+    def project(self, tmp_path):
+        (tmp_path / "pyproject.toml").write_text(
+            '[project]\nname = "x"\nversion = "1.4.9"  # keep me\n'
+        )
+        (tmp_path / "CHANGELOG.md").write_text(
+            "# Changelog\n\n## [1.4.9] - 2025-08-01\n\n- Old\n"
+        )
+        yield tmp_path
+
+    def test_bump_returns_result_without_prompting(self, project, monkeypatch):
+        """
+        Ensure bump() writes both files and reports the versions without calling click.prompt.
+        """
+
+        def fail(*_, **__):
+            raise AssertionError("bump() must not prompt")
+
+        monkeypatch.setattr("click.prompt", fail)
+
+        result = bump(project, "minor", "Summary", {"added": ["New thing"]})
+
+        assert (result.old_version, result.new_version) == ("1.4.9", "1.5.0")
+        assert result.changelog == project / "CHANGELOG.md"
+        assert 'version = "1.5.0"  # keep me' in result.pyproject.read_text()
+        changelog = result.changelog.read_text()
+        assert changelog.index("## [1.5.0]") < changelog.index("## [1.4.9]")
+        assert "Summary\n\n### Added\n\n- New thing\n" in changelog
+
+    def test_bump_rejects_unknown_part(self, project):
+        """
+        Ensure bump() validates the requested part before touching any file.
+        """
+        with pytest.raises(ValueError, match="part must be one of"):
+            bump(project, "micro")
+        assert 'version = "1.4.9"' in (project / "pyproject.toml").read_text()
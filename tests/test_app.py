@@ -1,4 +1,6 @@
+import json
 import os
+import pstats
 import subprocess
 import sys
 from pathlib import Path
@@ -10,8 +12,8 @@ from click.testing import CliRunner
 import changelogbump
 import src.changelogbump.PyProject
 from changelogbump import pyproject
+from changelogbump.app import OrderCommands, cli
 from changelogbump.Changelog import Changelog
-from changelogbump.app import cli, OrderCommands
 
 
 class TestApp:
@@ -26,7 +28,21 @@ class TestApp:
             order_group.add_command(cmd, name)
 
         commands_list = order_group.list_commands(...)
-        assert commands_list == ["version", "init", "add"]
+        assert commands_list == [
+            "version",
+            "init",
+            "add",
+            "note",
+            "show",
+            "query",
+            "check",
+            "archive",
+            "aggregate",
+            "serve",
+            "export",
+            "sync",
+            "reconcile",
+        ]
 
     def test_version_command(self):
         """Ensure the 'version' command displays a package version."""
@@ -149,6 +165,29 @@ class TestApp:
         # Validate the updated pyproject version
         assert pyproject.current_version == expected
 
+    def test_add_with_profile(self, temp_files, tmp_path, monkeypatch):
+        """Ensure '--profile json' reports each phase on stderr and '--profile-dump' writes stats."""
+        monkeypatch.setattr("click.prompt", MagicMock(return_value=""))
+        dump = tmp_path / "add.prof"
+
+        result = CliRunner().invoke(
+            cli, ["--profile", "json", "--profile-dump", str(dump), "add", "--patch"]
+        )
+
+        assert result.exit_code == 0
+        spans = {
+            json.loads(line)["span"]: json.loads(line)
+            for line in result.stderr.splitlines()
+        }
+        assert {
+            "add",
+            "changelog.update",
+            "changelog.insert",
+            "pyproject.update",
+        } <= set(spans)
+        assert spans["changelog.insert"]["bytes_written"] > 0
+        assert pstats.Stats(str(dump)).total_calls > 0
+
     def test_main_subprocess(self):
         """Launch the script as if run from the command line"""
         script: Path = changelogbump.src / "changelogbump/app.py"
@@ -156,3 +195,420 @@ class TestApp:
             [sys.executable, script, "--help"], capture_output=True, text=True
         )
         assert "Click-based CLI for application version incrementing" in result.stdout
+
+    def test_show_prints_requested_sections(self, tmp_path, monkeypatch):
+        """Ensure 'show' prints only the selected sections, and fails on unknown versions."""
+        changelog_file = tmp_path / "CHANGELOG.md"
+        changelog_file.write_text(
+            "# Changelog\n\n"
+            "## [1.1.0] - 2025-08-03\n\n- C\n\n"
+            "## [1.0.1] - 2025-08-02\n\n- B\n\n"
+            "## [1.0.0] - 2025-08-01\n\n- A\n\n"
+            "## [Unreleased]"
+        )
+        monkeypatch.setattr(Changelog, "path", changelog_file)
+        runner = CliRunner()
+
+        result = runner.invoke(cli, ["show", "1.0.1"])
+        assert result.exit_code == 0
+        assert result.output == "## [1.0.1] - 2025-08-02\n\n- B\n\n"
+
+        result = runner.invoke(cli, ["show", "1.0.1.."])
+        assert result.exit_code == 0
+        assert "- C" in result.output and "- B" in result.output
+        assert "- A" not in result.output
+
+        result = runner.invoke(cli, ["show", "2.0.0"])
+        assert result.exit_code != 0
+        assert "No changelog section found for 2.0.0." in result.output
+
+    def test_query(self, tmp_path, monkeypatch):
+        """Ensure 'query' answers latest, below, next and range questions."""
+        changelog_file = tmp_path / "CHANGELOG.md"
+        changelog_file.write_text(
+            "# Changelog\n\n"
+            "## [2.0.0] - 2025-08-03\n\n- C\n\n"
+            "## [1.1.0] - 2025-08-02\n\n- B\n\n"
+            "## [1.0.0] - 2025-08-01\n\n- A\n\n"
+            "## [Unreleased]"
+        )
+        monkeypatch.setattr(Changelog, "path", changelog_file)
+        runner = CliRunner()
+
+        assert runner.invoke(cli, ["query"]).output == "2.0.0\n"
+        assert runner.invoke(cli, ["query", "--below", "2"]).output == "1.1.0\n"
+        assert runner.invoke(cli, ["query", "--next", "minor"]).output == "2.1.0\n"
+        result = runner.invoke(cli, ["query", "--range", "1.0..1.1"])
+        assert result.output == "1.0.0\n1.1.0\n"
+
+        result = runner.invoke(cli, ["query", "--below", "1.0"])
+        assert result.exit_code != 0
+        assert "No matching release." in result.output
+
+    def test_note_then_add(self, temp_files, monkeypatch):
+        """Ensure 'note' records entries that the next 'add' writes without prompting."""
+        monkeypatch.setattr("click.prompt", MagicMock(side_effect=AssertionError))
+        Changelog.path.write_text("# Changelog\n\n## [Unreleased]")
+        runner = CliRunner()
+
+        result = runner.invoke(cli, ["note", "--added", "Parser", "-c", "Speed"])
+        assert result.exit_code == 0
+        assert "Noted 2 entries" in result.output
+        assert Changelog.path.read_text() == "# Changelog\n\n## [Unreleased]"
+
+        result = runner.invoke(cli, ["note", "--removed", "Legacy", "--render"])
+        assert result.exit_code == 0
+        assert "- Legacy" in Changelog.path.read_text()
+
+        result = runner.invoke(cli, ["add", "--minor"])
+        assert result.exit_code == 0
+        text = Changelog.path.read_text()
+        assert text.startswith("# Changelog\n\n## [Unreleased]\n\n## [0.2.0]")
+        assert "### Added\n\n- Parser\n\n### Changed\n\n- Speed\n" in text
+        assert text.count("- Legacy") == 1
+        assert text.count("## [Unreleased]") == 1
+
+        assert runner.invoke(cli, ["note"]).exit_code != 0
+
+    def test_note_render_holds_project_lock(self, temp_files, monkeypatch):
+        """Ensure 'note --render' rewrites the changelog with the project locked."""
+        from changelogbump.Transaction import Transaction
+
+        fcntl = pytest.importorskip("fcntl")
+        Changelog.path.write_text("# Changelog\n\n## [Unreleased]\n")
+        render = Changelog.render_unreleased.__func__
+        held = []
+
+        def locked_render(cls, sections):
+            lock = Transaction.lock_path(Changelog.path.parent)
+            with lock.open("a+b") as fh:
+                try:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    held.append(True)
+                else:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            return render(cls, sections)
+
+        monkeypatch.setattr(Changelog, "render_unreleased", classmethod(locked_render))
+
+        result = CliRunner().invoke(cli, ["note", "--added", "Parser", "--render"])
+
+        assert result.exit_code == 0
+        assert held == [True]
+        assert "- Parser" in Changelog.path.read_text()
+
+    def test_check(self, tmp_path, monkeypatch):
+        """Ensure 'check' prints JSON diagnostics and fails only on errors."""
+        monkeypatch.chdir(tmp_path)
+        result = CliRunner().invoke(cli, ["init"])
+        assert result.exit_code == 0
+        assert CliRunner().invoke(cli, ["check", "CHANGELOG.md"]).exit_code == 0
+
+        path = tmp_path / "CHANGELOG.md"
+        path.write_text(path.read_text() + "\n## [1.0.0] - 2025-13-01\n")
+        result = CliRunner().invoke(cli, ["check", "--format", "json", str(path)])
+
+        assert result.exit_code == 1
+        assert json.loads(result.output) == {
+            "path": str(path),
+            "line": 9,
+            "code": "CB003",
+            "severity": "error",
+            "message": "1.0.0 has invalid date '2025-13-01'",
+        }
+
+    def test_archive(self, tmp_path, monkeypatch):
+        """Ensure 'archive' requires a cutoff and 'show' still finds moved releases."""
+        changelog_file = tmp_path / "CHANGELOG.md"
+        changelog_file.write_text(
+            "# Changelog\n\n"
+            "## [2.0.0] - 2025-08-03\n\n- C\n\n"
+            "## [1.0.1] - 2025-08-02\n\n- B\n\n"
+            "## [1.0.0] - 2025-08-01\n\n- A\n\n"
+            "## [Unreleased]"
+        )
+        monkeypatch.setattr(Changelog, "path", changelog_file)
+        runner = CliRunner()
+
+        assert runner.invoke(cli, ["archive"]).exit_code != 0
+        result = runner.invoke(cli, ["archive", "--below-major", "2"])
+        assert result.exit_code == 0
+        assert result.output == "Archived 2 release(s) into changelog/1.x.md\n"
+        assert "- A" not in changelog_file.read_text()
+
+        result = runner.invoke(cli, ["show", "1.0.1"])
+        assert result.output == "## [1.0.1] - 2025-08-02\n\n- B\n\n"
+        result = runner.invoke(cli, ["show", "..2.0.0"])
+        assert [
+            line for line in result.output.splitlines() if line.startswith("- ")
+        ] == [
+            "- C",
+            "- B",
+            "- A",
+        ]
+        assert runner.invoke(cli, ["archive", "--below-major", "2"]).output == (
+            "Nothing to archive.\n"
+        )
+
+    def test_aggregate(self, tmp_path, monkeypatch):
+        """Ensure 'aggregate' merges discovered packages and then reports no change."""
+        monkeypatch.chdir(tmp_path)
+        for name, day in (("a", "2025-08-01"), ("b", "2025-08-02")):
+            pkg = tmp_path / "packages" / name
+            pkg.mkdir(parents=True)
+            (pkg / "pyproject.toml").write_text('[project]\nversion = "1.0.0"\n')
+            (pkg / "CHANGELOG.md").write_text(
+                f"# Changelog\n\n## [1.0.0] - {day}\n\n- X\n"
+            )
+        runner = CliRunner()
+
+        result = runner.invoke(cli, ["aggregate"])
+        assert result.exit_code == 0
+        assert (
+            result.output == "Merged 2 section(s) from 2 changelogs into CHANGELOG.md\n"
+        )
+        assert (
+            (tmp_path / "CHANGELOG.md")
+            .read_text()
+            .startswith("# Changelog\n\n## [packages/b 1.0.0] - 2025-08-02\n")
+        )
+        assert (
+            runner.invoke(cli, ["aggregate"]).output == "CHANGELOG.md is up to date.\n"
+        )
+
+    def test_export(self, tmp_path, monkeypatch):
+        """Ensure 'export' prints JSON to stdout and reports cache use for files."""
+        changelog_file = tmp_path / "CHANGELOG.md"
+        changelog_file.write_text(
+            "# Changelog\n\n## [1.0.0] - 2025-08-01\n\n### Added\n\n- A\n\n## [Unreleased]\n"
+        )
+        monkeypatch.setattr(Changelog, "path", changelog_file)
+        runner = CliRunner()
+
+        result = runner.invoke(cli, ["export"])
+        assert result.exit_code == 0
+        assert json.loads(result.output)[0]["sections"] == {"added": ["A"]}
+
+        output = tmp_path / "out.html"
+        result = runner.invoke(cli, ["export", "--format", "html", "-o", str(output)])
+        assert result.output == f"Exported 1 release(s) to {output} (1 rendered)\n"
+        assert "<li>A</li>" in output.read_text()
+        result = runner.invoke(cli, ["export", "--format", "html", "-o", str(output)])
+        assert result.output.endswith("(0 rendered)\n")
+
+    def test_sync(self, tmp_path, monkeypatch):
+        """Ensure 'sync --check' reports drift and 'sync' fixes it."""
+        pyproject_file = tmp_path / "pyproject.toml"
+        pyproject_file.write_text(
+            '[project]\nversion = "1.2.0"\n\n'
+            '[tool.changelogbump]\nversion-files = ["pkg/__init__.py"]\n'
+        )
+        (tmp_path / "pkg").mkdir()
+        init = tmp_path / "pkg" / "__init__.py"
+        init.write_text('__version__ = "1.1.0"\n')
+        monkeypatch.setattr(type(src.changelogbump.pyproject), "path", pyproject_file)
+        runner = CliRunner()
+
+        result = runner.invoke(cli, ["sync", "--check"])
+        assert result.exit_code == 1
+        assert result.output == f"{init}:1: 1.1.0 != 1.2.0\n"
+
+        result = runner.invoke(cli, ["sync"])
+        assert result.exit_code == 0
+        assert result.output.endswith("Updated 1 of 1 version string(s) to 1.2.0\n")
+        assert init.read_text() == '__version__ = "1.2.0"\n'
+        assert runner.invoke(cli, ["sync", "--check"]).exit_code == 0
+
+    def test_add_recursive(self, tmp_path, monkeypatch):
+        """Ensure 'add --recursive' bumps every discovered package and reports each one."""
+        for name in ("a", "b"):
+            pkg = tmp_path / name
+            pkg.mkdir()
+            (pkg / "pyproject.toml").write_text('[project]\nversion = "0.1.0"\n')
+            (pkg / "CHANGELOG.md").write_text("# Changelog\n")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("click.prompt", MagicMock(return_value=""))
+
+        result = CliRunner().invoke(cli, ["add", "--minor", "--recursive"])
+
+        assert result.exit_code == 0
+        assert "Bumping 2 packages" in result.output
+        assert f"{tmp_path / 'a'}: 0.1.0 -> 0.2.0" in result.output
+        assert 'version = "0.2.0"' in (tmp_path / "b" / "pyproject.toml").read_text()
+
+    def test_add_manifest_and_recursive_bump_each_package_once(
+        self, tmp_path, monkeypatch
+    ):
+        """Ensure a package both listed in the manifest and discovered is bumped once."""
+        for name in ("a", "b"):
+            pkg = tmp_path / name
+            pkg.mkdir()
+            (pkg / "pyproject.toml").write_text('[project]\nversion = "0.1.0"\n')
+            (pkg / "CHANGELOG.md").write_text("# Changelog\n")
+        (tmp_path / "packages.txt").write_text("a\n./b\n")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("click.prompt", MagicMock(return_value=""))
+
+        result = CliRunner().invoke(
+            cli, ["add", "--patch", "--recursive", "--manifest", "packages.txt"]
+        )
+
+        assert result.exit_code == 0
+        assert "Bumping 2 packages" in result.output
+        for name in ("a", "b"):
+            pyproject_text = (tmp_path / name / "pyproject.toml").read_text()
+            assert 'version = "0.1.1"' in pyproject_text
+
+    def test_add_recursive_changed(self, tmp_path, monkeypatch):
+        """Ensure 'add --recursive --changed' bumps only changed packages with inferred parts."""
+        for var in ("AUTHOR", "COMMITTER"):
+            monkeypatch.setenv(f"GIT_{var}_NAME", "Test")
+            monkeypatch.setenv(f"GIT_{var}_EMAIL", "test@example.com")
+        for name in ("a", "b", "c"):
+            pkg = tmp_path / name
+            pkg.mkdir()
+            (pkg / "pyproject.toml").write_text('[project]\nversion = "0.1.0"\n')
+            (pkg / "CHANGELOG.md").write_text("# Changelog\n")
+            (pkg / "module.py").write_text("x = 1\n")
+
+        def git(*args):
+            subprocess.run(
+                ["git", *args], cwd=tmp_path, check=True, capture_output=True
+            )
+
+        git("init", "-q")
+        git("add", ".")
+        git("commit", "-q", "-m", "initial")
+        git("tag", "v0.1.0")
+        (tmp_path / "a" / "module.py").write_text("x = 2\n")
+        (tmp_path / "b" / "added.py").write_text("")
+        git("add", ".")
+        git("commit", "-q", "-m", "change")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("click.prompt", MagicMock(return_value=""))
+
+        result = CliRunner().invoke(cli, ["add", "--recursive", "--changed"])
+
+        assert result.exit_code == 0, result.output
+        assert "Comparing against: v0.1.0" in result.output
+        assert "Skipping 1 unchanged packages" in result.output
+        assert f"{tmp_path / 'a'}: 0.1.0 -> 0.1.1" in result.output
+        assert f"{tmp_path / 'b'}: 0.1.0 -> 0.2.0" in result.output
+        assert 'version = "0.1.0"' in (tmp_path / "c" / "pyproject.toml").read_text()
+
+        result = CliRunner().invoke(cli, ["add", "--recursive", "--changed"])
+        assert result.exit_code == 0
+        assert "Skipping 3 unchanged packages" in result.output
+        assert "Bumping" not in result.output
+
+    def test_add_changed_needs_batch_mode(self, temp_files):
+        """Ensure '--changed' is rejected for a single project."""
+        result = CliRunner().invoke(cli, ["add", "--patch", "--changed"])
+        assert result.exit_code != 0
+        assert "--changed and --since need --recursive or --manifest." in result.output
+
+    def test_add_with_entries_from_stdin(self, temp_files, monkeypatch):
+        """Ensure 'add --entries -' reads entries from stdin instead of prompting."""
+        monkeypatch.setattr("click.prompt", MagicMock(side_effect=AssertionError))
+
+        result = CliRunner().invoke(
+            cli,
+            ["add", "--patch", "--entries", "-"],
+            input='### Added\n- Piped entry\n{"section": "removed", "entry": "Gone"}\n',
+        )
+
+        assert result.exit_code == 0
+        text = Changelog.path.read_text()
+        assert "### Added\n\n- Piped entry\n" in text
+        assert "### Removed\n\n- Gone\n" in text
+
+    def test_add_with_invalid_entries_file(self, temp_files, tmp_path):
+        """Ensure 'add --entries-file' rejects malformed input before bumping anything."""
+        entries = tmp_path / "entries.txt"
+        entries.write_text("### Added\n- ok\n### Bogus\n")
+
+        result = CliRunner().invoke(
+            cli, ["add", "--patch", "--entries-file", str(entries)]
+        )
+
+        assert result.exit_code != 0
+        assert "line 3: unknown section 'bogus'" in result.output
+        assert pyproject.current_version == "0.1.0"
+
+    def test_add_from_git_infers_part(self, temp_files, tmp_path, monkeypatch):
+        """Ensure 'add --from-git' uses commit-derived entries and the inferred part."""
+        monkeypatch.setattr("click.prompt", MagicMock(side_effect=AssertionError))
+        monkeypatch.setattr(
+            "changelogbump.Git.Git.changes_since_release",
+            lambda: (
+                "v0.1.0",
+                {"added": ["Feature"], "changed": [], "removed": []},
+                "minor",
+            ),
+        )
+
+        result = CliRunner().invoke(cli, ["add", "--from-git"])
+
+        assert result.exit_code == 0
+        assert "Reading commits since: v0.1.0" in result.output
+        assert "Incrementing to: 0.2.0" in result.output
+        assert "### Added\n\n- Feature\n" in Changelog.path.read_text()
+
+    def test_add_base_from_tags(self, temp_files, monkeypatch):
+        """Ensure 'add --base-from-tags' bumps from the highest version tag."""
+        monkeypatch.setattr(
+            "changelogbump.Git.Git.version_tags",
+            lambda cwd=".": {"0.4.0": "v0.4.0", "0.10.1": "v0.10.1", "0.9.0": "0.9.0"},
+        )
+
+        result = CliRunner().invoke(
+            cli, ["add", "--patch", "--base-from-tags", "--entries", "-"], input="{}\n"
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Latest tag: v0.10.1" in result.output
+        assert "Incrementing to: 0.10.2" in result.output
+        assert "## [0.10.2]" in Changelog.path.read_text()
+
+    def test_add_base_from_tags_behind_current(self, temp_files, monkeypatch):
+        """Ensure a tag behind the changelog does not bump below existing releases."""
+        Changelog.update("0.3.0", None, {"added": ["A"]})
+        monkeypatch.setattr(
+            "changelogbump.Git.Git.version_tags", lambda cwd=".": {"0.2.0": "v0.2.0"}
+        )
+
+        result = CliRunner().invoke(
+            cli, ["add", "--patch", "--base-from-tags", "--entries", "-"], input="{}\n"
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Warning: v0.2.0 is behind 0.3.0; bumping from 0.3.0" in result.output
+        assert "Incrementing to: 0.3.1" in result.output
+        assert "## [0.3.1]" in Changelog.path.read_text()
+
+    def test_reconcile(self, temp_files, monkeypatch):
+        """Ensure 'reconcile' prints each source's version and fails on drift."""
+        Changelog.update("0.2.0", None, {"added": ["A"]})
+        tags = {"0.1.0": "v0.1.0", "0.0.9": "v0.0.9"}
+        monkeypatch.setattr("changelogbump.Git.Git.version_tags", lambda cwd: tags)
+
+        result = CliRunner().invoke(cli, ["reconcile"])
+
+        assert result.exit_code == 1
+        assert "git tags:       0.1.0 (v0.1.0)" in result.output
+        assert "Untagged releases: 0.2.0" in result.output
+        assert "Tags missing from the changelog: 0.1.0, 0.0.9" in result.output
+
+    def test_version_command_offline(self, monkeypatch):
+        """Ensure 'version' still reports the installed version when no index answers."""
+
+        def unreachable() -> str:
+            raise TimeoutError("No index answered within 3.0s")
+
+        monkeypatch.setattr("changelogbump.Metadata._PyPiMetadata.version", unreachable)
+
+        result = CliRunner().invoke(cli, ["version"])
+        assert result.exit_code == 0
+        assert "Installed: " in result.output
+        assert "Available: unknown (No index answered within 3.0s)" in result.output
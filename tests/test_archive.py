@@ -0,0 +1,184 @@
+import json
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from changelogbump import header_path
+from changelogbump.Archive import Archive
+from changelogbump.Changelog import Changelog
+from changelogbump.Transaction import FileLock, Transaction
+from changelogbump.Validator import Validator
+from changelogbump.VersionIndex import VersionIndex
+
+HEADER = header_path.read_text() + "\n\n"
+
+
+def section(version: str, day: str) -> str:
+    return f"## [{version}] - {day}\n\n### Added\n\n- Entry {version}\n\n"
+
+
+class TestArchive:
+    @pytest.fixture
+    def changelog(self, tmp_path) -> Path:
+        (tmp_path / "pyproject.toml").write_text('[project]\nversion = "3.0.0"\n')
+        path = tmp_path / "CHANGELOG.md"
+        path.write_text(
+            HEADER
+            + section("3.0.0", "2025-08-05")
+            + section("2.1.0", "2025-08-04")
+            + section("2.0.0", "2025-08-03")
+            + section("1.1.0", "2025-08-02")
+            + section("1.0.0", "2025-08-01")
+        )
+        return path
+
+    def test_keep_moves_the_oldest_releases_into_major_shards(self, changelog):
+        """
+        Ensure releases past the cutoff leave the head, land in one shard per
+        major, newest first, and are listed in the manifest.
+        """
+        assert Archive.archive(changelog, keep=2) == {"2.x.md": 1, "1.x.md": 2}
+
+        head = changelog.read_text()
+        assert "## [2.1.0]" in head and "## [2.0.0]" not in head
+        assert head.endswith("- Entry 2.1.0\n\n")
+        shard = (changelog.parent / "changelog" / "1.x.md").read_text()
+        assert shard == (
+            "# Changelog archive: 1.x\n\n"
+            + section("1.1.0", "2025-08-02")
+            + section("1.0.0", "2025-08-01")
+        )
+        assert Archive.manifest(changelog) == [
+            {
+                "file": "2.x.md",
+                "major": 2,
+                "newest": "2.0.0",
+                "oldest": "2.0.0",
+                "releases": 1,
+            },
+            {
+                "file": "1.x.md",
+                "major": 1,
+                "newest": "1.1.0",
+                "oldest": "1.0.0",
+                "releases": 2,
+            },
+        ]
+        assert not list(changelog.parent.glob(".*.txn"))
+
+    def test_link_footer_stays_in_the_head(self, changelog):
+        """
+        Ensure link reference definitions after the oldest release are not
+        archived with it.
+        """
+        footer = (
+            "[3.0.0]: https://example.com/compare/v2.1.0...v3.0.0\n"
+            "[1.0.0]: https://example.com/releases/v1.0.0\n"
+        )
+        changelog.write_text(changelog.read_text() + footer)
+
+        assert Archive.archive(changelog, keep=2) == {"2.x.md": 1, "1.x.md": 2}
+
+        assert changelog.read_text().endswith("- Entry 2.1.0\n\n" + footer)
+        shard = (changelog.parent / "changelog" / "1.x.md").read_text()
+        assert shard == (
+            "# Changelog archive: 1.x\n\n"
+            + section("1.1.0", "2025-08-02")
+            + section("1.0.0", "2025-08-01")
+        )
+        assert Validator.check(changelog) == []
+
+    def test_archive_indexes_under_the_project_lock(self, changelog):
+        """
+        Ensure a bump landing while an archive waits for the lock is not cut
+        at offsets read before it.
+        """
+        results = []
+        with FileLock(Transaction.lock_path(changelog.parent)):
+            worker = threading.Thread(
+                target=lambda: results.append(Archive.archive(changelog, keep=2))
+            )
+            worker.start()
+            time.sleep(0.2)
+            head, rest = changelog.read_text().split("## [3.0.0]", 1)
+            changelog.write_text(
+                head + section("3.1.0", "2025-08-06") + "## [3.0.0]" + rest
+            )
+        worker.join()
+
+        assert results == [{"2.x.md": 2, "1.x.md": 2}]
+        text = changelog.read_text()
+        assert text.startswith(
+            HEADER + section("3.1.0", "2025-08-06") + section("3.0.0", "2025-08-05")
+        )
+        assert text.endswith("- Entry 3.0.0\n\n")
+        shard = (changelog.parent / "changelog" / "2.x.md").read_text()
+        assert shard == (
+            "# Changelog archive: 2.x\n\n"
+            + section("2.1.0", "2025-08-04")
+            + section("2.0.0", "2025-08-03")
+        )
+
+    def test_archiving_again_prepends_to_existing_shard(self, changelog):
+        """Ensure a later archive keeps the shard in newest-first order."""
+        Archive.archive(changelog, keep=4)
+        Archive.archive(changelog, keep=1)
+
+        shard = (changelog.parent / "changelog" / "2.x.md").read_text()
+        assert shard.index("2.1.0") < shard.index("2.0.0")
+        entry = Archive.manifest(changelog)[0]
+        assert (entry["major"], entry["newest"], entry["releases"]) == (2, "2.1.0", 2)
+        assert Archive.manifest(changelog)[1]["releases"] == 2
+
+    def test_cutoff_by_age_and_major(self, changelog):
+        """Ensure --older-than and --below-major pick the right cutoff."""
+        today = date.today()
+        changelog.write_text(
+            HEADER
+            + section("1.1.0", today.isoformat())
+            + section("1.0.0", (today - timedelta(days=40)).isoformat())
+        )
+        assert Archive.archive(changelog, days=60) == {}
+        assert Archive.archive(changelog, days=30) == {"1.x.md": 1}
+        assert Archive.archive(changelog, below_major=1) == {}
+        assert Archive.archive(changelog, below_major=2) == {"1.x.md": 1}
+        assert "## [1" not in changelog.read_text()
+
+    def test_reads_see_the_whole_history(self, changelog):
+        """
+        Ensure show, query and check read archived releases through the
+        manifest, and that updates only touch the head.
+        """
+        Archive.archive(changelog, keep=1)
+        Bound = Changelog.at(changelog)
+
+        assert (
+            Bound.releases("1.0.0")[0].path == changelog.parent / "changelog" / "1.x.md"
+        )
+        assert [r.version for r in Bound.releases("1.1.0..2.1.0")] == [
+            "2.1.0",
+            "2.0.0",
+            "1.1.0",
+        ]
+        assert [
+            str(v) for v in VersionIndex.from_changelogs([changelog]).between()
+        ] == [
+            "1.0.0",
+            "1.1.0",
+            "2.0.0",
+            "2.1.0",
+            "3.0.0",
+        ]
+        assert Validator.check(changelog) == []
+
+        shard = changelog.parent / "changelog" / "1.x.md"
+        shard.write_text(shard.read_text() + section("1.1.0", "2025-07-01"))
+        found = Validator.check(changelog)
+        assert [(d.path, d.code) for d in found] == [(str(shard), "CB006")]
+
+        before = json.loads(shard.with_name("manifest.json").read_text())
+        Bound.update("3.1.0", None, {"added": ["New"]})
+        assert json.loads(shard.with_name("manifest.json").read_text()) == before
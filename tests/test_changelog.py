@@ -1,3 +1,5 @@
+import pytest
+
 from changelogbump.Changelog import Changelog
 
 
@@ -94,3 +96,167 @@ Some existing changelog text
         # Since no headings found, new version text should appear at the end
         assert updated_text.strip().endswith("### Added\n\n- Mocked add")
         assert "## [1.0.0]" in updated_text
+
+    def test_insert_preserves_remaining_bytes(self, monkeypatch, tmp_path):
+        """
+        Check that insert() streams everything after the first heading through untouched,
+        even when the copy is split across many small chunks.
+        """
+        head = "# Changelog\n\n"
+        tail = "".join(
+            f"## [0.{i}.0] - 2025-08-01\n\n- entry {i}\n\n\n" for i in range(50, 0, -1)
+        )
+        changelog_file = tmp_path / "CHANGELOG.md"
+        changelog_file.write_bytes((head + tail).encode())
+        monkeypatch.setattr(Changelog, "path", changelog_file)
+        monkeypatch.setattr(Changelog, "chunk_size", 7)
+
+        offset = Changelog.insert("## [1.0.0] - 2025-08-02\n\n")
+
+        assert offset == len(head)
+        assert changelog_file.read_text() == (
+            head + "## [1.0.0] - 2025-08-02\n\n\n" + tail
+        )
+        assert [p.name for p in tmp_path.iterdir()] == ["CHANGELOG.md"]
+
+    def test_insert_appends_after_unterminated_line(self, monkeypatch, tmp_path):
+        """
+        Check that insert() starts the appended entry on its own line.
+        """
+        changelog_file = tmp_path / "CHANGELOG.md"
+        changelog_file.write_text("# Changelog")
+        monkeypatch.setattr(Changelog, "path", changelog_file)
+
+        Changelog.insert("## [1.0.0] - 2025-08-02\n\n")
+
+        assert changelog_file.read_text() == "# Changelog\n## [1.0.0] - 2025-08-02\n\n"
+
+    @pytest.mark.parametrize(
+        "before, after",
+        [
+            (
+                "# Changelog\n\n## [Unreleased]",
+                "# Changelog\n\n## [Unreleased]\n\n## [1.1.0] - 2025-08-02\n\n",
+            ),
+            (
+                "# Changelog\n\n## [Unreleased]\n\n- Draft\n\n## [1.0.0]\n\n- A\n",
+                (
+                    "# Changelog\n\n## [Unreleased]\n\n- Draft\n\n"
+                    "## [1.1.0] - 2025-08-02\n\n\n## [1.0.0]\n\n- A\n"
+                ),
+            ),
+        ],
+    )
+    def test_insert_keeps_unreleased_on_top(self, monkeypatch, tmp_path, before, after):
+        """
+        Check that a new release goes below the Unreleased section and that an
+        existing sidecar index stays consistent with the file.
+        """
+        from changelogbump.ChangelogIndex import ChangelogIndex
+
+        changelog_file = tmp_path / "CHANGELOG.md"
+        changelog_file.write_text(before)
+        monkeypatch.setattr(Changelog, "path", changelog_file)
+        index = ChangelogIndex.load(changelog_file)
+        index.save()
+
+        offset = Changelog.insert("## [1.1.0] - 2025-08-02\n\n")
+        index.record_insert(offset)
+
+        assert changelog_file.read_text() == after
+        rebuilt = ChangelogIndex.build(changelog_file)
+        assert [(r.version, r.offset, r.length) for r in index.releases] == [
+            (r.version, r.offset, r.length) for r in rebuilt.releases
+        ]
+
+    def test_section_reads_version_and_range(self, monkeypatch, tmp_path):
+        """
+        Check that section() returns one version's notes or an inclusive range in file order.
+        """
+        changelog_file = tmp_path / "CHANGELOG.md"
+        changelog_file.write_text(
+            "# Changelog\n\n"
+            "## [1.2.1] - 2025-08-03\n\n- C\n\n"
+            "## [1.2.0] - 2025-08-02\n\n- B\n\n"
+            "## [1.1.9] - 2025-08-01\n\n- A\n"
+        )
+        monkeypatch.setattr(Changelog, "path", changelog_file)
+
+        assert Changelog.section("1.2.0") == "## [1.2.0] - 2025-08-02\n\n- B\n\n"
+        assert Changelog.section("1.1.9..1.2.0") == (
+            "## [1.2.0] - 2025-08-02\n\n- B\n\n## [1.1.9] - 2025-08-01\n\n- A\n"
+        )
+        assert Changelog.section("3.0.0") == ""
+
+    def test_render_unreleased(self, monkeypatch, tmp_path):
+        """
+        Check that render_unreleased() replaces only the Unreleased body, and
+        that clearing leaves hand-written text alone.
+        """
+        changelog_file = tmp_path / "CHANGELOG.md"
+        changelog_file.write_text(
+            "# Changelog\n\n## [Unreleased]\n\n- Old\n\n## [1.0.0] - 2025-08-01\n\n- A\n"
+        )
+        monkeypatch.setattr(Changelog, "path", changelog_file)
+
+        assert Changelog.render_unreleased({}) is False
+        assert Changelog.render_unreleased({"added": ["New"]}) is True
+        assert changelog_file.read_text() == (
+            "# Changelog\n\n## [Unreleased]\n\n"
+            f"{Changelog.unreleased_marker}\n\n### Added\n\n- New\n\n"
+            "## [1.0.0] - 2025-08-01\n\n- A\n"
+        )
+        assert Changelog.render_unreleased({}) is True
+        assert changelog_file.read_text() == (
+            "# Changelog\n\n## [Unreleased]\n\n## [1.0.0] - 2025-08-01\n\n- A\n"
+        )
+
+        changelog_file.write_text("# Changelog\n")
+        with pytest.raises(KeyError):
+            Changelog.render_unreleased({"added": ["New"]})
+
+    def test_read_sections_mixed_formats(self):
+        """
+        Check that read_sections() accepts JSON lines and sectioned text in one stream.
+        """
+        lines = [
+            '{"section": "added", "entry": "From JSON"}\n',
+            '{"removed": ["Old API", "Older API"]}\n',
+            "\n",
+            "### Changed\n",
+            "- Text entry\n",
+            "Added:\n",
+            "* Starred entry\n",
+        ]
+        assert Changelog.read_sections(lines) == {
+            "added": ["From JSON", "Starred entry"],
+            "changed": ["Text entry"],
+            "removed": ["Old API", "Older API"],
+        }
+
+    def test_read_sections_entry_ending_with_colon(self):
+        """
+        Check that an entry ending with a colon stays an entry, not a section header.
+        """
+        lines = ["### Added\n", "- Supported formats:\n", "* Also this:\n"]
+        assert Changelog.read_sections(lines)["added"] == [
+            "Supported formats:",
+            "Also this:",
+        ]
+
+    @pytest.mark.parametrize(
+        "lines, message",
+        [
+            (["- orphan"], "line 1: entry before any section header"),
+            (["### Added", "### Fixed"], "line 2: unknown section 'fixed'"),
+            (['{"section": "added"}'], "line 1: entries must be non-empty strings"),
+            (["{not json"], "line 1: invalid JSON"),
+            (["### Added", "plain words"], "line 2: unrecognized line"),
+        ],
+    )
+    def test_read_sections_rejects_invalid_input(self, lines, message):
+        """
+        Check that read_sections() reports the offending line.
+        """
+        with pytest.raises(ValueError, match=message):
+            Changelog.read_sections(lines)
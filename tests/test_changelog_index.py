@@ -0,0 +1,76 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from changelogbump.Changelog import Changelog
+from changelogbump.ChangelogIndex import ChangelogIndex
+
+
+class TestChangelogIndex:
+    @pytest.fixture
+    def changelog_file(self, tmp_path, monkeypatch) -> Iterator[Path]:
+        changelog = tmp_path / "CHANGELOG.md"
+        changelog.write_text("""# Changelog
+
+## [0.2.0] - 2025-08-02
+
+- Second
+
+## [0.1.0] - 2025-08-01
+
+- First
+
+## [Unreleased]""")
+        monkeypatch.setattr(Changelog, "path", changelog)
+        yield changelog
+
+    def test_build_records_offsets(self, changelog_file):
+        """
+        Ensure build() finds each version heading with its byte span.
+        """
+        data = changelog_file.read_bytes()
+        index = ChangelogIndex.build(changelog_file)
+
+        assert [r.version for r in index.releases] == ["0.2.0", "0.1.0", "Unreleased"]
+        release = index.find("0.1.0")
+        assert release.date == "2025-08-01"
+        section = data[release.offset : release.offset + release.length]
+        assert section == b"## [0.1.0] - 2025-08-01\n\n- First\n\n"
+        assert index.latest().version == "0.2.0"
+        assert index.find("9.9.9") is None
+
+    def test_load_rebuilds_stale_sidecar(self, changelog_file):
+        """
+        Ensure load() persists the index in the state directory and discards it
+        once the changelog changes.
+        """
+        ChangelogIndex.load(changelog_file)
+        assert ChangelogIndex.read(changelog_file) is not None
+        assert sorted(p.name for p in changelog_file.parent.iterdir()) == [
+            ".changelogbump",
+            "CHANGELOG.md",
+        ]
+        assert (changelog_file.parent / ".changelogbump" / "CHANGELOG.md.idx").is_file()
+
+        changelog_file.write_text("# Changelog\n\n## [3.0.0] - 2025-09-01\n")
+        assert ChangelogIndex.read(changelog_file) is None
+        assert ChangelogIndex.load(changelog_file).latest().version == "3.0.0"
+
+    def test_update_shifts_index_in_place(self, changelog_file, monkeypatch):
+        """
+        Ensure Changelog.update() keeps an existing sidecar current instead of leaving it stale.
+        """
+        ChangelogIndex.load(changelog_file)
+        monkeypatch.setattr(
+            Changelog,
+            "generate_sections",
+            lambda: {"added": ["Third"], "changed": [], "removed": []},
+        )
+        Changelog.update("0.3.0")
+
+        index = ChangelogIndex.read(changelog_file)
+        assert index is not None
+        rebuilt = ChangelogIndex.build(changelog_file)
+        assert index.releases == rebuilt.releases
+        assert index.latest().version == "0.3.0"
@@ -0,0 +1,144 @@
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from changelogbump import client
+from changelogbump.client import ClientError
+from changelogbump.Daemon import Daemon, DaemonError, Service
+
+CHANGELOG = "# Changelog\n\n## [0.1.0] - 2025-08-01\n\n- First\n\n## [Unreleased]\n"
+
+
+@pytest.fixture
+def project(tmp_path) -> Iterator[Path]:
+    (tmp_path / "pyproject.toml").write_text('[project]\nversion = "0.1.0"\n')
+    (tmp_path / "CHANGELOG.md").write_text(CHANGELOG)
+    yield tmp_path
+
+
+class TestService:
+    def test_results_are_cached_until_a_file_changes(self, project, monkeypatch):
+        """Ensure a repeated request is answered from memory until the file changes."""
+        service = Service(project)
+        calls = []
+        releases = service.changelog.releases
+        monkeypatch.setattr(
+            service.changelog,
+            "releases",
+            lambda spec: calls.append(spec) or releases(spec),
+        )
+        request = {"op": "show", "spec": "0.1.0"}
+
+        assert service.handle(request) == {
+            "result": "## [0.1.0] - 2025-08-01\n\n- First\n\n"
+        }
+        assert service.handle(request) == service.handle(request)
+        assert len(calls) == 1
+
+        path = project / "CHANGELOG.md"
+        path.write_text(CHANGELOG.replace("- First", "- Fixed"))
+        assert "- Fixed" in service.handle(request)["result"]
+        assert len(calls) == 2
+
+        (project / "pyproject.toml").write_text('[project]\nversion = "0.1.10"\n')
+        assert service.handle({"op": "version"}) == {"result": "0.1.10"}
+
+    def test_cache_is_shared_safely_between_threads(self, project):
+        """Ensure concurrent requests evicting from a full cache neither fail nor overfill it."""
+        service = Service(project)
+        service.max_cached = 4
+        errors = []
+
+        def work(offset: int) -> None:
+            try:
+                for i in range(2000):
+                    key = ("k", (i + offset) % 16)
+                    assert service._cached(key, [], lambda key=key: key) == key
+            except Exception as exc:  # noqa: BLE001 - reported by the test
+                errors.append(exc)
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(service._cache) <= service.max_cached
+
+    def test_errors_are_returned(self, project):
+        """Ensure failures and unknown operations come back as error responses."""
+        service = Service(project)
+        assert service.handle({"op": "show", "spec": "9.9.9"}) == {
+            "error": "LookupError: No changelog section found for 9.9.9."
+        }
+        assert "unknown operation" in service.handle({"op": "nope"})["error"]
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+class TestDaemon:
+    @pytest.fixture
+    def daemon(self, project) -> Iterator[Daemon]:
+        with Daemon(project) as daemon:
+            thread = threading.Thread(target=daemon.serve_forever)
+            thread.start()
+            yield daemon
+            daemon.shutdown()
+            thread.join()
+
+    def test_requests_are_served(self, daemon, monkeypatch):
+        """Ensure the client talks to a running daemon instead of working in-process."""
+        monkeypatch.setattr("changelogbump.Daemon.Service", None)
+        root = daemon.root
+
+        assert client.request(root, "version") == "0.1.0"
+        assert (
+            client.request(root, "show", spec="0.1.0")
+            == "## [0.1.0] - 2025-08-01\n\n- First\n\n"
+        )
+        assert client.request(root, "bump", part="minor", summary="Next") == {
+            "old": "0.1.0",
+            "new": "0.2.0",
+        }
+        assert client.request(root, "version") == "0.2.0"
+        with pytest.raises(ClientError, match="LookupError"):
+            client.request(root, "show", spec="9.9.9")
+
+    def test_answers_are_fast_when_warm(self, daemon):
+        """Ensure warm version requests take well under a millisecond on the server."""
+        service = daemon.service
+        service.version()
+        started = time.perf_counter()
+        for _ in range(1000):
+            service.version()
+        assert (time.perf_counter() - started) / 1000 < 1e-3
+
+    def test_socket_is_private(self, daemon):
+        """Ensure only the owner can connect to the socket."""
+        assert daemon.path.stat().st_mode & 0o777 == 0o600
+
+    def test_second_daemon_is_refused(self, daemon):
+        """Ensure only one daemon serves a project at a time."""
+        with pytest.raises(DaemonError, match="already listening"):
+            Daemon(daemon.root).__enter__()
+
+
+class TestClient:
+    def test_falls_back_to_in_process(self, project, monkeypatch, capsys):
+        """Ensure the client works without a daemon, even with a stale socket."""
+        client.socket_path(project).parent.mkdir()
+        client.socket_path(project).touch()
+        monkeypatch.chdir(project)
+
+        assert client.main(["version"]) == 0
+        assert client.main(["bump", "patch", "--summary", "Fix"]) == 0
+        assert client.main(["show", "0.0.1"]) == 1
+        assert client.main(["frobnicate"]) == 2
+        out, err = capsys.readouterr()
+        assert out == "0.1.0\n0.1.0 -> 0.1.1\n"
+        assert "No changelog section found for 0.0.1." in err
+        assert "usage:" in err
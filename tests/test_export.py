@@ -0,0 +1,105 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from changelogbump.Archive import Archive
+from changelogbump.Changelog import Changelog
+from changelogbump.Export import Export
+
+
+@pytest.fixture
+def changelog(tmp_path) -> Path:
+    path = tmp_path / "CHANGELOG.md"
+    path.write_text(
+        "# Changelog\n\n"
+        "## [1.1.0] - 2025-08-02\n\nFaster & smaller\n\n"
+        "### Added\n\n- Parser\n- Long entry\n  continued\n\n"
+        "### Changed\n\n- <Speed>\n\n"
+        "## [1.0.0] - 2025-08-01\n\n### Removed\n\n- Legacy\n\n"
+        "## [Unreleased]\n"
+    )
+    return path
+
+
+def export(changelog: Path, fmt: str) -> tuple[str, tuple[int, int]]:
+    out = io.BytesIO()
+    counts = Export(changelog, fmt).write(out)
+    return out.getvalue().decode(), counts
+
+
+class TestExport:
+    def test_json_records(self, changelog):
+        """Ensure sections are parsed into records, newest first."""
+        text, counts = export(changelog, "json")
+
+        assert counts == (2, 2)
+        assert json.loads(text) == [
+            {
+                "version": "1.1.0",
+                "date": "2025-08-02",
+                "summary": "Faster & smaller",
+                "sections": {
+                    "added": ["Parser", "Long entry continued"],
+                    "changed": ["<Speed>"],
+                },
+            },
+            {
+                "version": "1.0.0",
+                "date": "2025-08-01",
+                "summary": None,
+                "sections": {"removed": ["Legacy"]},
+            },
+        ]
+
+    def test_html_is_escaped(self, changelog):
+        """Ensure HTML output escapes changelog text."""
+        text, _ = export(changelog, "html")
+
+        assert text.startswith("<!DOCTYPE html>")
+        assert "<p>Faster &amp; smaller</p>" in text
+        assert "<li>&lt;Speed&gt;</li>" in text
+        assert '<section id="v1.0.0">' in text
+
+    def test_reexport_renders_only_new_sections(self, changelog, monkeypatch):
+        """Ensure cached renderings are reused and only a new bump is rendered."""
+        first, _ = export(changelog, "json")
+        Changelog.at(changelog).update("1.2.0", None, {"added": ["New"]})
+
+        rendered = []
+        original = Export.render
+        monkeypatch.setattr(
+            Export,
+            "render",
+            lambda self, r: rendered.append(r["version"]) or original(self, r),
+        )
+        text, counts = export(changelog, "json")
+
+        assert counts == (3, 1) and rendered == ["1.2.0"]
+        assert json.loads(text)[1:] == json.loads(first)
+        assert export(changelog, "json")[1] == (3, 0)
+
+    def test_stale_renderings_are_compacted(self, changelog):
+        """Ensure the cache drops renderings once most of them are unused."""
+        export(changelog, "json")
+        changelog.write_text(changelog.read_text().replace("Legacy", "Old API"))
+        export(changelog, "json")
+        changelog.write_text(changelog.read_text().replace("Parser", "Lexer"))
+        export(changelog, "json")
+
+        exporter = Export(changelog, "json")
+        index = exporter.cache_dir / f"json-{Export.cache_version}.idx"
+        assert len(json.loads(index.read_text())) == 2
+        assert export(changelog, "json")[1] == (2, 0)
+
+    def test_archived_releases_are_included(self, changelog):
+        """Ensure releases moved to shards are exported after the head."""
+        Archive.archive(changelog, keep=1)
+        text, _ = export(changelog, "json")
+        assert [r["version"] for r in json.loads(text)] == ["1.1.0", "1.0.0"]
+
+    def test_unknown_format(self, changelog):
+        """Ensure an unsupported format is rejected."""
+        with pytest.raises(ValueError):
+            Export(changelog, "xml")
@@ -0,0 +1,150 @@
+import subprocess
+
+import pytest
+
+from changelogbump.Git import Git
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def commit(repo, message):
+    path = repo / "file.txt"
+    path.write_text(message)
+    git(repo, "add", "file.txt")
+    git(repo, "commit", "-q", "-m", message)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    for var in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{var}_NAME", "Test")
+        monkeypatch.setenv(f"GIT_{var}_EMAIL", "test@example.com")
+    git(tmp_path, "init", "-q")
+    commit(tmp_path, "feat: before the release")
+    git(tmp_path, "tag", "v0.1.0")
+    yield tmp_path
+
+
+class TestGit:
+    def test_conventional_changes(self):
+        """
+        Ensure commits are sorted into sections and the strongest bump wins.
+        """
+        commits = [
+            ("fix(parser): handle tabs", ""),
+            ("docs: typo", ""),
+            ("not conventional at all", ""),
+            ("feat: new flag", "Longer description\n"),
+            ("revert: drop old flag", ""),
+        ]
+        sections, part = Git.conventional_changes(iter(commits))
+        assert sections == {
+            "added": ["new flag"],
+            "changed": ["parser: handle tabs"],
+            "removed": ["drop old flag"],
+        }
+        assert part == "minor"
+
+        _, part = Git.conventional_changes(iter([("refactor!: new API", "")]))
+        assert part == "major"
+        _, part = Git.conventional_changes(
+            iter([("fix: x", "body\nBREAKING CHANGE: removed y\n")])
+        )
+        assert part == "major"
+        _, part = Git.conventional_changes(iter([("chore: deps", "")]))
+        assert part == "patch"
+
+    def test_changes_since_release(self, repo):
+        """
+        Ensure only commits after the last version tag are read, bodies included.
+        """
+        commit(repo, "fix: first\n\nbody line")
+        commit(repo, "feat(cli): second")
+
+        tag, sections, part = Git.changes_since_release(repo)
+
+        assert tag == "v0.1.0"
+        assert sections == {
+            "added": ["cli: second"],
+            "changed": ["first"],
+            "removed": [],
+        }
+        assert part == "minor"
+        assert [s for s, _ in Git.iter_commits("HEAD", repo)] == [
+            "feat(cli): second",
+            "fix: first",
+            "feat: before the release",
+        ]
+        assert list(Git.iter_commits("HEAD~1..HEAD", repo)) == [
+            ("feat(cli): second", "\n")
+        ]
+
+    def test_iter_commits_non_utf8_messages(self, repo):
+        """
+        Ensure messages in a declared legacy encoding are re-encoded and
+        undecodable bytes are replaced instead of raising.
+        """
+        message = repo / "message.txt"
+        message.write_bytes("feat: caf\xe9 latin-1\n".encode("latin-1"))
+        (repo / "file.txt").write_text("a")
+        git(repo, "add", "file.txt")
+        git(repo, "-c", "i18n.commitEncoding=ISO-8859-1", "commit", "-q", "-F", message)
+        # git commit would fix up invalid UTF-8, so write the object directly
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD", "HEAD^{tree}"],
+            cwd=repo,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        raw = (
+            f"tree {head[1]}\nparent {head[0]}\n"
+            "author Test <test@example.com> 0 +0000\n"
+            "committer Test <test@example.com> 0 +0000\n\n"
+        ).encode() + b"fix: broken \xff bytes\n"
+        sha = (
+            subprocess.run(
+                ["git", "hash-object", "-t", "commit", "-w", "--stdin"],
+                cwd=repo,
+                input=raw,
+                check=True,
+                capture_output=True,
+            )
+            .stdout.decode()
+            .strip()
+        )
+        git(repo, "update-ref", "HEAD", sha)
+
+        subjects = [s for s, _ in Git.iter_commits("v0.1.0..HEAD", repo)]
+
+        assert subjects == ["fix: broken \ufffd bytes", "feat: caf\xe9 latin-1"]
+
+    def test_version_tags_are_cached_until_refs_change(self, repo, monkeypatch):
+        """
+        Ensure version tags are read once, served from the git directory cache,
+        and read again after a tag is added or the refs are packed.
+        """
+        monkeypatch.setattr(Git, "racy_window_ns", -(10**18))
+        git(repo, "tag", "0.2.0")
+        git(repo, "tag", "nightly")
+        git(repo, "tag", "v0.2.0-rc.1")
+        calls = []
+        run = Git.run
+        monkeypatch.setattr(
+            Git, "run", staticmethod(lambda *a, **k: calls.append(a[0]) or run(*a, **k))
+        )
+
+        expected = {"0.1.0": "v0.1.0", "0.2.0": "0.2.0", "0.2.0-rc.1": "v0.2.0-rc.1"}
+        assert Git.version_tags(repo) == expected
+        assert Git.version_tags(repo) == expected
+        assert calls == ["for-each-ref"]
+        assert (repo / ".git" / Git.tag_cache_name).exists()
+
+        git(repo, "tag", "v0.3.0")
+        assert Git.version_tags(repo)["0.3.0"] == "v0.3.0"
+        git(repo, "pack-refs", "--all")
+        git(repo, "tag", "-d", "0.2.0")
+        assert "0.2.0" not in Git.version_tags(repo)
+        assert calls == ["for-each-ref"] * 3
@@ -0,0 +1,129 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+
+import pytest
+
+from changelogbump.Metadata import _PyPiMetadata
+
+
+class FakeIndex(BaseHTTPRequestHandler):
+    """Serves metadata at /ok, a 404 at /missing, a stall at /slow, junk at /garbage."""
+
+    requests: ClassVar[list[tuple[str, str | None]]] = []
+
+    def do_GET(self):
+        FakeIndex.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/slow":
+            time.sleep(1)
+        if self.path == "/missing":
+            self.send_error(404)
+            return
+        if self.path == "/garbage":
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(b"<html>")
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({"info": {"version": "9.8.7"}, "releases": {}}).encode()
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHANGELOGBUMP_CACHE_DIR", str(tmp_path / "cache"))
+    FakeIndex.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeIndex)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestPyPiMetadata:
+    def test_cache_and_etag_revalidation(self, index, monkeypatch):
+        """
+        Ensure a fresh cache skips the network and a stale one is revalidated with its ETag.
+        """
+        monkeypatch.setenv("CHANGELOGBUMP_INDEX_URLS", f"{index}/ok")
+
+        assert _PyPiMetadata.version() == "9.8.7"
+        assert _PyPiMetadata.version() == "9.8.7"
+        assert FakeIndex.requests == [("/ok", None)]
+
+        monkeypatch.setattr(_PyPiMetadata, "ttl", 0)
+        assert _PyPiMetadata.version() == "9.8.7"
+        assert FakeIndex.requests[-1] == ("/ok", '"v1"')
+
+    def test_first_valid_answer_wins(self, index, monkeypatch):
+        """
+        Ensure failing and slow indexes do not hold up a working one.
+        """
+        monkeypatch.setenv(
+            "CHANGELOGBUMP_INDEX_URLS", f"{index}/missing, {index}/slow, {index}/ok"
+        )
+        started = time.perf_counter()
+        assert _PyPiMetadata.version() == "9.8.7"
+        assert time.perf_counter() - started < 0.9
+
+    def test_timeout_and_errors(self, index, monkeypatch):
+        """
+        Ensure unreachable indexes raise instead of hanging past the timeout.
+        """
+        monkeypatch.setattr(_PyPiMetadata, "timeout", 0.2)
+        monkeypatch.setenv("CHANGELOGBUMP_INDEX_URLS", f"{index}/slow")
+        with pytest.raises(OSError):
+            _PyPiMetadata.version()
+
+        monkeypatch.setenv("CHANGELOGBUMP_INDEX_URLS", f"{index}/missing")
+        with pytest.raises(OSError, match="404"):
+            _PyPiMetadata.version()
+
+    @pytest.mark.parametrize("path", ["slow", "missing", "garbage"])
+    def test_expired_cache_is_used_when_revalidation_fails(
+        self, index, monkeypatch, path
+    ):
+        """
+        Ensure a timeout, an HTTP error or a bad response falls back to the
+        expired cache entry, which is left expired so the next call retries.
+        """
+        url = f"{index}/{path}"
+        monkeypatch.setattr(_PyPiMetadata, "timeout", 0.2)
+        monkeypatch.setenv("CHANGELOGBUMP_INDEX_URLS", url)
+        cache_file = _PyPiMetadata._cache_file(url)
+        cache_file.parent.mkdir(parents=True)
+        record = {"version": "1.0.0", "etag": '"v0"', "fetched": 0}
+        cache_file.write_text(json.dumps(record))
+
+        assert _PyPiMetadata.version() == "1.0.0"
+        assert FakeIndex.requests == [(f"/{path}", '"v0"')]
+        assert json.loads(cache_file.read_text()) == record
+
+    def test_cache_problems_do_not_lose_the_answer(self, index, tmp_path, monkeypatch):
+        """
+        Ensure a malformed cache entry is refetched and an unwritable cache
+        directory still returns the fetched version.
+        """
+        monkeypatch.setenv("CHANGELOGBUMP_INDEX_URLS", f"{index}/ok")
+        cache_file = _PyPiMetadata._cache_file(f"{index}/ok")
+        cache_file.parent.mkdir(parents=True)
+        cache_file.write_text('{"version": "1.0.0"}')
+        assert _PyPiMetadata.version() == "9.8.7"
+        assert FakeIndex.requests == [("/ok", None)]
+
+        (tmp_path / "file").write_text("")
+        monkeypatch.setenv("CHANGELOGBUMP_CACHE_DIR", str(tmp_path / "file" / "cache"))
+        assert _PyPiMetadata.version() == "9.8.7"
@@ -0,0 +1,183 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from changelogbump.Monorepo import BatchError, Monorepo, PackageChange
+
+
+def make_package(root: Path, version: str = "0.1.0") -> Path:
+    root.mkdir(parents=True)
+    (root / "pyproject.toml").write_text(
+        f'[project]\nname = "x"\nversion = "{version}"\n'
+    )
+    (root / "CHANGELOG.md").write_text("# Changelog\n\n## [Unreleased]\n")
+    return root
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    for var in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{var}_NAME", "Test")
+        monkeypatch.setenv(f"GIT_{var}_EMAIL", "test@example.com")
+    for name in ("a", "b", "b/nested"):
+        make_package(tmp_path / name)
+        (tmp_path / name / "module.py").write_text("x = 1\n")
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+    git(tmp_path, "tag", "v0.1.0")
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+
+
+def commit_all(repo):
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "change")
+
+
+class TestMonorepo:
+    def test_discover_skips_ignored_dirs(self, tmp_path):
+        """
+        Ensure discover() finds directories holding both files and prunes vendored trees.
+        """
+        a = make_package(tmp_path / "packages" / "a")
+        b = make_package(tmp_path / "packages" / "b")
+        make_package(tmp_path / "node_modules" / "c")
+        (tmp_path / "packages" / "d").mkdir()
+        (tmp_path / "packages" / "d" / "pyproject.toml").write_text("")
+
+        assert Monorepo.discover(tmp_path) == [a, b]
+
+    def test_read_manifest(self, tmp_path):
+        """
+        Ensure read_manifest() resolves entries relative to the manifest and skips comments.
+        """
+        manifest = tmp_path / "packages.txt"
+        manifest.write_text("# packages\npackages/a\n\n  packages/b  \n")
+        assert Monorepo.read_manifest(manifest) == [
+            tmp_path / "packages/a",
+            tmp_path / "packages/b",
+        ]
+
+    def test_bump_all(self, tmp_path):
+        """
+        Ensure bump_all() bumps every package's pyproject.toml and changelog.
+        """
+        roots = [make_package(tmp_path / f"p{i}", f"1.{i}.0") for i in range(8)]
+        sections = {"added": ["Shared entry"], "changed": [], "removed": []}
+
+        results = list(Monorepo.bump_all(roots, "patch", "Batch", sections, jobs=4))
+
+        assert sorted((r.root, r.new_version) for r in results) == [
+            (root, f"1.{i}.1") for i, root in enumerate(roots)
+        ]
+        for root in roots:
+            assert "- Shared entry" in (root / "CHANGELOG.md").read_text()
+
+    def test_bump_all_stops_on_failure(self, tmp_path):
+        """
+        Ensure bump_all() raises BatchError naming the failed package and skips the rest.
+        """
+        good = make_package(tmp_path / "good")
+        bad = tmp_path / "bad"
+        roots = [good, bad] + [make_package(tmp_path / f"p{i}") for i in range(20)]
+
+        seen = []
+        with pytest.raises(BatchError) as exc_info:
+            seen.extend(Monorepo.bump_all(roots, "minor", None, {}, jobs=1))
+
+        assert exc_info.value.root == bad
+        assert exc_info.value.completed == seen
+        assert good in [r.root for r in seen]
+        assert len(seen) < len(roots) - 1
+        assert 'version = "0.1.0"' in (tmp_path / "p19" / "pyproject.toml").read_text()
+
+    def test_infer_part(self):
+        """
+        Ensure additions and deletions are minor, deletions major only when
+        asked, and test/doc changes only patch.
+        """
+        assert Monorepo.infer_part([("M", "module.py")]) == "patch"
+        assert Monorepo.infer_part([("M", "a.py"), ("A", "b.py")]) == "minor"
+        assert Monorepo.infer_part([("M", "a.py"), ("D", "c.py")]) == "minor"
+        assert Monorepo.infer_part([("A", "b.py"), ("D", "c.py")], "major") == "major"
+        assert Monorepo.infer_part([("D", "c.py"), ("A", "b.py")], "patch") == "minor"
+        assert Monorepo.infer_part([("D", "tests/test_a.py"), ("A", "docs/x")]) == (
+            "patch"
+        )
+
+    def test_changed_packages(self, repo):
+        """
+        Ensure a file counts for its deepest package and release files are ignored.
+        """
+        packages = [repo / "a", repo / "b", repo / "b" / "nested"]
+        (repo / "b" / "nested" / "new.py").write_text("")
+        (repo / "a" / "CHANGELOG.md").write_text("# Changelog\n\n## [0.1.1]\n")
+        commit_all(repo)
+
+        changes = Monorepo.changed_packages(packages, "v0.1.0")
+
+        assert [(c.root, c.part) for c in changes] == [(repo / "b" / "nested", "minor")]
+        assert len(changes[0].digest) == 40
+
+    def test_changed_packages_deletions_opt_into_major(self, repo):
+        """
+        Ensure a deleted file is a minor change unless the package sets
+        deletions = "major", and that an invalid setting is reported.
+        """
+        packages = [repo / "a", repo / "b"]
+        with (repo / "b" / "pyproject.toml").open("a") as fh:
+            fh.write('\n[tool.changelogbump]\ndeletions = "major"\n')
+        (repo / "a" / "module.py").unlink()
+        (repo / "b" / "module.py").unlink()
+        commit_all(repo)
+
+        changes = Monorepo.changed_packages(packages, "v0.1.0")
+
+        assert [(c.root, c.part) for c in changes] == [
+            (repo / "a", "minor"),
+            (repo / "b", "major"),
+        ]
+        (repo / "b" / "pyproject.toml").write_text(
+            '[project]\nversion = "0.1.0"\n[tool.changelogbump]\ndeletions = "huge"\n'
+        )
+        with pytest.raises(ValueError, match="deletions must be one of"):
+            Monorepo.changed_packages(packages, "v0.1.0")
+
+    def test_changed_packages_skips_released(self, repo):
+        """
+        Ensure a package recorded by remember_released() is skipped until it changes again.
+        """
+        packages = [repo / "a", repo / "b"]
+        (repo / "a" / "module.py").write_text("x = 2\n")
+        commit_all(repo)
+        changes = Monorepo.changed_packages(packages, "v0.1.0")
+        assert [c.root for c in changes] == [repo / "a"]
+
+        Monorepo.remember_released(changes)
+        assert Monorepo.changed_packages(packages, "v0.1.0") == []
+
+        (repo / "a" / "module.py").write_text("x = 3\n")
+        commit_all(repo)
+        assert [c.root for c in Monorepo.changed_packages(packages, "v0.1.0")] == [
+            repo / "a"
+        ]
+
+    def test_changed_packages_unknown_base(self, repo):
+        """
+        Ensure an unknown base reference is reported by git rather than ignored.
+        """
+        with pytest.raises(subprocess.CalledProcessError):
+            Monorepo.changed_packages([repo / "a"], "v9.9.9")
+
+    def test_package_change_fields(self, tmp_path):
+        """
+        Ensure PackageChange keeps the root, part and digest it was given.
+        """
+        change = PackageChange(tmp_path, "minor", "abc")
+        assert (change.root, change.part, change.digest) == (tmp_path, "minor", "abc")
@@ -0,0 +1,64 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from changelogbump.api import bump
+from changelogbump.Changelog import Changelog
+from changelogbump.Notes import Notes
+
+
+class TestNotes:
+    @pytest.fixture
+    def project(self, tmp_path) -> Iterator[Path]:
+        (tmp_path / "pyproject.toml").write_text('[project]\nversion = "0.1.0"\n')
+        (tmp_path / "CHANGELOG.md").write_text(
+            "# Changelog\n\n## [0.1.0] - 2025-08-01\n\n- First\n\n## [Unreleased]"
+        )
+        yield tmp_path
+
+    def test_append_and_read(self, project):
+        """
+        Ensure appended entries are read back by section in the order recorded.
+        """
+        changelog = project / "CHANGELOG.md"
+        assert not Notes.pending(changelog)
+        Notes.append(changelog, "added", ["One", "Two"])
+        Notes.append(changelog, "removed", [" Three "])
+
+        assert Notes.pending(changelog)
+        assert Notes.read(changelog) == {
+            "added": ["One", "Two"],
+            "changed": [],
+            "removed": ["Three"],
+        }
+        assert (project / ".unreleased.jsonl").read_text().count("\n") == 3
+        assert changelog.read_text().endswith("## [Unreleased]")
+
+    @pytest.mark.parametrize("section, entries", [("fixed", ["x"]), ("added", [" "])])
+    def test_append_rejects_invalid(self, project, section, entries):
+        """
+        Ensure unknown sections and empty entries are rejected before writing.
+        """
+        with pytest.raises(ValueError):
+            Notes.append(project / "CHANGELOG.md", section, entries)
+        assert not Notes.pending(project / "CHANGELOG.md")
+
+    def test_bump_materializes_and_clears_notes(self, project):
+        """
+        Ensure a bump writes pending notes ahead of its own entries, clears the
+        journal and removes the rendered Unreleased body.
+        """
+        changelog = Changelog.at(project / "CHANGELOG.md")
+        Notes.append(changelog.path, "added", ["Noted earlier"])
+        changelog.render_unreleased(Notes.read(changelog.path))
+        assert Changelog.unreleased_marker in changelog.path.read_text()
+
+        bump(project, "minor", None, {"added": ["From the bump"]})
+
+        text = changelog.path.read_text()
+        assert "### Added\n\n- Noted earlier\n- From the bump\n" in text
+        assert text.index("## [0.2.0]") < text.index("## [0.1.0]")
+        assert Changelog.unreleased_marker not in text
+        assert text.count("Noted earlier") == 1
+        assert not Notes.pending(changelog.path)
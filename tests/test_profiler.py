@@ -0,0 +1,97 @@
+import io
+import json
+import threading
+
+import pytest
+
+from changelogbump.Profiler import Profiler
+
+
+class TestProfiler:
+    @pytest.fixture(autouse=True)
+    def profiler(self):
+        Profiler.start()
+        yield Profiler
+        Profiler.stop()
+
+    def test_span_records_nesting_bytes_and_memory(self):
+        """
+        Ensure nested spans record their depth and reported bytes, and that an
+        allocation inside the inner span counts towards both peaks.
+        """
+        with Profiler.span("outer") as outer:
+            outer.bytes_read = 10
+            with Profiler.span("inner") as inner:
+                buffer = bytearray(1 << 20)
+                inner.bytes_written = len(buffer)
+                del buffer
+
+        inner, outer = Profiler.spans
+        assert (inner.name, inner.depth, inner.bytes_written) == ("inner", 1, 1 << 20)
+        assert (outer.name, outer.depth, outer.bytes_read) == ("outer", 0, 10)
+        assert inner.peak_memory > 1 << 19
+        assert outer.peak_memory >= inner.peak_memory
+        assert outer.seconds >= inner.seconds > 0
+
+    def test_peak_is_unknown_for_spans_overlapping_across_threads(self):
+        """
+        Ensure spans open at the same time on different threads report no
+        peak, while a later span on its own still does.
+        """
+        entered = threading.Barrier(2)
+
+        def worker() -> None:
+            with Profiler.span("worker"):
+                entered.wait()
+                entered.wait()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        with Profiler.span("main"):
+            entered.wait()
+            entered.wait()
+        thread.join()
+        with Profiler.span("alone"):
+            pass
+
+        peaks = {span.name: span.peak_memory for span in Profiler.spans}
+        assert peaks["main"] is None and peaks["worker"] is None
+        assert peaks["alone"] is not None
+
+        out = io.StringIO()
+        Profiler.report(out, "table")
+        assert out.getvalue().splitlines()[1].endswith(" -")
+
+    def test_disabled_span_is_not_recorded(self):
+        """Ensure spans opened while profiling is off are discarded."""
+        Profiler.stop()
+        with Profiler.span("ignored") as span:
+            span.bytes_read = 1
+        assert Profiler.spans == []
+
+    def test_report_formats(self):
+        """Ensure report() emits one JSON object per span, or an indented table."""
+        with Profiler.span("outer"), Profiler.span("inner"):
+            pass
+
+        out = io.StringIO()
+        Profiler.report(out, "json")
+        assert [json.loads(line)["span"] for line in out.getvalue().splitlines()] == [
+            "inner",
+            "outer",
+        ]
+
+        out = io.StringIO()
+        Profiler.report(out, "table")
+        header, first, second = out.getvalue().splitlines()
+        assert header.startswith("span")
+        assert first.startswith("outer") and second.startswith("  inner")
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [("", None), ("0", None), ("1", "table"), ("true", "table"), ("JSON", "json")],
+    )
+    def test_env_format(self, monkeypatch, value, expected):
+        """Ensure CHANGELOGBUMP_PROFILE maps to an output format."""
+        monkeypatch.setenv("CHANGELOGBUMP_PROFILE", value)
+        assert Profiler.env_format() == expected
@@ -1,8 +1,8 @@
+import tomllib
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Iterator
 
 import pytest
-import toml
 
 from changelogbump.PyProject import PyProject
 from changelogbump.Version import Version
@@ -39,5 +39,107 @@ version = "0.1.0"
         PyProject.update(new_version.current)
 
         # Reload file to check that version changed
-        data = toml.load(mock_file)
+        with mock_file.open("rb") as fh:
+            data = tomllib.load(fh)
         assert data["project"]["version"] == "1.2.3"
+
+    @pytest.mark.parametrize("new_version", ["0.2.0", "10.20.30"])
+    def test_update_preserves_formatting(self, tmp_path, monkeypatch, new_version):
+        """
+        Ensure update() changes only the version bytes, leaving comments, layout
+        and look-alike keys in other tables and strings untouched.
+        """
+        original = """# top comment
+[tool.other]
+version = "9.9.9"
+notes = \"\"\"
+[project]
+version = "8.8.8"
+\"\"\"
+matrix = [
+  [ "a" ]
+]
+
+[project]   # the real one
+name    =  'mock_proj'
+version =  '0.1.0'   # trailing comment
+dependencies = [ "click",]
+"""
+        mock = tmp_path / "pyproject.toml"
+        mock.write_text(original)
+        monkeypatch.setattr(PyProject, "path", mock)
+
+        PyProject.update(new_version)
+
+        assert mock.read_text() == original.replace("'0.1.0'", f"'{new_version}'")
+
+    def test_update_rejects_inline_table(self, tmp_path, monkeypatch):
+        """
+        Ensure update() refuses a version it cannot rewrite in place.
+        """
+        mock = tmp_path / "pyproject.toml"
+        mock.write_text('project = { name = "x", version = "0.1.0" }\n')
+        monkeypatch.setattr(PyProject, "path", mock)
+        with pytest.raises(ValueError, match="Cannot rewrite"):
+            PyProject.update("0.2.0")
+
+        mock.write_text('[project]\nname = "x"\n')
+        with pytest.raises(KeyError):
+            PyProject.update("0.2.0")
+
+    def test_current_version_cached_until_file_changes(self, mock_file, monkeypatch):
+        """
+        Ensure current_version is served from cache while the file's stat is unchanged.
+        """
+        monkeypatch.setattr(PyProject, "_cache", {})
+        monkeypatch.setattr(PyProject, "racy_window_ns", -1)
+        assert PyProject().current_version == "0.1.0"
+
+        def fail(*_):
+            raise AssertionError("unexpected read")
+
+        monkeypatch.setattr(Path, "read_bytes", fail)
+        assert PyProject().current_version == "0.1.0"
+
+        monkeypatch.undo()
+        monkeypatch.setattr(PyProject, "path", mock_file)
+        mock_file.write_text(mock_file.read_text().replace("0.1.0", "0.10.0"))
+        assert PyProject().current_version == "0.10.0"
+
+    def test_current_version_after_update(self, mock_file):
+        """
+        Ensure update() refreshes the cache even when the file size is unchanged.
+        """
+        _ = PyProject().current_version
+        PyProject.update("0.2.0")
+        assert PyProject().current_version == "0.2.0"
+
+    def test_current_version_falls_back_to_tomllib(self, tmp_path, monkeypatch):
+        """
+        Ensure versions the scanner cannot locate are still read via a full parse.
+        """
+        mock = tmp_path / "pyproject.toml"
+        mock.write_text('project = { name = "x", version = "4.5.6" }\n')
+        monkeypatch.setattr(PyProject, "path", mock)
+        assert PyProject().current_version == "4.5.6"
+
+    def test_update_beyond_head(self, tmp_path, monkeypatch):
+        """
+        Ensure a version past the scanned head, or a length change after it, is handled.
+        """
+        mock = tmp_path / "pyproject.toml"
+        tail = "".join(f'key{i} = "{i}"\n' for i in range(200))
+        original = (
+            '[tool.x]\npad = "' + "x" * 100 + '"\n[project]\nversion = "1.0.0"\n' + tail
+        )
+        mock.write_text(original)
+        monkeypatch.setattr(PyProject, "path", mock)
+        monkeypatch.setattr(PyProject, "head_size", 16)
+
+        assert PyProject().current_version == "1.0.0"
+        PyProject.update("1.0.10")
+        assert mock.read_text() == original.replace("1.0.0", "1.0.10")
+
+        monkeypatch.setattr(PyProject, "head_size", 160)
+        PyProject.update("2.0.0")
+        assert mock.read_text() == original.replace("1.0.0", "2.0.0")
@@ -0,0 +1,77 @@
+import subprocess
+
+import pytest
+
+from changelogbump.Changelog import Changelog
+from changelogbump.PyProject import PyProject
+from changelogbump.Reconcile import Drift
+from changelogbump.Transaction import BumpQueue
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    for var in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{var}_NAME", "Test")
+        monkeypatch.setenv(f"GIT_{var}_EMAIL", "test@example.com")
+    (tmp_path / "pyproject.toml").write_text('[project]\nversion = "1.1.0"\n')
+    (tmp_path / "CHANGELOG.md").write_text(
+        "# Changelog\n\n"
+        "## [1.1.0] - 2025-08-02\n\n- B\n\n"
+        "## [1.0.0] - 2025-08-01\n\n- A\n\n"
+        "## [Unreleased]\n"
+    )
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "Release")
+    return tmp_path
+
+
+def measure(root) -> Drift:
+    return Drift.measure(
+        Changelog.at(root / "CHANGELOG.md"), PyProject.at(root / "pyproject.toml"), root
+    )
+
+
+class TestDrift:
+    def test_in_sync(self, project):
+        """Ensure matching tags, changelog and pyproject report no drift."""
+        git(project, "tag", "v1.0.0")
+        git(project, "tag", "v1.1.0")
+
+        drift = measure(project)
+
+        assert drift.in_sync
+        assert (drift.tag, drift.tag_name) == ("1.1.0", "v1.1.0")
+        assert drift.untagged == drift.undocumented == []
+
+    def test_drift_is_reported(self, project):
+        """Ensure missing tags and tags without sections are listed, newest first."""
+        git(project, "tag", "v0.9.0")
+        git(project, "tag", "v0.10.0")
+        git(project, "tag", "v1.0.0")
+
+        drift = measure(project)
+
+        assert not drift.in_sync
+        assert (drift.pyproject, drift.changelog, drift.tag) == (
+            "1.1.0",
+            "1.1.0",
+            "1.0.0",
+        )
+        assert drift.untagged == ["1.1.0"]
+        assert drift.undocumented == ["0.10.0", "0.9.0"]
+
+    def test_bump_from_tag_base(self, project):
+        """Ensure a queued bump with a base version ignores pyproject.toml's version."""
+        queue = BumpQueue(
+            project,
+            Changelog.at(project / "CHANGELOG.md"),
+            PyProject.at(project / "pyproject.toml"),
+        )
+
+        assert queue.submit("minor", None, {}, base="1.4.0") == ("1.4.0", "1.5.0")
+        assert queue.pyproject().current_version == "1.5.0"
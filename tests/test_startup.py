@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+# Import-time budget per command, in milliseconds, for modules imported on top
+# of a bare interpreter; click accounts for about 30ms of it. It holds for a
+# machine that runs calibrate() in REFERENCE_MS and is scaled by this one's
+# time, like the benchmark baseline. Setting the environment variable gives a
+# fixed budget instead.
+BUDGET_MS = os.environ.get("CHANGELOGBUMP_STARTUP_BUDGET_MS")
+REFERENCE_MS = 8.0
+# Runs per command; each module's fastest import is counted, as one run is
+# easily disturbed
+RUNS = 5
+
+
+def imported(args: list[str], cwd) -> dict[str, int]:
+    """Run a command under -X importtime and return {module: self time in us}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            self_us, _, name = line.removeprefix("import time:").split("|")
+            if self_us.strip().isdigit():
+                modules[name.strip()] = int(self_us)
+    return modules
+
+
+def calibrate() -> float:
+    """Return the best of five timings of a fixed pure-Python loop, in milliseconds."""
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        total = 0
+        for i in range(200_000):
+            total += i % 7
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+@pytest.fixture(scope="module")
+def baseline(tmp_path_factory):
+    return imported(["-c", "pass"], tmp_path_factory.mktemp("baseline"))
+
+
+@pytest.fixture(scope="module")
+def budget_ms() -> float:
+    if BUDGET_MS is not None:
+        return float(BUDGET_MS)
+    return 40 * calibrate() / REFERENCE_MS
+
+
+class TestStartup:
+    @pytest.mark.parametrize(
+        "command, forbidden",
+        [
+            (
+                ["--help"],
+                {
+                    "changelogbump.Changelog",
+                    "changelogbump.PyProject",
+                    "changelogbump.Metadata",
+                    "changelogbump.Git",
+                    "changelogbump.Monorepo",
+                    "tomllib",
+                    "urllib.request",
+                    "asyncio",
+                    "subprocess",
+                    "json",
+                },
+            ),
+            (
+                ["init"],
+                {
+                    "changelogbump.PyProject",
+                    "changelogbump.Metadata",
+                    "changelogbump.ChangelogIndex",
+                    "changelogbump.AtomicFile",
+                    "tomllib",
+                    "urllib.request",
+                    "asyncio",
+                    "subprocess",
+                    "hashlib",
+                },
+            ),
+        ],
+    )
+    def test_command_startup(self, tmp_path, baseline, budget_ms, command, forbidden):
+        """
+        Ensure light commands import only what they need and stay within the startup budget.
+        """
+        runs = []
+        for run in range(RUNS):
+            cwd = tmp_path / str(run)
+            cwd.mkdir()
+            modules = imported(["-m", "changelogbump.app", *command], cwd)
+            assert not forbidden & modules.keys()
+            runs.append(
+                {name: us for name, us in modules.items() if name not in baseline}
+            )
+        added = {
+            name: min(run.get(name, us) for run in runs) for name, us in runs[0].items()
+        }
+        total_ms = sum(added.values()) / 1000
+        slowest = sorted(added, key=added.get, reverse=True)[:5]
+        assert total_ms < budget_ms, (
+            f"{total_ms:.1f}ms of {budget_ms:.1f}ms, slowest imports: {slowest}"
+        )
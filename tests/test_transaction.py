@@ -0,0 +1,254 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import uuid
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from changelogbump.AtomicFile import AtomicFile
+from changelogbump.Changelog import Changelog
+from changelogbump.PyProject import PyProject
+from changelogbump.Transaction import (
+    BumpQueue,
+    FileLock,
+    Transaction,
+    TransactionError,
+)
+
+
+class TestAtomicFile:
+    @pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+    def test_modes_follow_umask_and_existing_file(self, tmp_path):
+        """
+        Ensure a new file gets the mode open() would give it under the current
+        umask, and that replacing a file keeps its mode.
+        """
+        old = os.umask(0o027)
+        try:
+            with AtomicFile(tmp_path / "new.txt") as fh:
+                fh.write(b"new")
+        finally:
+            os.umask(old)
+        existing = tmp_path / "existing.txt"
+        existing.write_bytes(b"old")
+        existing.chmod(0o600)
+        with AtomicFile(existing) as fh:
+            fh.write(b"replaced")
+
+        assert (tmp_path / "new.txt").stat().st_mode & 0o777 == 0o640
+        assert existing.stat().st_mode & 0o777 == 0o600
+        assert existing.read_bytes() == b"replaced"
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "existing.txt",
+            "new.txt",
+        ]
+
+
+class TestTransaction:
+    @pytest.fixture
+    def project(self, tmp_path) -> Iterator[Path]:
+        (tmp_path / "pyproject.toml").write_text('[project]\nversion = "0.1.0"\n')
+        (tmp_path / "CHANGELOG.md").write_text("# Changelog\n\n## [Unreleased]\n")
+        yield tmp_path
+
+    @staticmethod
+    def transaction(root: Path, **kwargs) -> Transaction:
+        return Transaction(
+            root,
+            replaced=[root / "CHANGELOG.md", root / "NEW.md"],
+            patched=[root / "pyproject.toml"],
+            **kwargs,
+        )
+
+    @staticmethod
+    def leftovers(root: Path) -> list[str]:
+        return sorted(p.name for p in root.glob(".*.txn")) + sorted(
+            p.name for p in (root / ".changelogbump").glob("journal*")
+        )
+
+    def test_commit_keeps_changes_and_cleans_up(self, project):
+        """
+        Ensure a successful block keeps every write and leaves no journal or backup.
+        """
+        with self.transaction(project):
+            (project / "CHANGELOG.md").write_text("changed")
+            (project / "NEW.md").write_text("new")
+
+        assert (project / "CHANGELOG.md").read_text() == "changed"
+        assert (project / "NEW.md").read_text() == "new"
+        assert self.leftovers(project) == []
+        assert (project / ".changelogbump" / ".gitignore").read_text() == "*\n"
+
+    def test_exception_rolls_back_every_file(self, project):
+        """
+        Ensure an error restores modified files, including ones patched in place,
+        and removes files the block created.
+        """
+        with pytest.raises(RuntimeError), self.transaction(project):
+            PyProject.at(project / "pyproject.toml").update("0.2.0")
+            Changelog.at(project / "CHANGELOG.md").insert("## [0.2.0]\n")
+            (project / "NEW.md").write_text("new")
+            raise RuntimeError("crash between writes")
+
+        assert 'version = "0.1.0"' in (project / "pyproject.toml").read_text()
+        assert "0.2.0" not in (project / "CHANGELOG.md").read_text()
+        assert not (project / "NEW.md").exists()
+        assert self.leftovers(project) == []
+
+    def test_recover_rolls_back_interrupted_transaction(self, project):
+        """
+        Ensure a journal left by a process that died mid-transaction is rolled back.
+        """
+        txn = self.transaction(project, lock=False)
+        txn.__enter__()
+        (project / "pyproject.toml").write_text("torn")
+        # The process dies here, without __exit__
+
+        assert Transaction.recover(project) is True
+        assert 'version = "0.1.0"' in (project / "pyproject.toml").read_text()
+        assert self.leftovers(project) == []
+        assert Transaction.recover(project) is False
+
+
+class TestBumpQueue:
+    @pytest.fixture
+    def queue(self, tmp_path) -> Iterator[BumpQueue]:
+        (tmp_path / "pyproject.toml").write_text('[project]\nversion = "0.1.0"\n')
+        (tmp_path / "CHANGELOG.md").write_text("# Changelog\n\n## [Unreleased]\n")
+        yield BumpQueue(
+            tmp_path,
+            Changelog.at(tmp_path / "CHANGELOG.md"),
+            PyProject.at(tmp_path / "pyproject.toml"),
+        )
+
+    @staticmethod
+    def enqueue(queue: BumpQueue, ticket: str, part: str, entry: str) -> Path:
+        """Place a request as another waiting process would."""
+        directory = Transaction.state_dir(queue.root) / "queue"
+        directory.mkdir(exist_ok=True)
+        request = {"part": part, "summary": None, "sections": {"added": [entry]}}
+        (directory / f"{ticket}.json").write_text(json.dumps(request))
+        return directory / f"{ticket}.done"
+
+    def test_waiting_requests_are_coalesced(self, queue):
+        """
+        Ensure requests waiting in the queue are applied in one bump, with the
+        most significant part, and that each waiter gets the shared result.
+        """
+        done = self.enqueue(queue, "0" * 20 + "-other", "minor", "From another job")
+
+        assert queue.submit("patch", None, {"added": ["Mine"]}) == ("0.1.0", "0.2.0")
+
+        assert json.loads(done.read_text()) == {"old": "0.1.0", "new": "0.2.0"}
+        text = queue.changelog.path.read_text()
+        assert text.count("## [0.2.0]") == 1
+        assert "- From another job\n- Mine\n" in text
+        assert queue.pyproject().current_version == "0.2.0"
+
+    def test_failure_is_reported_to_waiters(self, queue):
+        """
+        Ensure a failed batch is rolled back and reported to every waiting request.
+        """
+        queue.pyproject.path.write_text('[project]\nname = "no version"\n')
+        done = self.enqueue(queue, "0" * 20 + "-other", "patch", "Entry")
+
+        with pytest.raises(KeyError):
+            queue.submit("patch")
+
+        assert "KeyError" in json.loads(done.read_text())["error"]
+        assert queue.changelog.path.read_text().count("## [") == 1
+
+    def test_result_from_another_process_is_used(self, queue, monkeypatch):
+        """
+        Ensure a request already applied by another process is not applied
+        again, and that a failure reported for it raises TransactionError.
+        """
+        monkeypatch.setattr("time.time_ns", lambda: 0)
+        monkeypatch.setattr("uuid.uuid4", lambda: uuid.UUID(int=0))
+        ticket = f"{0:020d}-{'0' * 12}"
+        done = self.enqueue(queue, ticket, "patch", "Entry").with_suffix(".done")
+        done.write_text('{"error": "KeyError: boom"}')
+
+        with pytest.raises(TransactionError, match="KeyError: boom"):
+            queue.submit("patch")
+
+        assert not done.exists()
+        assert queue.pyproject().current_version == "0.1.0"
+
+    def test_base_never_goes_below_current_version(self, queue):
+        """
+        Ensure a base lower than pyproject.toml's version is bumped from the
+        current version instead.
+        """
+        assert queue.submit("patch", base="0.0.5") == ("0.1.0", "0.1.1")
+        assert queue.submit("patch", base="0.3.0") == ("0.3.0", "0.3.1")
+
+    def test_interrupted_waiter_withdraws_request(self, queue, monkeypatch):
+        """
+        Ensure a request whose waiter is interrupted before taking the lock is
+        removed, so a later bump does not apply it.
+        """
+
+        def interrupt(self):
+            raise KeyboardInterrupt
+
+        with monkeypatch.context() as patch:
+            patch.setattr(FileLock, "__enter__", interrupt)
+            with pytest.raises(KeyboardInterrupt):
+                queue.submit("major", None, {"added": ["Abandoned"]})
+
+        assert not list((Transaction.state_dir(queue.root) / "queue").iterdir())
+        assert queue.submit("patch") == ("0.1.0", "0.1.1")
+        assert "Abandoned" not in queue.changelog.path.read_text()
+
+    def test_requests_of_dead_processes_are_skipped(self, queue):
+        """
+        Ensure requests and answers left by a process that no longer exists are
+        discarded instead of being applied.
+        """
+        pid = int(
+            subprocess.run(
+                [sys.executable, "-c", "import os; print(os.getpid())"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        )
+        ticket = self.enqueue(queue, "0" * 20 + "-dead", "major", "Abandoned")
+        request = json.loads(ticket.with_suffix(".json").read_text())
+        ticket.with_suffix(".json").write_text(json.dumps(dict(request, pid=pid)))
+        directory = ticket.parent
+        (directory / "1-stale.done").write_text(json.dumps({"old": "x", "pid": pid}))
+
+        assert queue.submit("patch") == ("0.1.0", "0.1.1")
+
+        assert "Abandoned" not in queue.changelog.path.read_text()
+        assert not list(directory.iterdir())
+
+    def test_concurrent_submits_never_tear_files(self, queue):
+        """
+        Ensure parallel bumps are serialized: every entry lands once, versions
+        never go backwards, and the files agree at the end.
+        """
+        barrier = threading.Barrier(8)
+        results: list[tuple[str, str]] = []
+
+        def worker(i: int) -> None:
+            barrier.wait()
+            results.append(queue.submit("patch", None, {"added": [f"Entry {i}"]}))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        text = queue.changelog.path.read_text()
+        assert all(text.count(f"- Entry {i}\n") == 1 for i in range(8))
+        final = max(new for _, new in results)
+        assert queue.pyproject().current_version == final
+        assert text.count("## [0.1.") == len({new for _, new in results})
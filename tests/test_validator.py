@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import pytest
+
+from changelogbump import header_path
+from changelogbump.Validator import Diagnostic, Validator
+
+HEADER = header_path.read_text().replace("## [Unreleased]", "")
+
+
+def write_project(root: Path, body: str, version: str | None = "1.1.0") -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    if version:
+        (root / "pyproject.toml").write_text(f'[project]\nversion = "{version}"\n')
+    changelog = root / "CHANGELOG.md"
+    changelog.write_text(HEADER + "## [Unreleased]\n\n" + body)
+    return changelog
+
+
+GOOD = (
+    "## [1.1.0] - 2025-08-02\n\n### Added\n\n- B\n\n"
+    "## [1.0.0] - 2025-08-01\n\n### Fixed\n\n- A\n\n"
+)
+
+
+class TestValidator:
+    def codes(self, found: list[Diagnostic]) -> list[tuple[int, str]]:
+        return [(d.line, d.code) for d in found]
+
+    def test_valid_changelog(self, tmp_path):
+        """
+        Ensure a changelog written the way init and add write it passes.
+        """
+        assert Validator.check(write_project(tmp_path, GOOD)) == []
+
+    @pytest.mark.parametrize(
+        "body, expected",
+        [
+            ("## [1.1.0]\n\n", [(10, "CB003")]),
+            ("## [1.1.0] - 2025-02-30\n\n", [(10, "CB003")]),
+            ("## [1.1.0] - 08/02/2025\n\n", [(10, "CB003")]),
+            ("## 1.1.0 - 2025-08-02\n\n", [(10, "CB002")]),
+            ("## [1.1] - 2025-08-02\n\n", [(10, "CB002")]),
+            ("## [1.1.0] - 2025-08-02\n\n### Bugs\n\n", [(12, "CB007")]),
+            (
+                "## [1.1.0] - 2025-08-02\n\n## [1.2.0] - 2025-08-03\n\n",
+                [(12, "CB005")],
+            ),
+            (
+                (
+                    "## [1.1.0] - 2025-08-02\n\n## [1.0.0] - 2025-08-01\n\n"
+                    "## [1.1.0] - 2025-08-02\n\n"
+                ),
+                [(14, "CB006")],
+            ),
+            (
+                "## [1.1.0] - 2025-08-01\n\n## [1.0.0] - 2025-08-02\n\n",
+                [(12, "CB004")],
+            ),
+        ],
+    )
+    def test_detects_problems(self, tmp_path, body, expected):
+        """
+        Ensure each malformed heading, date, order or section is reported on its line.
+        """
+        assert self.codes(Validator.check(write_project(tmp_path, body))) == expected
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            (GOOD + "## [Unreleased]\n", [(20, "CB009")]),
+            ("## [Unreleased]\n\n" + GOOD + "## [Unreleased]\n", [(22, "CB009")]),
+        ],
+    )
+    def test_unreleased_placement(self, tmp_path, text, expected):
+        """
+        Ensure Unreleased is reported when it follows a release or appears twice.
+        """
+        changelog = write_project(tmp_path, "")
+        changelog.write_text(HEADER + text)
+
+        found = Validator.check(changelog)
+
+        assert self.codes(found) == expected
+
+    def test_version_mismatch_and_header(self, tmp_path):
+        """
+        Ensure a stale pyproject.toml version and an edited header are reported.
+        """
+        changelog = write_project(tmp_path, GOOD, version="1.2.0")
+        changelog.write_text(changelog.read_text().replace("All notable", "Some"))
+
+        found = Validator.check(changelog)
+
+        assert self.codes(found) == [(3, "CB001"), (10, "CB008")]
+        assert "pyproject.toml is at 1.2.0" in found[1].message
+        assert str(found[1]).startswith(f"{changelog}:10: CB008 error:")
+
+    def test_check_all_in_parallel(self, tmp_path):
+        """
+        Ensure check_all() returns every file's diagnostics in input order.
+        """
+        paths = [
+            write_project(
+                tmp_path / f"p{i}", GOOD if i % 2 else "## [x] - 2025-01-01\n\n"
+            )
+            for i in range(6)
+        ]
+        found = Validator.check_all(paths, jobs=2)
+        assert [d.path for d in found] == [str(p) for p in paths[::2]]
+        assert {d.code for d in found} == {"CB002"}
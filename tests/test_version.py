@@ -1,3 +1,6 @@
+import dataclasses
+from operator import attrgetter
+
 import pytest
 from changelogbump.Version import Version
 
@@ -25,8 +28,9 @@ class TestVersion:
         """
         Test various bump scenarios using parameterization.
         """
-        version.bump(major=major, minor=minor, patch=patch)
-        assert version.current == expected
+        bumped = version.bump(major=major, minor=minor, patch=patch)
+        assert bumped.current == expected
+        assert version.current == "1.2.3"
 
     def test_bump_error_if_no_flags(self, version):
         """
@@ -45,6 +49,8 @@ class TestVersion:
             (Version(1, 2, 4), Version(1, 2, 5), False),
             (Version(1, 2, 4), Version(1, 2, 3), True),
             (Version(1, 2, 3), Version(1, 2, 3), False),
+            (Version(1, 2, 1), Version(1, 2, 0), True),
+            (Version(1, 0, 0), Version(1, 0, 0, "rc.1"), True),
         ],
     )
     def test_is_greater_than(self, v1, v2, expected):
@@ -69,3 +75,87 @@ class TestVersion:
         assert v.major == major
         assert v.minor == minor
         assert v.patch == patch
+
+    @pytest.mark.parametrize(
+        "version_str, expected",
+        [
+            ("1.2.3-rc.1", Version(1, 2, 3, "rc.1")),
+            ("1.2.3+build.5", Version(1, 2, 3, "", "build.5")),
+            (
+                "1.0.0-alpha-1.0+sha.5114f85",
+                Version(1, 0, 0, "alpha-1.0", "sha.5114f85"),
+            ),
+        ],
+    )
+    def test_from_string_prerelease_and_build(self, version_str, expected):
+        """
+        Ensure from_string() parses pre-release and build metadata and round-trips.
+        """
+        v = Version.from_string(version_str)
+        assert v == expected
+        assert str(v) == version_str
+
+    @pytest.mark.parametrize(
+        "version_str", ["1.2", "1.2.3.4", "01.2.3", "1.2.3-", "v1.2.3"]
+    )
+    def test_from_string_rejects_invalid(self, version_str):
+        """
+        Ensure from_string() raises ValueError for strings that are not SemVer.
+        """
+        with pytest.raises(ValueError):
+            Version.from_string(version_str)
+
+    def test_precedence_follows_semver(self):
+        """
+        Ensure sorting follows the precedence example from the SemVer 2.0.0 spec.
+        """
+        ordered = [
+            "1.0.0-alpha",
+            "1.0.0-alpha.1",
+            "1.0.0-alpha.beta",
+            "1.0.0-beta",
+            "1.0.0-beta.2",
+            "1.0.0-beta.11",
+            "1.0.0-rc.1",
+            "1.0.0",
+            "1.0.1",
+            "1.10.0",
+        ]
+        versions = [Version.from_string(s) for s in reversed(ordered)]
+        assert [str(v) for v in sorted(versions)] == ordered
+        assert [str(v) for v in sorted(versions, key=attrgetter("sort_key"))] == ordered
+
+    def test_build_metadata_ignored_for_precedence(self):
+        """
+        Ensure build metadata affects equality but not ordering.
+        """
+        a, b = Version(1, 0, 0, "", "a"), Version(1, 0, 0, "", "b")
+        assert a != b
+        assert not a < b and not b < a
+        assert a <= b and b >= a
+
+    def test_immutable_and_hashable(self, version):
+        """
+        Ensure versions cannot be modified and can be used as dict keys.
+        """
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            version.major = 2
+        assert {version: 1}[Version.from_string("1.2.3")] == 1
+        assert not hasattr(version, "__dict__")
+
+    @pytest.mark.parametrize(
+        "version_str, part, expected",
+        [
+            ("1.2.3-rc.1", "patch", "1.2.3"),
+            ("1.2.3-rc.1", "minor", "1.3.0"),
+            ("1.3.0-rc.1", "minor", "1.3.0"),
+            ("2.0.0-rc.1", "major", "2.0.0"),
+            ("2.1.0-rc.1", "major", "3.0.0"),
+            ("1.2.3+build.5", "patch", "1.2.4"),
+        ],
+    )
+    def test_bump_prerelease(self, version_str, part, expected):
+        """
+        Ensure bumping drops metadata and releases a pre-release of the bumped part.
+        """
+        assert Version.from_string(version_str).bump(**{part: True}).current == expected
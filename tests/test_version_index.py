@@ -0,0 +1,112 @@
+from array import array
+
+import pytest
+
+from changelogbump.Version import Version
+from changelogbump.VersionIndex import VersionIndex
+
+
+class TestVersionIndex:
+    @pytest.fixture
+    def index(self):
+        yield VersionIndex.from_strings(
+            [
+                "1.2.3",
+                "Unreleased",
+                "2.0.0",
+                "1.2.4",
+                "1.10.0",
+                "2.0.0-rc.1",
+                "1.2.3",
+                "0.9.0+build.7",
+                "01.0.0",
+            ]
+        )
+
+    def test_from_strings_packs_sorted_unique_releases(self, index):
+        """
+        Ensure only final releases are indexed, de-duplicated, in version order.
+        """
+        assert isinstance(index.keys, array) and index.keys.itemsize == 8
+        assert [v.current for v in index] == [
+            "0.9.0",
+            "1.2.3",
+            "1.2.4",
+            "1.10.0",
+            "2.0.0",
+        ]
+
+    def test_pack_round_trip_and_limit(self):
+        """
+        Ensure pack/unpack are inverse and oversized components are rejected.
+        """
+        version = Version(VersionIndex.limit, 0, 7)
+        assert VersionIndex.unpack(VersionIndex.pack(version)) == version
+        with pytest.raises(ValueError):
+            VersionIndex.pack(Version(0, VersionIndex.limit + 1, 0))
+
+    def test_between(self, index):
+        """
+        Ensure between() returns the inclusive range and supports open ends.
+        """
+        assert [
+            v.current for v in index.between(Version(1, 2, 4), Version(2, 0, 0))
+        ] == ["1.2.4", "1.10.0", "2.0.0"]
+        assert [v.current for v in index.between(hi=Version(1, 0, 0))] == ["0.9.0"]
+        assert len(index.between()) == len(index)
+
+    def test_prerelease_bounds(self, index):
+        """
+        Ensure a pre-release bound orders below the final release of the same number.
+        """
+        rc = Version.from_string("2.0.0-rc.1")
+        assert [v.current for v in index.between(Version(1, 10, 0), rc)] == ["1.10.0"]
+        assert [v.current for v in index.between(rc)] == ["2.0.0"]
+        assert index.latest(rc).current == "1.10.0"
+        assert rc not in index
+
+    @pytest.mark.parametrize(
+        "below, expected",
+        [(None, "2.0.0"), ("2", "1.10.0"), ("1.2.4", "1.2.3"), ("0.9", None)],
+    )
+    def test_latest(self, index, below, expected):
+        """
+        Ensure latest() finds the highest release strictly below a bound.
+        """
+        bound = VersionIndex.parse_bound(below) if below else None
+        found = index.latest(bound)
+        assert (found.current if found else None) == expected
+
+    @pytest.mark.parametrize(
+        "part, base, expected",
+        [
+            ("patch", None, "2.0.1"),
+            ("patch", Version(1, 2, 2), "1.2.5"),
+            ("minor", Version(1, 9, 0), "1.11.0"),
+            ("major", Version(1, 0, 0), "3.0.0"),
+        ],
+    )
+    def test_next_free(self, index, part, base, expected):
+        """
+        Ensure next_free() skips versions that are already released.
+        """
+        assert index.next_free(part, base).current == expected
+
+    def test_from_changelogs(self, tmp_path):
+        """
+        Ensure several changelogs are merged into one index.
+        """
+        paths = []
+        for name, versions in (("a", ["1.0.0", "1.1.0"]), ("b", ["0.5.0"])):
+            path = tmp_path / f"{name}.md"
+            path.write_text(
+                "# Changelog\n\n"
+                + "".join(f"## [{v}] - 2025-01-01\n\n- x\n\n" for v in versions)
+                + "## [Unreleased]"
+            )
+            paths.append(path)
+        assert [v.current for v in VersionIndex.from_changelogs(paths)] == [
+            "0.5.0",
+            "1.0.0",
+            "1.1.0",
+        ]
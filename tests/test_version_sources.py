@@ -0,0 +1,135 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from changelogbump.Changelog import Changelog
+from changelogbump.PyProject import PyProject
+from changelogbump.Transaction import BumpQueue
+from changelogbump.VersionSources import VersionSources
+
+CONFIG = """
+[tool.changelogbump]
+version-files = [
+    "src/pkg/__init__.py",
+    "setup.cfg",
+    "package.json",
+    {path = "chart/Chart.yaml", key = "appVersion"},
+    "Dockerfile",
+    {path = "VERSION", pattern = "^(?P<version>.+)$"},
+]
+"""
+
+
+@pytest.fixture
+def project(tmp_path) -> Path:
+    (tmp_path / "pyproject.toml").write_text('[project]\nversion = "1.9.0"\n' + CONFIG)
+    (tmp_path / "CHANGELOG.md").write_text("# Changelog\n\n## [Unreleased]\n")
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "__init__.py").write_text(
+        '"""Pkg."""\n\n__version__ = "1.9.0"\n'
+    )
+    (tmp_path / "setup.cfg").write_text("[metadata]\nname = pkg\nversion = 1.9.0\n")
+    (tmp_path / "package.json").write_text(
+        json.dumps({"name": "pkg", "version": "1.9.0"}, indent=2)
+    )
+    (tmp_path / "chart").mkdir()
+    (tmp_path / "chart" / "Chart.yaml").write_text(
+        'apiVersion: v2\nversion: 0.4.0\nappVersion: "1.9.0"\n'
+    )
+    (tmp_path / "Dockerfile").write_text(
+        "FROM python\nARG VERSION=1.9.0\n"
+        'LABEL org.opencontainers.image.version="1.9.0"\n'
+    )
+    (tmp_path / "VERSION").write_text("1.9.0\n")
+    return tmp_path
+
+
+def sources_of(root: Path) -> VersionSources:
+    return VersionSources.from_pyproject(PyProject.at(root / "pyproject.toml"))
+
+
+class TestVersionSources:
+    def test_scan_finds_every_kind(self, project):
+        """Ensure each built-in kind and a custom pattern find their version."""
+        scanned = sources_of(project).scan()
+
+        found = {
+            path.relative_to(project).as_posix(): [(o.line, o.version) for o in occ]
+            for path, (_, occ) in scanned.items()
+        }
+        assert found == {
+            "src/pkg/__init__.py": [(3, "1.9.0")],
+            "setup.cfg": [(3, "1.9.0")],
+            "package.json": [(3, "1.9.0")],
+            "chart/Chart.yaml": [(3, "1.9.0")],
+            "Dockerfile": [(2, "1.9.0"), (3, "1.9.0")],
+            "VERSION": [(1, "1.9.0")],
+        }
+
+    def test_json_matches_only_the_top_level_key(self, project):
+        """
+        Ensure nested "version" keys and quoted text in a JSON file are not
+        taken for the package version.
+        """
+        (project / "package.json").write_text(
+            json.dumps(
+                {
+                    "name": "pkg",
+                    "engines": {"node": {"version": "18.0.0"}},
+                    "description": 'Set "version": "0.0.1" here',
+                    "overrides": [{"version": "2.0.0"}],
+                    "version": "1.9.0",
+                },
+                indent=2,
+            )
+        )
+
+        _, occurrences = sources_of(project).scan()[project / "package.json"]
+
+        assert [(o.line, o.version) for o in occurrences] == [(14, "1.9.0")]
+
+    def test_bump_rewrites_only_version_bytes(self, project):
+        """Ensure a bump updates every source and leaves other bytes alone."""
+        before = (project / "chart" / "Chart.yaml").read_text()
+        queue = BumpQueue(
+            project,
+            Changelog.at(project / "CHANGELOG.md"),
+            PyProject.at(project / "pyproject.toml"),
+        )
+
+        assert queue.submit("minor") == ("1.9.0", "1.10.0")
+
+        assert (project / "chart" / "Chart.yaml").read_text() == before.replace(
+            '"1.9.0"', '"1.10.0"'
+        )
+        assert 'version="1.10.0"' in (project / "Dockerfile").read_text()
+        assert VersionSources.mismatches(sources_of(project).scan(), "1.10.0") == []
+
+        assert queue.submit("patch") == ("1.10.0", "1.10.1")
+        assert (project / "VERSION").read_text() == "1.10.1\n"
+
+    def test_disagreement_blocks_the_bump(self, project):
+        """Ensure a stale source stops the bump before any file is written."""
+        (project / "setup.cfg").write_text("[metadata]\nversion = 1.8.0\n")
+        queue = BumpQueue(
+            project,
+            Changelog.at(project / "CHANGELOG.md"),
+            PyProject.at(project / "pyproject.toml"),
+        )
+
+        with pytest.raises(ValueError, match=r"setup.cfg:2 has 1.8.0"):
+            queue.submit("patch")
+        assert queue.pyproject().current_version == "1.9.0"
+        assert "1.9.1" not in (project / "CHANGELOG.md").read_text()
+
+    def test_invalid_configuration(self, tmp_path):
+        """Ensure unknown kinds, bad patterns and missing matches are reported."""
+        with pytest.raises(ValueError, match="unknown version source kind"):
+            VersionSources(tmp_path, ["notes.txt"])
+        with pytest.raises(ValueError, match="no 'version' group"):
+            VersionSources(tmp_path, [{"path": "x", "pattern": "v(.+)"}])
+        (tmp_path / "a.py").write_text("VERSION = 1\n")
+        with pytest.raises(ValueError, match="No version found"):
+            VersionSources(tmp_path, ["a.py"]).scan()
+        assert not VersionSources(tmp_path, [])